@@ -1,58 +1,134 @@
 import pytest
 import pytest_html
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 import yaml
-import uuid
 import os
+import logging
+import functools
+import itertools
+from html import escape
 from datetime import datetime
+from utils.driver_pool import DriverPool, create_driver, driver_stats_key, format_stats
+from utils.locator_compiler import LocatorError, compile_locators
+from utils.command_metrics import CommandRecorder, add_command_listener, breakdown_html, command_recorder_key
+from utils.driver_resolver import DriverResolver, driver_resolution_key, format_resolution
+from utils.preconditions import login_user, register_user
+from utils.storage_state import StorageStateCache, format_storage_state_stats, storage_state_stats_key
+from utils.local_shop import LocalShopServer, seed_users_from_data
+from utils.browser_profiles import (BrowserProfile, ResourceMonitor, format_resource_stats, merge_resource_stats,
+                                    resource_stats_key)
+from pages.base_page import BasePage
+from utils.data_factory import DataFactory, choose_run_token, choose_seed, data_run_key, data_seed_key
+from utils.structured_log import logger, set_current_test, start_logging, stop_logging
+from utils.stream_report import StreamingReport
+from utils.sharding import format_shard_plan, select_shard, shard_plan_key
+from utils.retries import RetryStats, format_retry_stats, merge_retry_stats, retry_stats_key
+from utils.page_timing import (PageTimingMonitor, format_page_timing, merge_page_timing, navigations_html,
+                               page_timing_key)
+from utils.command_trace import CommandTrace, command_trace_key, viewer_link
+from utils.workers import worker_id, worker_path, worker_log_file
+from utils.artifacts import (ArtifactService, artifact_service_key, artifact_stats_key, format_artifact_stats,
+                             item_driver_key)
 
 
-# Capture screenshot on test failure
+# Capture failure artifacts (screenshot, DOM, console log) and link them in the report
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
 
-    if report.when == 'call' and report.failed:
-        driver = item.funcargs.get('request').cls.driver
-        screenshot_name = f"screenshot_{uuid.uuid4().hex[:8]}.png"
-        screenshot_path = os.path.join("reports", "screenshots", screenshot_name)
-        os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
+    service = item.config.stash.get(artifact_service_key, None)
+    driver = item.stash.get(item_driver_key, None)
 
-        driver.save_screenshot(screenshot_path)
-        if "pytest_html" in item.config.pluginmanager.list_name_plugin():
-            report.extra = report.extra or []
-            report.extra.append(pytest_html.extras.png(screenshot_path))
+    # Write the command trace before capturing artifacts adds its own commands to the buffer
+    trace = item.config.stash.get(command_trace_key, None)
+    if report.failed and trace is not None:
+        trace_path = trace.flush(item.nodeid, driver)
+        if trace_path and item.config.pluginmanager.hasplugin('html'):
+            report_dir = os.path.dirname(os.path.abspath(item.config.getoption('htmlpath') or "report.html"))
+            report.extra = getattr(report, 'extra', None) or []
+            report.extra.append(pytest_html.extras.url(viewer_link(trace_path, report_dir), name="command trace"))
 
+    if report.when == 'call' and report.failed and service is not None and driver is not None:
+        # Returns the capture the test already made in capture_screenshot_on_failure, if any
+        artifacts = service.capture_failure(driver, item.nodeid)
+        if item.config.pluginmanager.hasplugin('html'):
+            # Links are relative to the report so reports/ can be moved as a whole
+            report_dir = os.path.dirname(os.path.abspath(item.config.getoption('htmlpath') or "report.html"))
+            report.extra = getattr(report, 'extra', None) or []
+            if 'screenshot' in artifacts:
+                report.extra.append(pytest_html.extras.image(os.path.relpath(artifacts['screenshot'], report_dir)))
+            for kind in ('dom', 'console'):
+                if kind in artifacts:
+                    report.extra.append(pytest_html.extras.url(os.path.relpath(artifacts[kind], report_dir), name=kind))
 
-# Update the email in data.yaml with a unique value before each test
-def update_data_yaml(file_path='utils/data.yaml'):
-    unique_email = f"saiteja_nannaka{uuid.uuid4().hex[:9]}@example.com"
+    # One compact record per test phase that ran or failed; the full traceback stays in the report
+    if report.when == 'call' or report.failed:
+        crash = getattr(report.longrepr, 'reprcrash', None)
+        logger.log(logging.ERROR if report.failed else logging.INFO, f"{item.nodeid} {report.when} {report.outcome}",
+                   extra={'event': "test", 'phase': report.when, 'outcome': report.outcome,
+                          'duration_ms': round(report.duration * 1000, 2),
+                          **({'error': crash.message.splitlines()[0]} if crash and crash.message else {})})
 
+    # Attach the per-method WebDriver command breakdown of the test
+    recorder = item.config.stash.get(command_recorder_key, None)
+    if report.when == 'call' and recorder is not None:
+        summary = recorder.finish_test(item.nodeid)
+        if summary and item.config.pluginmanager.hasplugin('html'):
+            report.extra = getattr(report, 'extra', None) or []
+            report.extra.append(pytest_html.extras.html(breakdown_html(summary)))
+
+    # Attach the actions that needed retries
+    if report.when == 'call' and BasePage.retry_stats is not None:
+        retried = BasePage.retry_stats.finish_test()
+        if retried and item.config.pluginmanager.hasplugin('html'):
+            rows = "".join(f"<li>{escape(action['action'])}: {action['retries']} retries, {action['seconds']}s"
+                           f"{' (gave up)' if action['failed'] else ''}</li>" for action in retried)
+            report.extra = getattr(report, 'extra', None) or []
+            report.extra.append(pytest_html.extras.html(f"<p>Retried actions:</p><ul>{rows}</ul>"))
+
+    # Attach the browser-side timing of every page the test navigated to
+    if report.when == 'call' and BasePage.page_timing is not None:
+        navigations = BasePage.page_timing.finish_test()
+        if navigations and item.config.pluginmanager.hasplugin('html'):
+            report.extra = getattr(report, 'extra', None) or []
+            report.extra.append(pytest_html.extras.html(navigations_html(navigations)))
+
+
+# Fixture to load data.yaml once per session; the file is never written
+@pytest.fixture(scope="session")
+def base_data():
     try:
-        with open(file_path, 'r') as file:
-            data = yaml.safe_load(file)
+        with open("utils/data.yaml", 'r') as file:
+            return yaml.safe_load(file)
+    except FileNotFoundError:
+        pytest.fail("data.yaml file not found.")
+    except yaml.YAMLError as e:
+        pytest.fail(f"Error reading data.yaml: {e}")
 
-        data['registration']['email'] = unique_email
 
-        with open(file_path, 'w') as file:
-            yaml.safe_dump(data, file)
+# Fixture generating per-test data from the run's seed (printed in the report; rerun with DATA_SEED=<seed>).
+# Emails also carry the run token, which is new for every run unless DATA_RUN is set.
+@pytest.fixture(scope="session")
+def data_factory(request, base_data):
+    return DataFactory(base_data, request.config.stash[data_seed_key], run_token=request.config.stash[data_run_key])
 
-        print(f"Updated email in YAML: {unique_email}")
-    except Exception as e:
-        pytest.fail(f"Failed to update data.yaml: {e}")
 
-    return unique_email
+# Stamp log records with the test and start its command trace before any of its fixtures run
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    set_current_test(item.nodeid)
+    # A failing fixture must not be reported with the previous test's commands
+    trace = item.config.stash.get(command_trace_key, None)
+    if trace is not None:
+        trace.start_test(item.nodeid)
 
 
-# Fixture to update and reload data.yaml before each test
+# Fixture giving each test a read-only view of the data with its own generated email, names and addresses
 @pytest.fixture(scope="function")
-def data():
-    update_data_yaml()
-    with open("utils/data.yaml", 'r') as file:
-        return yaml.safe_load(file)
+def data(request, data_factory):
+    test_data = data_factory.for_test(request.node.nodeid)
+    logger.info(f"Using registration email: {test_data['registration']['email']}", extra={'event': "data"})
+    return test_data
 
 
 # Fixture to load config.yaml
@@ -60,44 +136,378 @@ def data():
 def config():
     try:
         with open("utils/config.yaml", 'r') as file:
-            return yaml.safe_load(file)
+            settings = yaml.safe_load(file)
     except FileNotFoundError:
         pytest.fail("config.yaml file not found.")
     except yaml.YAMLError as e:
         pytest.fail(f"Error reading config.yaml: {e}")
 
+    # base_url: "local" (or BASE_URL=local) serves the suite from an in-process stand-in shop
+    settings['base_url'] = os.environ.get("BASE_URL", settings['base_url'])
+    if settings['base_url'] != "local":
+        yield settings
+        return
+    server = LocalShopServer(seed_users=seed_users_from_data()).start()
+    settings['base_url'] = server.base_url
+    yield settings
+    server.stop()
+
 
-# Fixture to load locators.yaml
+# Fixture to load locators.yaml and compile it into (By, value) tuples once per session
 @pytest.fixture(scope="session")
 def locators():
     try:
         with open("utils/locators.yaml", 'r') as file:
-            return yaml.safe_load(file)
+            return compile_locators(yaml.safe_load(file))
     except FileNotFoundError:
         pytest.fail("locators.yaml file not found.")
     except yaml.YAMLError as e:
         pytest.fail(f"Error reading locators.yaml: {e}")
+    except LocatorError as e:
+        pytest.fail(str(e))
+
+
+# Fixture choosing how account preconditions are set up: over HTTP, or through the UI
+@pytest.fixture(scope="function")
+def precondition_mode(request, config):
+    if request.node.get_closest_marker("ui_preconditions") is not None:
+        return "ui"
+    return config.get('preconditions', "ui")
+
+
+# Fixture caching one logged-in storage state per role for the whole session
+@pytest.fixture(scope="session")
+def storage_states(request, config, base_data, data_factory, locators):
+    # Every (re)capture of the registered role needs an account that does not exist yet
+    registrations = itertools.count()
+    cache = StorageStateCache(config['base_url'], ttl_seconds=config.get('storage_state', {}).get('ttl_seconds', 1800))
+    cache.register_role("login", lambda driver: login_user(
+        driver, config, base_data['login']['username'], base_data['login']['password']))
+    cache.register_role("registered", lambda driver: register_user(
+        driver, config, locators,
+        data_factory.email(data_factory.random(f"storage_state:{next(registrations)}"), data_factory.namespace),
+        base_data['registration']['password'], mode="http"))
+    yield cache
+    request.config.stash[storage_state_stats_key] = cache.stats()
+    if hasattr(request.config, 'workeroutput'):
+        request.config.workeroutput['storage_state_stats'] = cache.stats()
+
+
+# Fixture restoring a cached storage state, chosen by @pytest.mark.storage_state("<role>") or an indirect parameter
+@pytest.fixture(scope="function")
+def storage_state(request, setup, storage_states):
+    marker = request.node.get_closest_marker("storage_state")
+    role = marker.args[0] if marker else getattr(request, 'param', None)
+    if role is None:
+        return None
+    return storage_states.restore(request.cls.driver, role)
+
+
+# Tests marked with storage_state get the fixture without having to request it;
+# with SHARD_INDEX/SHARD_COUNT set, only this node's shard of the suite is kept
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        if item.get_closest_marker("storage_state") and "storage_state" not in item.fixturenames:
+            item.fixturenames.append("storage_state")
+
+    shard_count = int(os.environ.get("SHARD_COUNT", 1))
+    if shard_count <= 1:
+        return
+    # Durations come from earlier JUnit reports, e.g. the merged report.xml of the last CI run
+    duration_files = os.environ.get("SHARD_DURATIONS", os.path.join("reports", "report.xml")).split(",")
+    try:
+        selected, deselected, plan = select_shard(items, int(os.environ.get("SHARD_INDEX", 1)), shard_count,
+                                                  duration_files)
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    config.stash[shard_plan_key] = plan
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+# Fixture resolving the chromedriver binary once per session
+@pytest.fixture(scope="session")
+def driver_path(request, config):
+    try:
+        resolution = DriverResolver.from_config(config).resolve()
+    except Exception as e:
+        pytest.fail(f"Failed to resolve chromedriver: {e}")
+    request.config.stash[driver_resolution_key] = resolution
+    if hasattr(request.config, 'workeroutput'):
+        request.config.workeroutput['driver_resolution'] = resolution
+    return resolution['path']
+
+
+# Fixture recording every WebDriver command with its duration and issuing page-object method
+@pytest.fixture(scope="session")
+def command_recorder(request, config):
+    if not config.get('command_metrics', True):
+        yield None
+        return
+    recorder = CommandRecorder()
+    request.config.stash[command_recorder_key] = recorder
+    yield recorder
+    recorder.export(worker_path(os.path.join("reports", "metrics"), "command_metrics.json"))
+
+
+# Fixture keeping the last WebDriver commands of every test in a ring buffer, written only for failures
+@pytest.fixture(scope="session")
+def command_trace(request, config):
+    settings = config.get('command_trace') or {}
+    if not settings.get('enabled', True):
+        yield None
+        return
+    trace = CommandTrace(os.path.join("reports", "traces", worker_id()), size=settings.get('size', 200))
+    request.config.stash[command_trace_key] = trace
+    yield trace
+
+
+# Fixture selecting the browser profile (launch options and request blocking) from config.yaml
+@pytest.fixture(scope="session")
+def browser_profile(config):
+    try:
+        return BrowserProfile.from_config(config)
+    except ValueError as e:
+        pytest.fail(str(e))
+
+
+# Fixture counting requests and blocked requests of every browser in this worker, when the profile records them
+@pytest.fixture(scope="session")
+def resource_monitor(request, browser_profile):
+    if not browser_profile.performance_log:
+        yield None
+        return
+    monitor = ResourceMonitor(browser_profile.name)
+    yield monitor
+    monitor.save_sizes()
+    request.config.stash[resource_stats_key] = monitor.stats
+    if hasattr(request.config, 'workeroutput'):
+        request.config.workeroutput['resource_stats'] = monitor.stats
+
+
+# Fixture writing failure artifacts in the background, deduplicated and capped in size
+@pytest.fixture(scope="session")
+def artifact_service(request, config):
+    settings = config.get('artifacts') or {}
+    service = ArtifactService(os.path.join("reports", "artifacts", worker_id()),
+                              max_total_bytes=int(settings.get('max_total_mb', 200) * 1024 * 1024),
+                              image_format=settings.get('screenshot_format', "webp"),
+                              max_width=settings.get('max_width', 1280))
+    request.config.stash[artifact_service_key] = service
+    yield service
+    service.close()
+    request.config.stash[artifact_stats_key] = service.stats()
+    if hasattr(request.config, 'workeroutput'):
+        request.config.workeroutput['artifact_stats'] = service.stats()
+
+
+# Fixture choosing how page objects wait for elements: "polling" or "observer" (override with WAIT_ENGINE)
+@pytest.fixture(scope="session")
+def wait_engine(config):
+    engine = os.environ.get("WAIT_ENGINE", config.get('wait_engine', "polling"))
+    if engine not in ("polling", "observer"):
+        pytest.fail(f"Unknown wait engine '{engine}'. Use 'polling' or 'observer'.")
+    BasePage.wait_engine = engine
+    yield engine
+    BasePage.wait_engine = "polling"
+
+
+# Fixture counting BasePage action retries and the time spent on them
+@pytest.fixture(scope="session")
+def retry_stats(request):
+    stats = RetryStats()
+    request.config.stash[retry_stats_key] = stats.totals
+    BasePage.retry_stats = stats
+    yield stats
+    BasePage.retry_stats = None
+    if hasattr(request.config, 'workeroutput'):
+        request.config.workeroutput['retry_stats'] = stats.totals
+
+
+# Fixture reading Navigation/Resource Timing, FCP and LCP after page-object navigations
+@pytest.fixture(scope="session")
+def page_timing(request, config):
+    monitor = PageTimingMonitor.from_config(config)
+    if monitor is None:
+        yield None
+        return
+    BasePage.page_timing = monitor
+    yield monitor
+    BasePage.page_timing = None
+    request.config.stash[page_timing_key] = monitor.export()
+    if hasattr(request.config, 'workeroutput'):
+        request.config.workeroutput['page_timing'] = monitor.export()
+
+
+# Fixture writing JSON-lines logs (test records and page-object spans) from a background thread
+@pytest.fixture(scope="session")
+def structured_log(config):
+    settings = config.get('logging') or {}
+    path = settings.get('file', os.path.join("logs", "test_execution.jsonl"))
+    listener = start_logging(worker_log_file(path) if worker_id() != "master" else path,
+                             max_bytes=int(settings.get('max_mb', 10) * 1024 * 1024),
+                             backup_count=settings.get('backups', 5))
+    yield logger
+    stop_logging(listener)
+
+
+# Fixture holding one browser per worker for the whole session
+@pytest.fixture(scope="session")
+def driver_pool(request, config, driver_path, browser_profile):
+    pool = DriverPool(functools.partial(create_driver, driver_path, browser_profile),
+                      reuse=config.get('reuse_browser', False))
+    yield pool
+    pool.discard()
+    request.config.stash[driver_stats_key] = pool.stats()
+    # Under xdist, hand the counters to the controller for the summary
+    if hasattr(request.config, 'workeroutput'):
+        request.config.workeroutput['driver_stats'] = pool.stats()
+
+
+# Hand the data seed and run token to every xdist worker
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput['data_seed'] = node.config.stash[data_seed_key]
+    node.workerinput['data_run'] = node.config.stash[data_run_key]
+
+
+# Sum up browser counters reported by finished xdist workers
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # Keep the slowest worker's driver resolution as the reported metric
+    resolution = getattr(node, 'workeroutput', {}).get('driver_resolution')
+    slowest = node.config.stash.get(driver_resolution_key, None)
+    if resolution and (slowest is None or resolution['seconds'] > slowest['seconds']):
+        node.config.stash[driver_resolution_key] = resolution
+
+    resource_stats = getattr(node, 'workeroutput', {}).get('resource_stats')
+    if resource_stats:
+        node.config.stash[resource_stats_key] = merge_resource_stats(
+            node.config.stash.get(resource_stats_key, None), resource_stats)
+
+    artifact_stats = getattr(node, 'workeroutput', {}).get('artifact_stats')
+    if artifact_stats:
+        totals = node.config.stash.get(artifact_stats_key, dict.fromkeys(artifact_stats, 0))
+        node.config.stash[artifact_stats_key] = {key: totals[key] + artifact_stats[key] for key in totals}
+
+    worker_retry_stats = getattr(node, 'workeroutput', {}).get('retry_stats')
+    if worker_retry_stats:
+        node.config.stash[retry_stats_key] = merge_retry_stats(
+            node.config.stash.get(retry_stats_key, None), worker_retry_stats)
+
+    worker_page_timing = getattr(node, 'workeroutput', {}).get('page_timing')
+    if worker_page_timing:
+        node.config.stash[page_timing_key] = merge_page_timing(
+            node.config.stash.get(page_timing_key, None), worker_page_timing)
+
+    worker_storage_stats = getattr(node, 'workeroutput', {}).get('storage_state_stats')
+    if worker_storage_stats:
+        totals = node.config.stash.get(storage_state_stats_key, dict.fromkeys(worker_storage_stats, 0))
+        node.config.stash[storage_state_stats_key] = {key: totals[key] + worker_storage_stats[key] for key in totals}
+
+    worker_stats = getattr(node, 'workeroutput', {}).get('driver_stats')
+    if worker_stats:
+        totals = node.config.stash.get(driver_stats_key, {'launches': 0, 'reuses': 0, 'resets_failed': 0})
+        node.config.stash[driver_stats_key] = {key: totals[key] + worker_stats[key] for key in totals}
 
 
 # Fixture to set up WebDriver
 @pytest.fixture(scope="function")
-def setup(request, config, locators, data):
+def setup(request, structured_log, driver_pool, command_recorder, command_trace, resource_monitor, artifact_service,
+          wait_engine, retry_stats, page_timing, config, locators, data):
+    structured_log.info(f"{request.node.nodeid} started", extra={'event': "test_start"})
+    # Tests marked with fresh_browser get a brand-new browser process
+    fresh = request.node.get_closest_marker("fresh_browser") is not None
+    try:
+        driver = driver_pool.acquire(fresh=fresh)
+    except Exception as e:
+        pytest.fail(f"Failed to initialize WebDriver: {e}")
+    if command_recorder is not None:
+        add_command_listener(driver, command_recorder)
+        command_recorder.start_test(request.node.nodeid)
+    if command_trace is not None:
+        add_command_listener(driver, command_trace)
+    retry_stats.start_test()
+    if page_timing is not None:
+        page_timing.start_test()
+    # The report hook finds the test's browser here
+    request.node.stash[item_driver_key] = driver
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-        driver.maximize_window()
         request.cls.driver = driver
+        request.cls.artifacts = artifact_service
+        request.cls.nodeid = request.node.nodeid
         request.cls.config = config
         request.cls.locators = locators
         request.cls.data = data
         yield
-    except Exception as e:
-        pytest.fail(f"Failed to initialize WebDriver: {e}")
     finally:
-        driver.quit()
+        if resource_monitor is not None:
+            resource_monitor.collect(driver)
+        driver_pool.release(fresh=fresh)
+
+
+# Report how often the browser was launched versus reused
+def pytest_terminal_summary(terminalreporter, config):
+    stats = config.stash.get(driver_stats_key, None)
+    if stats is not None:
+        terminalreporter.write_sep("-", "browser reuse")
+        terminalreporter.write_line(format_stats(stats))
+    storage_stats = config.stash.get(storage_state_stats_key, None)
+    if storage_stats is not None:
+        terminalreporter.write_line(format_storage_state_stats(storage_stats))
+    resolution = config.stash.get(driver_resolution_key, None)
+    if resolution is not None:
+        terminalreporter.write_line(format_resolution(resolution))
+    resource_stats = config.stash.get(resource_stats_key, None)
+    if resource_stats is not None:
+        terminalreporter.write_line(format_resource_stats(resource_stats))
+    artifact_stats = config.stash.get(artifact_stats_key, None)
+    if artifact_stats is not None:
+        terminalreporter.write_line(format_artifact_stats(artifact_stats))
+    retry_stats = config.stash.get(retry_stats_key, None)
+    if retry_stats is not None:
+        terminalreporter.write_line(format_retry_stats(retry_stats))
+    page_timing = config.stash.get(page_timing_key, None)
+    if page_timing is not None and page_timing['samples']:
+        for line in format_page_timing(page_timing):
+            terminalreporter.write_line(line)
+    seed = config.stash[data_seed_key]
+    terminalreporter.write_line(f"Test data seed: {seed} (rerun with DATA_SEED={seed}), "
+                                f"email run token: {config.stash[data_run_key]}")
+    shard_plan = config.stash.get(shard_plan_key, None)
+    if shard_plan is not None:
+        terminalreporter.write_line(format_shard_plan(shard_plan))
 
 
 # Customize pytest-html report metadata
 def pytest_configure(config):
+    config.addinivalue_line("markers", "fresh_browser: run the test in a newly launched browser instead of a reused one")
+    config.addinivalue_line("markers", "ui_preconditions: register/log in through the UI instead of the HTTP fast path")
+    config.addinivalue_line("markers", "storage_state(role): start the test logged in from a cached snapshot of role ('login' or 'registered')")
+
+    # xdist workers use the controller's data seed so one seed reproduces the whole run
+    # The run token is fresh for every run (DATA_RUN reuses one), so reproduced runs register new accounts
+    if hasattr(config, 'workerinput'):
+        config.stash[data_seed_key] = config.workerinput['data_seed']
+        config.stash[data_run_key] = config.workerinput['data_run']
+    else:
+        config.stash[data_seed_key] = choose_seed()
+        config.stash[data_run_key] = choose_run_token()
+
+    # Give every xdist worker its own log file; the controller merges the reports
+    log_file = config.getoption('log_file') or config.getini('log_file')
+    if log_file and hasattr(config, 'workerinput'):
+        config.option.log_file = worker_log_file(log_file)
+
+    # Results are streamed to reports/live/ as they arrive (set STREAM_REPORT to another directory, or "" to disable);
+    # only the controller writes it because xdist forwards every worker's results there
+    stream_directory = os.environ.get("STREAM_REPORT", os.path.join("reports", "live"))
+    if stream_directory and not hasattr(config, 'workerinput'):
+        html_path = config.getoption('htmlpath', None) or "report.html"
+        config.pluginmanager.register(StreamingReport(stream_directory, os.path.dirname(os.path.abspath(html_path))),
+                                      "stream_report")
+
     if config.pluginmanager.hasplugin('html'):
         if hasattr(config, '_metadata'):
             config._metadata.clear()
@@ -118,6 +528,25 @@ def pytest_html_report_title(report):
 
 # Add custom information to the pytest-html report summary
 @pytest.hookimpl(tryfirst=True)
-def pytest_html_results_summary(prefix, summary, postfix):
-    prefix.extend([pytest_html.extras.html('<p>Project: Centime Automation</p>'),
-                   pytest_html.extras.html(f'<p>Date: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>')])
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    # pytest-html 4 renders these entries as HTML strings
+    prefix.extend(['<p>Project: Centime Automation</p>',
+                   f'<p>Date: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>'])
+    prefix.append(f'<p>Test data seed: {session.config.stash[data_seed_key]}, '
+                  f'email run token: {session.config.stash[data_run_key]}</p>')
+    storage_stats = session.config.stash.get(storage_state_stats_key, None)
+    if storage_stats is not None:
+        prefix.append(f'<p>{format_storage_state_stats(storage_stats)}</p>')
+    resolution = session.config.stash.get(driver_resolution_key, None)
+    if resolution is not None:
+        prefix.append(f'<p>{format_resolution(resolution)}</p>')
+    resource_stats = session.config.stash.get(resource_stats_key, None)
+    if resource_stats is not None:
+        prefix.append(f'<p>{format_resource_stats(resource_stats)}</p>')
+    retry_stats = session.config.stash.get(retry_stats_key, None)
+    if retry_stats is not None:
+        prefix.append(f'<p>{format_retry_stats(retry_stats)}</p>')
+    page_timing = session.config.stash.get(page_timing_key, None)
+    if page_timing is not None and page_timing['samples']:
+        lines = format_page_timing(page_timing)
+        prefix.append(f'<p>{escape(lines[0])}</p><ul>' + "".join(f"<li>{escape(line.strip())}</li>" for line in lines[1:]) + '</ul>')
@@ -1,25 +1,184 @@
+import time
+from contextlib import contextmanager
 from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
     ElementNotInteractableException,
+    ElementClickInterceptedException,
+    StaleElementReferenceException,
+    InvalidSelectorException,
+    NoSuchWindowException,
+    InvalidSessionIdException,
     WebDriverException
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# Fills a whole form in one round trip. Each field is looked up when it is reached,
+# so fields re-rendered by an earlier change (e.g. state after country) are found.
+FILL_FORM_SCRIPT = """
+const fields = arguments[0];
+const missing = [];
+const find = (field) => field.by === 'css selector'
+    ? document.querySelector(field.locator)
+    : document.evaluate(field.locator, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const fire = (element) => {
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+};
+const selectOption = (element, wanted) => {
+    const target = wanted.trim().toLowerCase();
+    const options = Array.from(element.options);
+    const option = options.find(o => o.value.toLowerCase() === target || o.text.trim().toLowerCase() === target)
+        || options.find(o => o.text.trim().toLowerCase().startsWith(target));
+    if (!option) { return false; }
+    element.value = option.value;
+    return true;
+};
+for (const field of fields) {
+    const element = find(field);
+    if (!element) { missing.push(field.name); continue; }
+    if (field.kind === 'select2' || (field.kind === 'state' && element.tagName === 'SELECT')) {
+        if (!selectOption(element, field.value)) { missing.push(field.name); continue; }
+    } else {
+        element.value = field.value;
+    }
+    fire(element);
+}
+return missing;
+"""
+
+# Blocks inside the page until a condition holds for a locator, instead of polling over WebDriver.
+# Re-checks on every DOM mutation (plus a slow interval for CSS transitions) and resolves with the element
+# (true for disappear), or null when the timeout runs out. A navigation aborts the script and the caller
+# falls back to polling.
+WAIT_FOR_CONDITION_SCRIPT = """
+const [by, value, condition, timeoutMs, done] = arguments;
+const find = () => by === 'css selector'
+    ? document.querySelector(value)
+    : document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const visible = (element) => {
+    const style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none' && element.getClientRects().length > 0;
+};
+const checks = {
+    presence: () => find() !== null,
+    visible: () => { const element = find(); return element !== null && visible(element); },
+    clickable: () => { const element = find(); return element !== null && visible(element) && !element.disabled; },
+    disappear: () => { const element = find(); return element === null || !visible(element); },
+};
+const check = checks[condition];
+const found = () => condition === 'disappear' ? true : find();
+if (check()) { done(found()); return; }
+let finished = false;
+const finish = (result) => {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(result);
+};
+const observer = new MutationObserver(() => { if (check()) { finish(found()); } });
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+const interval = setInterval(() => { if (check()) { finish(found()); } }, 100);
+const timer = setTimeout(() => finish(null), timeoutMs);
+"""
+
+# Locator strategies the in-page waiter can evaluate; others always poll
+OBSERVABLE_STRATEGIES = (By.CSS_SELECTOR, By.XPATH)
+
+# Errors a retry can fix (the page was still settling) versus errors no retry can fix
+RETRYABLE_ERRORS = (StaleElementReferenceException, ElementClickInterceptedException, ElementNotInteractableException)
+FATAL_ERRORS = (InvalidSelectorException, NoSuchWindowException, InvalidSessionIdException)
+
+# First pause between attempts; doubled after every retry
+RETRY_BACKOFF = 0.1
+
+
+class Deadline:
+    """Point in time an action and everything nested in it must finish by."""
+
+    def __init__(self, seconds):
+        self.end = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(self.end - time.monotonic(), 0)
+
+
 class BasePage:
+    # "polling" (WebDriverWait only) or "observer" (MutationObserver first); set per session from config.yaml
+    wait_engine = "polling"
+    # Session-wide RetryStats (utils/retries.py), set by conftest when the report wants retry counts
+    retry_stats = None
+    # Session-wide PageTimingMonitor (utils/page_timing.py), set by conftest when page_timing is enabled
+    page_timing = None
+
     def __init__(self, driver, timeout=10):
         """Initialize with WebDriver and a default timeout."""
         self.driver = driver
         self.wait = WebDriverWait(self.driver, timeout)
         self.timeout = timeout
+        self.deadline = None
+
+    @contextmanager
+    def budget(self, seconds=None):
+        """Share one deadline (default: the page timeout) across every wait and retry inside the block."""
+        if self.deadline is not None:
+            # Nested actions run inside the outer budget
+            yield self.deadline
+            return
+        self.deadline = Deadline(seconds or self.timeout)
+        try:
+            yield self.deadline
+        finally:
+            self.deadline = None
+
+    def time_left(self, timeout=None):
+        """Timeout for a wait: the requested one, cut down to what is left of the current budget."""
+        timeout = timeout or self.timeout
+        if self.deadline is None:
+            return timeout
+        return min(timeout, self.deadline.remaining())
+
+    def retry(self, action, description, retries=3):
+        """Run action until it succeeds, backing off exponentially after retryable errors within the budget.
+
+        When the retries or the budget run out, the last retryable error is raised as it is.
+        """
+        with self.budget() as deadline:
+            attempt = 0
+            first_failure = None
+            while True:
+                try:
+                    result = action()
+                    self._record_retries(description, attempt, first_failure, failed=False)
+                    return result
+                except FATAL_ERRORS:
+                    raise
+                except RETRYABLE_ERRORS:
+                    attempt += 1
+                    first_failure = first_failure or time.monotonic()
+                    delay = RETRY_BACKOFF * 2 ** (attempt - 1)
+                    if attempt >= retries or delay >= deadline.remaining():
+                        self._record_retries(description, attempt - 1, first_failure, failed=True)
+                        # Keep the error type so callers can still handle e.g. an intercepted click
+                        raise
+                    time.sleep(delay)
+
+    def _record_retries(self, description, retries, first_failure, failed):
+        if self.retry_stats is not None and first_failure is not None:
+            self.retry_stats.record(description, retries, time.monotonic() - first_failure, failed)
 
     def wait_for_element_to_disappear(self, locator, timeout=None):
         """Wait until the element disappears from the page."""
-        timeout = timeout or self.timeout
+        timeout = self.time_left(timeout)
         try:
-            self.wait.until(EC.invisibility_of_element_located(locator))
+            found, remaining = self.observe(locator, "disappear", timeout)
+            if found:
+                return
+            WebDriverWait(self.driver, remaining).until(EC.invisibility_of_element_located(locator))
         except TimeoutException as e:
             raise TimeoutError(f"Timeout waiting for element {locator} to disappear: {e}")
 
@@ -33,42 +192,64 @@ class BasePage:
 
     def enter_text(self, locator, text, retries=3):
         """Wait for element to be visible and enter text with retries."""
-        for attempt in range(retries):
-            try:
-                element = self.wait_for_element(locator)
-                element.clear()
-                element.send_keys(text)
-                return
-            except (TimeoutException, ElementNotInteractableException) as e:
-                if attempt == retries - 1:
-                    raise TimeoutError(f"Failed to enter text in element {locator} after {retries} retries: {e}")
+        def enter():
+            element = self.wait_for_element(locator)
+            element.clear()
+            element.send_keys(text)
+        self.retry(enter, f"enter text in element {locator}", retries)
 
     def click_element(self, locator, retries=3):
         """Wait for element to be clickable and click with retries."""
-        for attempt in range(retries):
-            try:
-                element = self.wait_for_clickable(locator)
-                element.click()
-                return
-            except (TimeoutException, ElementNotInteractableException) as e:
-                if attempt == retries - 1:
-                    raise TimeoutError(f"Failed to click on element {locator} after {retries} retries: {e}")
+        self.retry(lambda: self.wait_for_clickable(locator).click(), f"click on element {locator}", retries)
 
     def select_dropdown_option(self, locator, value):
         """Select an option from a dropdown menu by visible text."""
         try:
-            self.scroll_to_element(locator)
-            self.click_element(locator)
-            option_locator = (By.XPATH, f"//option[contains(text(), '{value}')]")
-            self.click_element(option_locator)
+            with self.budget():
+                self.scroll_to_element(locator)
+                self.click_element(locator)
+                option_locator = (By.XPATH, f"//option[contains(text(), '{value}')]")
+                self.click_element(option_locator)
         except Exception as e:
             raise Exception(f"Failed to select option '{value}' from dropdown {locator}: {e}")
 
+    def observe(self, locator, condition, timeout):
+        """Wait in the page for condition (presence, visible, clickable, disappear).
+
+        Returns what the observer found (the element, or True for disappear) and the time left. The
+        caller uses a found element directly and only falls back to a WebDriverWait when nothing was
+        found, e.g. because a navigation aborted the script.
+        """
+        if self.wait_engine != "observer" or locator[0] not in OBSERVABLE_STRATEGIES:
+            return None, timeout
+        start = time.monotonic()
+        try:
+            found = self.driver.execute_async_script(WAIT_FOR_CONDITION_SCRIPT, locator[0], locator[1], condition,
+                                                     int(timeout * 1000))
+        except WebDriverException:
+            # Navigation, script timeout or an invalid selector: leave it to the polling wait
+            found = None
+        return found, max(timeout - (time.monotonic() - start), 0)
+
+    def wait_for_element_visible(self, locator, timeout=None):
+        """Wait until the element is present and visible."""
+        timeout = self.time_left(timeout)
+        try:
+            found, remaining = self.observe(locator, "visible", timeout)
+            if found:
+                return found
+            return WebDriverWait(self.driver, remaining).until(EC.visibility_of_element_located(locator))
+        except TimeoutException as e:
+            raise TimeoutError(f"Timeout while waiting for element {locator} to be visible: {e}")
+
     def wait_for_element(self, locator, timeout=None):
         """Wait until the element is present on the page."""
-        timeout = timeout or self.timeout
+        timeout = self.time_left(timeout)
         try:
-            return WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located(locator))
+            found, remaining = self.observe(locator, "presence", timeout)
+            if found:
+                return found
+            return WebDriverWait(self.driver, remaining).until(EC.presence_of_element_located(locator))
         except TimeoutException as e:
             raise TimeoutError(f"Timeout while waiting for element {locator} to be present: {e}")
 
@@ -93,7 +274,7 @@ class BasePage:
         try:
             self.wait_for_clickable(locator)
             return True
-        except TimeoutException:
+        except TimeoutError:
             return False
 
     def find_elements(self, locator):
@@ -105,8 +286,22 @@ class BasePage:
 
     def wait_for_clickable(self, locator, timeout=None):
         """Wait until the element is clickable."""
-        timeout = timeout or self.timeout
+        timeout = self.time_left(timeout)
         try:
-            return WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable(locator))
+            found, remaining = self.observe(locator, "clickable", timeout)
+            if found:
+                return found
+            return WebDriverWait(self.driver, remaining).until(EC.element_to_be_clickable(locator))
         except TimeoutException as e:
             raise TimeoutError(f"Element {locator} not clickable after {timeout} seconds: {e}")
+
+    def fill_form(self, schema, values):
+        """Fill every field of a form schema that has a value, in a single script call."""
+        fields = [
+            {'name': name, 'by': field['locator'][0], 'locator': field['locator'][1],
+             'kind': field.get('kind', 'text'), 'value': str(values[name])}
+            for name, field in schema.items() if name in values
+        ]
+        missing = self.driver.execute_script(FILL_FORM_SCRIPT, fields)
+        if missing:
+            raise Exception(f"Failed to fill form fields {missing}: element or option not found")
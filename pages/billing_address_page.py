@@ -1,35 +1,48 @@
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from .base_page import BasePage
+from utils.page_timing import navigation
+from utils.structured_log import action
 
 
 class BillingAddressPage(BasePage):
     def __init__(self, driver, locators):
         super().__init__(driver)
-        self.address_link = (By.XPATH, locators['billing_address_page']['address'])
-        self.billing_address_link = (By.XPATH, locators['billing_address_page']['billing_address'])
-        self.shipping_address_link = (By.XPATH, locators['billing_address_page']['shipping_address'])
-        self.first_name = (By.XPATH, locators['billing_address_page']['first_name'])
-        self.last_name = (By.XPATH, locators['billing_address_page']['last_name'])
-        self.company_name = (By.XPATH, locators['billing_address_page']['company_name'])
-        self.email = (By.XPATH, locators['billing_address_page']['email'])
-        self.phone = (By.XPATH, locators['billing_address_page']['phone'])
-        self.country = (By.XPATH, locators['billing_address_page']['country'])
-        self.country_search_input = (By.XPATH, locators['billing_address_page']['country_search_input'])
-        self.address_1 = (By.XPATH, locators['billing_address_page']['address_1'])
-        self.address_2 = (By.XPATH, locators['billing_address_page']['address_2'])
-        self.city = (By.XPATH, locators['billing_address_page']['city'])
-        self.state = (By.XPATH, locators['billing_address_page']['state'])
-        self.postcode = (By.XPATH, locators['billing_address_page']['postcode'])
-        self.save_button = (By.XPATH, locators['billing_address_page']['save_button'])
+        self.address_link = locators['billing_address_page']['address']
+        self.billing_address_link = locators['billing_address_page']['billing_address']
+        self.shipping_address_link = locators['billing_address_page']['shipping_address']
+        self.first_name = locators['billing_address_page']['first_name']
+        self.last_name = locators['billing_address_page']['last_name']
+        self.company_name = locators['billing_address_page']['company_name']
+        self.email = locators['billing_address_page']['email']
+        self.phone = locators['billing_address_page']['phone']
+        self.country = locators['billing_address_page']['country']
+        self.country_search_input = locators['billing_address_page']['country_search_input']
+        self.address_1 = locators['billing_address_page']['address_1']
+        self.address_2 = locators['billing_address_page']['address_2']
+        self.city = locators['billing_address_page']['city']
+        self.state = locators['billing_address_page']['state']
+        self.postcode = locators['billing_address_page']['postcode']
+        self.save_button = locators['billing_address_page']['save_button']
+        self.form_schema = locators['billing_address_form']
 
+    @navigation("addresses")
+    @action
     def go_to_addresses_section(self):
         self.click_element(self.address_link)
 
+    @navigation("billing_address")
+    @action
     def go_to_billing_address(self):
         self.click_element(self.billing_address_link)
 
-    def enter_billing_address(self, address_data):
+    @action
+    def enter_billing_address(self, address_data, real_keystrokes=False):
+        """Fill the billing address form; real_keystrokes types field by field like a user."""
+        if not real_keystrokes:
+            self.wait_for_element(self.first_name)
+            self.fill_form(self.form_schema, address_data)
+            return
+
         self.enter_text(self.first_name, address_data['first_name'])
         self.enter_text(self.last_name, address_data['last_name'])
         self.enter_text(self.company_name, address_data['company_name'])
@@ -61,5 +74,6 @@ class BillingAddressPage(BasePage):
         # self.select_dropdown_option(self.state, address_data['state'])
         self.enter_text(self.postcode, address_data['postcode'])
 
+    @action
     def save_address(self):
         self.click_element(self.save_button)
@@ -1,13 +1,105 @@
+import re
+from collections import namedtuple
+from types import MappingProxyType
 from selenium.common import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from .base_page import BasePage
+from utils.page_timing import navigation
+from utils.structured_log import action
+
+# Reads the whole cart table and the totals box in one round trip.
+# Returns null while neither the cart form nor the empty-cart message is on the page.
+CART_SNAPSHOT_SCRIPT = """
+const table = document.querySelector('form.woocommerce-cart-form table.cart, table.shop_table.cart');
+if (!table && !document.querySelector('.cart-empty')) { return null; }
+const text = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element ? element.textContent.trim() : '';
+};
+// First amount of a cell, so tax notes and struck-out regular prices are not read; the sale price wins
+const amount = (root, selector) => {
+    const cell = selector ? root.querySelector(selector) : root;
+    if (!cell) { return ''; }
+    const price = cell.querySelector('ins .woocommerce-Price-amount') || cell.querySelector('.woocommerce-Price-amount');
+    if (!price) { return null; }
+    const bdi = price.querySelector('bdi');
+    return (bdi || price).textContent.trim();
+};
+const rows = table ? Array.from(table.querySelectorAll('tr.cart_item')).map(row => {
+    const link = row.querySelector('td.product-name a');
+    const quantity = row.querySelector('td.product-quantity input.qty');
+    const remove = row.querySelector('a.remove');
+    return {
+        name: link ? link.textContent.trim() : text(row, 'td.product-name'),
+        product_id: remove ? remove.getAttribute('data-product_id') : null,
+        price: amount(row, 'td.product-price') || '',
+        quantity: quantity ? quantity.value : text(row, 'td.product-quantity'),
+        subtotal: amount(row, 'td.product-subtotal') || '',
+    };
+}) : [];
+const totals = {};
+document.querySelectorAll('.cart_totals tr').forEach(row => {
+    // Rows without an amount, e.g. free shipping or a list of shipping methods, are skipped
+    const value = row.className ? amount(row, 'td') : null;
+    if (value) { totals[row.className.split(' ')[0]] = value; }
+});
+return {rows: rows, totals: totals};
+"""
+
+# One product line of the cart, e.g. CartRow("Selenium Ruby", "160", 500.0, 1, 500.0)
+CartRow = namedtuple("CartRow", ["name", "product_id", "unit_price", "quantity", "subtotal"])
+
+
+def parse_price(text):
+    """Convert the first amount in a displayed text such as '₹1,234.50' to a float; empty text is 0.0."""
+    if not text.strip():
+        return 0.0
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", text)
+    if not match:
+        raise Exception(f"Failed to parse a price from '{text}'")
+    amount = float(match.group().replace(",", ""))
+    # The sign may come before the currency symbol, e.g. '-₹5.00'
+    return -amount if text[:match.start()].strip().startswith("-") else amount
+
+
+class CartSnapshot(namedtuple("CartSnapshot", ["rows", "by_name", "totals"])):
+    """Immutable view of the cart at one moment; lookups by product name are dictionary lookups."""
+    __slots__ = ()
+
+    @classmethod
+    def from_script_result(cls, result):
+        rows = tuple(CartRow(row['name'], row['product_id'], parse_price(row['price']),
+                             int(parse_price(row['quantity'])), parse_price(row['subtotal']))
+                     for row in result['rows'])
+        totals = {name: parse_price(amount) for name, amount in result['totals'].items()}
+        return cls(rows, MappingProxyType({row.name: row for row in rows}), MappingProxyType(totals))
+
+    def __contains__(self, product_name):
+        return product_name in self.by_name
+
+    def quantity(self, product_name):
+        """Quantity of a product, or 0 if it is not in the cart."""
+        row = self.by_name.get(product_name)
+        return row.quantity if row else 0
+
+    @property
+    def total(self):
+        return self.totals.get('order-total', 0.0)
+
+    @property
+    def subtotal(self):
+        return self.totals.get('cart-subtotal', sum(row.subtotal for row in self.rows))
 
 
 class CartPage(BasePage):
     def __init__(self, driver, locators):
         super().__init__(driver)
-        self.view_cart_button = (By.XPATH, locators['cart_page']['cart'])
+        self.view_cart_button = locators['cart_page']['cart']
 
+    @navigation("cart")
+    @action
     def go_to_cart(self):
         self.click_element(self.view_cart_button)
 
@@ -18,6 +110,7 @@ class CartPage(BasePage):
             return True
         except NoSuchElementException:
             return False
+    @action
     def remove_product_from_cart(self, product_name):
         try:
             # Scroll to the product remove button to make it visible
@@ -32,29 +125,30 @@ class CartPage(BasePage):
         except Exception as e:
             raise Exception(f"Failed to remove product '{product_name}' from the cart: {e}")
 
+    @action
+    def get_cart_snapshot(self, timeout=None):
+        """Read every cart row and the totals in a single script call."""
+        timeout = self.time_left(timeout)
+        try:
+            result = WebDriverWait(self.driver, timeout).until(lambda driver: driver.execute_script(CART_SNAPSHOT_SCRIPT))
+        except TimeoutException as e:
+            raise TimeoutError(f"Cart table not found after {timeout} seconds: {e}")
+        return CartSnapshot.from_script_result(result)
+
     def is_product_in_cart(self, product_name):
-        product_locator = (By.XPATH, f"//tr[contains(., '{product_name}')]")
-        return self.is_element_present(product_locator)
+        # Partial names match, like the row text check this replaced
+        return any(product_name in row.name for row in self.get_cart_snapshot().rows)
 
     def get_product_quantity(self, product_name):
+        """Quantity of a product, or 0 if it is not in the cart or the cart cannot be read."""
         try:
-            # Find the quantity field for the specific product
-            quantity_locator = (By.XPATH, f"//td[@class='product-name']//a[text()='{product_name}']//following::input[1]")
-            quantity_element = self.wait_for_element(quantity_locator)
-            return int(quantity_element.get_attribute("value"))
+            return self.get_cart_snapshot().quantity(product_name)
         except Exception:
             return 0
 
     def get_cart_total_amount(self):
+        """Order total, or 0.0 if the cart cannot be read."""
         try:
-            # Get the total amount displayed in the cart
-            total_amount_locator = (By.XPATH, "//tr[@class='order-total']//span[@class='woocommerce-Price-amount amount']")
-            total_amount_element = self.wait_for_element(total_amount_locator)
-            # Extract the amount as a float value (assuming the format is ₹123.45)
-            total_amount_text = total_amount_element.text.replace("₹", "").strip()
-            return float(total_amount_text)
+            return self.get_cart_snapshot().total
         except Exception:
             return 0.0
-
-    def wait_for_element_to_disappear(self, remove_button_locator):
-        pass
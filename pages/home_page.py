@@ -1,11 +1,14 @@
 
 from pages.base_page import BasePage
-from selenium.webdriver.common.by import By
+from utils.page_timing import navigation
+from utils.structured_log import action
 
 class HomePage(BasePage):
     def __init__(self, driver, locators):
         super().__init__(driver)
-        self.my_account = (By.XPATH, locators['home_page']['my_account'])
+        self.my_account = locators['home_page']['my_account']
 
+    @navigation("my_account")
+    @action
     def go_to_my_account(self):
         self.click_element(self.my_account)
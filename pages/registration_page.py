@@ -1,15 +1,24 @@
+from collections import namedtuple
 from pages.base_page import BasePage
-from selenium.webdriver.common.by import By
-import time
-from selenium.webdriver.common.keys import Keys
+from utils.structured_log import action
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Result of WooCommerce's password strength meter, e.g. ("short", "Very weak - Please enter a stronger password.")
+PasswordStrength = namedtuple("PasswordStrength", ["level", "message"])
+
+STRENGTH_LEVELS = ("short", "bad", "good", "strong")
+
 
 class RegistrationPage(BasePage):
     def __init__(self, driver, locators):
         super().__init__(driver)
-        self.email_address = (By.XPATH, locators['registration_page']['email_address'])
-        self.password = (By.XPATH, locators['registration_page']['password'])
-        self.register_button = (By.XPATH, locators['registration_page']['register_button'])
+        self.email_address = locators['registration_page']['email_address']
+        self.password = locators['registration_page']['password']
+        self.register_button = locators['registration_page']['register_button']
+        self.password_strength = locators['registration_page']['password_strength']
 
+    @action
     def register(self, email, password):
         # Step 1: Wait for email field and enter email
         self.enter_text(self.email_address, email)
@@ -17,10 +26,49 @@ class RegistrationPage(BasePage):
         # Step 2: Wait for password field and enter password
         self.enter_text(self.password, password)
 
+        # Step 3: Let the strength meter finish; weak passwords keep the button disabled
+        strength = None
+        if password:
+            strength = self.wait_for_password_strength()
+            if strength.level in ("short", "bad"):
+                return strength
 
-        # Optional: Wait a little for the form to validate
-        time.sleep(2)
-        # Step 4: Click on the register button
-        self.click_element(self.email_address)
-        # Step 4: Click on the register button
+        # Step 4: Click on the register button once it is enabled
         self.click_element(self.register_button)
+        return strength
+
+    @action
+    def wait_for_password_strength(self, timeout=None):
+        """Wait until the strength meter shows the same result twice in a row and return it."""
+        timeout = self.time_left(timeout)
+        meter = [self.wait_for_element(self.password_strength, timeout)]
+        last_reading = []
+
+        def settled(driver):
+            try:
+                reading = driver.execute_script(
+                    "return [arguments[0].className, arguments[0].textContent.trim()];", meter[0])
+            except StaleElementReferenceException:
+                # WooCommerce replaced the meter on keyup; read the new one from scratch
+                try:
+                    meter[0] = driver.find_element(*self.password_strength)
+                except NoSuchElementException:
+                    pass
+                last_reading.clear()
+                return False
+            level = next((level for level in STRENGTH_LEVELS if level in reading[0].split()), None)
+            if level is None or not reading[1]:
+                return False
+            if last_reading and last_reading[-1] == reading:
+                return PasswordStrength(level, reading[1])
+            last_reading.append(reading)
+            return False
+
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(settled)
+        except TimeoutException as e:
+            raise TimeoutError(f"Password strength meter did not settle after {timeout} seconds: {e}")
+
+    def is_register_enabled(self):
+        """Check whether WooCommerce currently allows submitting the registration form."""
+        return self.wait_for_element(self.register_button).is_enabled()
@@ -1,34 +1,47 @@
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from .base_page import BasePage
+from utils.page_timing import navigation
+from utils.structured_log import action
 
 class ShippingAddressPage(BasePage):
     def __init__(self, driver, locators):
         super().__init__(driver)
-        self.address_link = (By.XPATH, locators['shipping_address_page']['address'])
-        self.shipping_address_link = (By.XPATH, locators['shipping_address_page']['shipping_address'])
-        self.first_name = (By.XPATH, locators['shipping_address_page']['first_name'])
-        self.last_name = (By.XPATH, locators['shipping_address_page']['last_name'])
-        self.company_name = (By.XPATH, locators['shipping_address_page']['company_name'])
-        # self.email = (By.XPATH, locators['shipping_address_page']['email'])
-        # self.phone = (By.XPATH, locators['shipping_address_page']['phone'])
-        self.country = (By.XPATH, locators['shipping_address_page']['country'])
-        self.country_search_input = (By.XPATH, locators['shipping_address_page']['country_search_input'])
-        self.address_1 = (By.XPATH, locators['shipping_address_page']['address_1'])
-        self.address_2 = (By.XPATH, locators['shipping_address_page']['address_2'])
-        self.city = (By.XPATH, locators['shipping_address_page']['city'])
-        self.state = (By.XPATH, locators['shipping_address_page']['state'])
-        self.state_search_input = (By.XPATH, locators['shipping_address_page']['state_search_input'])
-        self.postcode = (By.XPATH, locators['shipping_address_page']['postcode'])
-        self.save_button = (By.XPATH, locators['shipping_address_page']['save_button'])
+        self.address_link = locators['shipping_address_page']['address']
+        self.shipping_address_link = locators['shipping_address_page']['shipping_address']
+        self.first_name = locators['shipping_address_page']['first_name']
+        self.last_name = locators['shipping_address_page']['last_name']
+        self.company_name = locators['shipping_address_page']['company_name']
+        # self.email = locators['shipping_address_page']['email']
+        # self.phone = locators['shipping_address_page']['phone']
+        self.country = locators['shipping_address_page']['country']
+        self.country_search_input = locators['shipping_address_page']['country_search_input']
+        self.address_1 = locators['shipping_address_page']['address_1']
+        self.address_2 = locators['shipping_address_page']['address_2']
+        self.city = locators['shipping_address_page']['city']
+        self.state = locators['shipping_address_page']['state']
+        self.state_search_input = locators['shipping_address_page']['state_search_input']
+        self.postcode = locators['shipping_address_page']['postcode']
+        self.save_button = locators['shipping_address_page']['save_button']
+        self.form_schema = locators['shipping_address_form']
 
+    @navigation("addresses")
+    @action
     def go_to_addresses_section(self):
         self.click_element(self.address_link)
 
+    @navigation("shipping_address")
+    @action
     def go_to_shipping_address(self):
         self.click_element(self.shipping_address_link)
 
-    def enter_shipping_address(self, address_data):
+    @action
+    def enter_shipping_address(self, address_data, real_keystrokes=False):
+        """Fill the shipping address form; real_keystrokes types field by field like a user."""
+        if not real_keystrokes:
+            self.wait_for_element(self.first_name)
+            self.fill_form(self.form_schema, address_data)
+            return
+
         self.enter_text(self.first_name, address_data['first_name'])
         self.enter_text(self.last_name, address_data['last_name'])
         self.enter_text(self.company_name, address_data['company_name'])
@@ -62,5 +75,6 @@ class ShippingAddressPage(BasePage):
         # Enter the postcode
         self.enter_text(self.postcode, address_data['postcode'])
 
+    @action
     def save_address(self):
         self.click_element(self.save_button)
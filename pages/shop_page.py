@@ -1,46 +1,100 @@
+from collections import namedtuple
 from selenium.common import ElementClickInterceptedException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
 from .base_page import BasePage
+from utils.command_metrics import navigation_counter
+from utils.page_timing import navigation
+from utils.structured_log import action, logger
+
+# Collects every product tile of the current listing in one round trip.
+# Returns null until the product list (or the "no products" notice) is on the page.
+PRODUCT_INDEX_SCRIPT = """
+const list = document.querySelector('ul.products');
+if (!list && !document.querySelector('.woocommerce-info')) { return null; }
+const products = list ? Array.from(list.querySelectorAll('li.product')).map(item => {
+    const title = item.querySelector('h3, h2.woocommerce-loop-product__title');
+    const price = item.querySelector('.price');
+    const button = item.querySelector('a.add_to_cart_button');
+    const id = button ? button.getAttribute('data-product_id')
+        : ((item.className.match(/post-(\\d+)/) || [])[1] || null);
+    return {
+        name: title ? title.textContent.trim() : '',
+        product_id: id,
+        price: price ? price.textContent.trim() : '',
+        add_to_cart_url: button ? button.href : null,
+        in_stock: !item.classList.contains('outofstock') && button !== null,
+    };
+}) : [];
+return {url: location.href, products: products};
+"""
+
+# One product tile of a listing, e.g. Product("Selenium Ruby", "160", "₹500.00", ".../?add-to-cart=160", False)
+Product = namedtuple("Product", ["name", "product_id", "price", "add_to_cart_url", "in_stock"])
+
 
 class ShopPage(BasePage):
     def __init__(self, driver, locators):
         super().__init__(driver)
-        self.shop_link = (By.XPATH, locators['shop_page']['shop'])
+        self.shop_link = locators['shop_page']['shop']
         self.category_locators = {
-            "android": (By.XPATH, locators['shop_page']['android_category']),
-            "html": (By.XPATH, locators['shop_page']['html_category']),
-            "javascript": (By.XPATH, locators['shop_page']['javascript_category']),
-            "selenium": (By.XPATH, locators['shop_page']['selenium_category'])
+            "android": locators['shop_page']['android_category'],
+            "html": locators['shop_page']['html_category'],
+            "javascript": locators['shop_page']['javascript_category'],
+            "selenium": locators['shop_page']['selenium_category']
         }
-        # self.product_name = (By.XPATH, locators['shop_page']['product_name'])
-
+        # self.product_name = locators['shop_page']['product_name']
+        self.products = None
+        # Commands that may have navigated, counted on the driver; the index is stale once the count moves
+        self.navigations = navigation_counter(driver)
+        self.products_at = None
+
+    @navigation("shop")
+    @action
     def go_to_shop(self):
         self.click_element(self.shop_link)
+        self.invalidate_index()
 
+    @navigation("category")
+    @action
     def select_category(self, category_name):
         if category_name.lower() in self.category_locators:
             category_locator = self.category_locators[category_name.lower()]
             self.click_element(category_locator)
+            self.invalidate_index()
         else:
             raise ValueError(f"Category '{category_name}' not found in the category locators.")
 
-    def verify_product_present(self, product_text):
-        try:
-            # Get the page source or visible text content
-            page_content = self.driver.page_source
-
-            # Normalize the text to make it case-insensitive and remove extra spaces
-            normalized_page_content = page_content.lower().replace("\n", " ").strip()
-
-            # Normalize the product text
-            normalized_product_text = product_text.lower().strip()
-
-            # Check if the product name is present in the page content
-            return normalized_product_text in normalized_page_content
-        except Exception:
-            return False
-
+    def invalidate_index(self):
+        """Forget the product index; call after anything that loads another listing."""
+        self.products = None
+
+    @action
+    def product_index(self, timeout=None):
+        """Return the current listing's products by name, reading the page only once per listing."""
+        # Covers navigations that bypass this page object (back, direct get, pagination) without a round trip
+        if self.products is not None and self.navigations.count != self.products_at:
+            self.invalidate_index()
+        if self.products is None:
+            timeout = self.time_left(timeout)
+            try:
+                result = WebDriverWait(self.driver, timeout).until(lambda driver: driver.execute_script(PRODUCT_INDEX_SCRIPT))
+            except TimeoutException as e:
+                raise TimeoutError(f"Product list not found after {timeout} seconds: {e}")
+            self.products = {item['name']: Product(**item) for item in result['products']}
+            self.products_at = self.navigations.count
+        return self.products
+
+    def find_product(self, product_text):
+        """Return the indexed product whose name is, or contains, product_text, or None."""
+        products = self.product_index()
+        if product_text in products:
+            return products[product_text]
+        return next((product for name, product in products.items() if product_text in name), None)
+
+    @action
     def add_product_to_basket(self, product_name):
         try:
             # Locate the "Add to Basket" button using the product name and click it
@@ -49,6 +103,7 @@ class ShopPage(BasePage):
         except Exception as e:
             raise Exception(f"Could not add product '{product_name}' to basket: {e}")
 
+    @action
     def verify_product_details(self, product_name, product_details):
         try:
             # Locate the product details element using the product name
@@ -59,18 +114,18 @@ class ShopPage(BasePage):
         except Exception as e:
             raise Exception(f"Could not verify product details for '{product_name}': {e}")
 
+    @action
     def add_product_to_cart(self, product_name):
+        product = self.find_product(product_name)
+        if product is None or not product.in_stock:
+            raise Exception(f"Failed to add product '{product_name}' to the cart: product is not available in this listing")
         try:
-            # Locate the Add to Cart button based on the product name
-            add_to_cart_locator = (
-            By.XPATH, f"//li[contains(., '{product_name}')]//a[contains(@class, 'add_to_cart_button')]")
+            # Locate the Add to Cart button by the indexed product id
+            add_to_cart_locator = (By.CSS_SELECTOR, f"a.add_to_cart_button[data-product_id='{product.product_id}']")
 
             # Scroll the element into view
             self.scroll_to_element(add_to_cart_locator)
 
-            # Wait for the element to be clickable
-            self.wait_for_clickable(add_to_cart_locator)
-
             # Attempt to click the element
             self.click_element(add_to_cart_locator)
 
@@ -81,6 +136,7 @@ class ShopPage(BasePage):
         except Exception as e:
             raise Exception(f"Failed to add product '{product_name}' to the cart: {e}")
 
+    @action
     def scroll_to_product(self, product_name):
         """
         Scrolls the page to the specified product to make sure it's visible.
@@ -90,13 +146,11 @@ class ShopPage(BasePage):
             product_element = self.wait_for_element(product_locator)
             self.scroll_to_element(product_element)
         except Exception as e:
-            print(f"Failed to scroll to product '{product_name}': {e}")
+            logger.warning(f"Failed to scroll to product '{product_name}': {e}")
 
     def verify_product_present(self, product_text):
+        """Check whether a product whose name contains product_text is in the current listing."""
         try:
-            # Check if the product name is partially present on the page
-            product_elements = self.driver.find_elements(By.XPATH, f"//h3[contains(text(), '{product_text}')]")
-            # If there is any element matching the product_text, return True
-            return len(product_elements) > 0
-        except Exception:
+            return self.find_product(product_text) is not None
+        except TimeoutError:
             return False
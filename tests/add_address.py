@@ -1,43 +1,35 @@
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 import pytest
-from pages.home_page import HomePage
-from pages.registration_page import RegistrationPage
+from utils.preconditions import register_user
 from pages.billing_address_page import BillingAddressPage
 from pages.shipping_address_page import ShippingAddressPage
+from utils.structured_log import logger
 
 
 @pytest.mark.usefixtures("setup", "config", "locators", "data")
 class TestAddressManagement:
 
     @pytest.fixture(autouse=True)
-    def class_fixtures(self, config, locators, data):
+    def class_fixtures(self, config, locators, data, precondition_mode):
         """Assign fixtures to class attributes for easy access."""
         self.config = config
         self.locators = locators
         self.data = data
+        self.precondition_mode = precondition_mode
 
-    def capture_screenshot_on_failure(self, test_name):
-        """Capture a screenshot in case of failure."""
-        screenshot_name = f"screenshots/{test_name}.png"
-        self.driver.save_screenshot(screenshot_name)
-        print(f"Screenshot captured: {screenshot_name}")
+    def capture_screenshot_on_failure(self):
+        """Capture a screenshot, DOM and console log in case of failure; the report hook reuses this capture."""
+        artifacts = self.artifacts.capture_failure(self.driver, self.nodeid)
+        logger.info(f"Failure artifacts captured: {artifacts}", extra={'event': "artifact"})
 
     def register_user(self):
         """Register a new user and return the email and password."""
-        home_page = HomePage(self.driver, self.locators)
-        registration_page = RegistrationPage(self.driver, self.locators)
-
-        # Open the base URL and go to My Account
-        self.driver.get(self.config['base_url'])
-        home_page.go_to_my_account()
-
-        # Register a new user
+        # Registration is only a precondition here, so it goes over HTTP unless the test asks for the UI
         new_email = self.data['registration']['email']
         new_password = self.data['registration']['password']
-        registration_page.register(new_email, new_password)
-
-        return new_email, new_password
+        return register_user(self.driver, self.config, self.locators, new_email, new_password,
+                             mode=self.precondition_mode)
 
     def verify_success_message(self, expected_keywords):
         """Verify the success message after saving the address."""
@@ -72,7 +64,7 @@ class TestAddressManagement:
             self.verify_success_message(["address changed successfully"])
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_13_add_billing_address")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 13: {e}")
 
     def test_case_14_add_shipping_address(self):
@@ -93,7 +85,7 @@ class TestAddressManagement:
             self.verify_success_message(["address changed successfully"])
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_14_add_shipping_address")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 14: {e}")
 
     def test_case_15_empty_billing_address_fields(self):
@@ -122,7 +114,7 @@ class TestAddressManagement:
             self.verify_error_messages(expected_messages)
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_15_empty_billing_address_fields")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 15: {e}")
 
     def test_case_16_empty_shipping_address_fields(self):
@@ -150,5 +142,5 @@ class TestAddressManagement:
             self.verify_error_messages(expected_messages)
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_16_empty_shipping_address_fields")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 16: {e}")
@@ -0,0 +1,115 @@
+import pytest
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    InvalidSelectorException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+
+import pages.base_page as base_page
+from pages.base_page import BasePage, Deadline
+from utils.retries import RetryStats
+
+
+class Clock:
+    """Stands in for time.monotonic and time.sleep, so backoff is checked without waiting."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(base_page.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(base_page.time, "sleep", clock.sleep)
+    return clock
+
+
+def failing(errors, result="done"):
+    """Action raising the given errors one per call, then returning result."""
+    errors = list(errors)
+    calls = []
+
+    def action():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+    action.calls = calls
+    return action
+
+
+def test_retry_backs_off_exponentially_until_the_action_succeeds(clock):
+    action = failing([StaleElementReferenceException("stale")] * 2)
+    assert BasePage(None).retry(action, "click", retries=3) == "done"
+    assert clock.sleeps == [0.1, 0.2]
+
+
+def test_retry_reraises_the_last_retryable_error_after_the_last_attempt(clock):
+    action = failing([ElementClickInterceptedException("covered")] * 5)
+    with pytest.raises(ElementClickInterceptedException):
+        BasePage(None).retry(action, "click", retries=3)
+    assert len(action.calls) == 3
+    assert clock.sleeps == [0.1, 0.2]
+
+
+def test_fatal_errors_are_not_retried(clock):
+    action = failing([InvalidSelectorException("bad selector")])
+    with pytest.raises(InvalidSelectorException):
+        BasePage(None).retry(action, "click")
+    assert len(action.calls) == 1
+    assert clock.sleeps == []
+
+
+def test_retry_stops_when_the_next_pause_would_pass_the_deadline(clock):
+    page = BasePage(None, timeout=0.25)
+    action = failing([StaleElementReferenceException("stale")] * 5)
+    with pytest.raises(StaleElementReferenceException):
+        page.retry(action, "click", retries=10)
+    # 0.1 fits into 0.25s, then 0.2 would not fit into the 0.15s left
+    assert clock.sleeps == [0.1]
+
+
+def test_nested_actions_share_the_outer_deadline(clock):
+    page = BasePage(None, timeout=10)
+    with page.budget(3) as outer:
+        clock.now += 1
+        with page.budget(30) as inner:
+            assert inner is outer
+            assert page.time_left() == 2
+            assert page.time_left(1) == 1
+    assert page.deadline is None
+    assert page.time_left() == 10
+
+
+def test_deadline_never_reports_negative_time(clock):
+    deadline = Deadline(1)
+    clock.now += 5
+    assert deadline.remaining() == 0
+
+
+def test_retries_are_recorded_per_action(clock, monkeypatch):
+    stats = RetryStats()
+    stats.start_test()
+    monkeypatch.setattr(BasePage, "retry_stats", stats)
+    BasePage(None).retry(failing([StaleElementReferenceException("stale")]), "click on x")
+    BasePage(None).retry(failing([]), "click on y")
+    assert stats.finish_test() == [{'action': "click on x", 'retries': 1, 'seconds': 0.1, 'failed': False}]
+
+
+def test_is_element_clickable_is_false_when_the_wait_times_out(monkeypatch):
+    page = BasePage(None)
+
+    def time_out(locator, timeout=None):
+        raise TimeoutError(f"Element {locator} not clickable")
+    monkeypatch.setattr(page, "wait_for_clickable", time_out)
+    assert page.is_element_clickable((By.CSS_SELECTOR, "button")) is False
@@ -0,0 +1,26 @@
+import pytest
+
+from pages.cart_page import CartSnapshot, parse_price
+
+
+@pytest.mark.parametrize("text, amount", [
+    ("₹1,234.50", 1234.5), ("₹459.00 (includes ₹38.14 Tax)", 459.0), ("-₹5.00", -5.0), ("2", 2.0), ("", 0.0),
+])
+def test_parse_price_reads_the_first_amount(text, amount):
+    assert parse_price(text) == amount
+
+
+def test_parse_price_raises_on_text_without_an_amount():
+    with pytest.raises(Exception, match="Failed to parse"):
+        parse_price("Free shipping")
+
+
+def test_snapshot_from_script_result():
+    snapshot = CartSnapshot.from_script_result({
+        'rows': [{'name': "Selenium Ruby", 'product_id': "160", 'price': "₹500.00", 'quantity': "2", 'subtotal': "₹1,000.00"}],
+        'totals': {'cart-subtotal': "₹1,000.00", 'order-total': "₹1,020.00"},
+    })
+    assert "Selenium Ruby" in snapshot
+    assert snapshot.quantity("Selenium Ruby") == 2
+    assert snapshot.quantity("Thinking in HTML") == 0
+    assert snapshot.total == 1020.0
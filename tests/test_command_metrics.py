@@ -0,0 +1,38 @@
+import pytest
+
+from utils.command_metrics import aggregate, navigation_counter, percentile
+
+
+@pytest.mark.parametrize("count, fraction, rank", [
+    (1, 0.95, 1), (10, 0.5, 5), (10, 0.95, 10), (20, 0.95, 19), (20, 0.99, 20),
+    (100, 0.95, 95), (100, 0.99, 99), (101, 0.5, 51), (3, 0.0, 1), (3, 1.0, 3),
+])
+def test_percentile_is_nearest_rank(count, fraction, rank):
+    assert percentile(list(range(1, count + 1)), fraction) == rank
+
+
+def test_aggregate_groups_by_key_slowest_total_first():
+    records = [{'command': "click", 'seconds': 0.001 * n} for n in range(1, 21)] + [{'command': "get", 'seconds': 1.0}]
+    rows = aggregate(records, 'command')
+    assert [row['command'] for row in rows] == ["get", "click"]
+    assert rows[1]['count'] == 20
+    assert rows[1]['p95_ms'] == 19.0
+    assert rows[1]['max_ms'] == 20.0
+
+
+class FakeDriver:
+    def execute(self, command, params=None):
+        return {'value': None}
+
+
+def test_navigation_counter_counts_commands_that_may_navigate():
+    driver = FakeDriver()
+    counter = navigation_counter(driver)
+    assert navigation_counter(driver) is counter
+    driver.execute("findElement", {'using': "css selector", 'value': "a"})
+    driver.execute("w3cExecuteScript", {'script': "return document.title;", 'args': []})
+    assert counter.count == 0
+    driver.execute("clickElement", {'id': "1"})
+    driver.execute("goBack")
+    driver.execute("w3cExecuteScript", {'script': "arguments[0].click();", 'args': []})
+    assert counter.count == 3
@@ -0,0 +1,97 @@
+from selenium.common.exceptions import WebDriverException
+
+from utils.driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.calls.append(("switch", handle))
+
+
+class FakeDriver:
+    """Records the calls DriverPool makes; fail_on names a call that raises WebDriverException."""
+
+    def __init__(self, handles=("main",), fail_on=None, cdp=True):
+        self.window_handles = list(handles)
+        self.fail_on = fail_on
+        self.cdp = cdp
+        self.calls = []
+        self.switch_to = FakeSwitchTo(self)
+
+    def _call(self, name, *args):
+        self.calls.append((name,) + args)
+        if name == self.fail_on:
+            raise WebDriverException(f"{name} failed")
+
+    def close(self):
+        self._call("close")
+
+    def execute_script(self, script):
+        self._call("script")
+
+    def execute_cdp_cmd(self, command, params):
+        if not self.cdp:
+            raise AttributeError("execute_cdp_cmd")
+        self._call("cdp", command)
+
+    def delete_all_cookies(self):
+        self._call("delete_all_cookies")
+
+    def get(self, url):
+        self._call("get", url)
+
+    def quit(self):
+        self._call("quit")
+
+
+def test_reset_closes_extra_windows_clears_state_and_blanks_the_page():
+    driver = FakeDriver(handles=("main", "popup1", "popup2"))
+    assert DriverPool(lambda: driver).reset(driver)
+    assert driver.calls == [
+        ("switch", "popup1"), ("close",), ("switch", "popup2"), ("close",), ("switch", "main"),
+        ("script",), ("cdp", "Network.clearBrowserCookies"), ("get", "about:blank"),
+    ]
+
+
+def test_reset_tolerates_pages_without_storage_and_falls_back_to_delete_all_cookies():
+    driver = FakeDriver(fail_on="script", cdp=False)
+    assert DriverPool(lambda: driver).reset(driver)
+    assert driver.calls == [("switch", "main"), ("script",), ("delete_all_cookies",), ("get", "about:blank")]
+
+
+def test_reset_fails_for_a_browser_without_windows():
+    driver = FakeDriver(handles=())
+    assert not DriverPool(lambda: driver).reset(driver)
+
+
+def test_acquire_reuses_a_driver_that_resets():
+    drivers = []
+    pool = DriverPool(lambda: drivers.append(FakeDriver()) or drivers[-1])
+    first = pool.acquire()
+    pool.release()
+    assert pool.acquire() is first
+    assert pool.stats() == {'launches': 1, 'reuses': 1, 'resets_failed': 0}
+
+
+def test_failing_reset_discards_the_driver():
+    drivers = []
+    pool = DriverPool(lambda: drivers.append(FakeDriver(fail_on="get")) or drivers[-1])
+    first = pool.acquire()
+    pool.release()
+    second = pool.acquire()
+    assert second is not first
+    assert ("quit",) in first.calls
+    assert pool.stats() == {'launches': 2, 'reuses': 0, 'resets_failed': 1}
+
+
+def test_fresh_drivers_are_never_reused():
+    drivers = []
+    pool = DriverPool(lambda: drivers.append(FakeDriver()) or drivers[-1])
+    first = pool.acquire(fresh=True)
+    pool.release(fresh=True)
+    assert ("quit",) in first.calls
+    assert pool.acquire() is not first
+    assert pool.stats()['reuses'] == 0
@@ -0,0 +1,156 @@
+from html.parser import HTMLParser
+
+import pytest
+import requests
+import yaml
+
+from utils.local_shop import PRODUCTS, LocalShopServer, seed_users_from_data
+from utils.locator_compiler import _iter_expressions, parse_xpath
+from utils.preconditions import AccountSession
+
+# Locators the served HTML cannot contain, with the reason
+NOT_IN_SERVED_HTML = {
+    'registration_page.password_strength': "inserted by the page script while a password is typed",
+    'billing_address_page.state_search_input': "the stand-in renders the state as a text input without select2",
+    'shipping_address_page.state_search_input': "the stand-in renders the state as a text input without select2",
+}
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+class Node:
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        # Direct text children, as text() sees them
+        self.texts = []
+        # Children and text in document order, for the string value
+        self.parts = []
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+    def text_content(self):
+        return "".join(part if isinstance(part, str) else part.text_content() for part in self.parts)
+
+
+class TreeBuilder(HTMLParser):
+    """Builds a minimal DOM; good enough for the well-formed pages the stand-in serves."""
+
+    def __init__(self):
+        super().__init__()
+        self.root = self.current = Node('#document', {}, None)
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self.current)
+        self.current.children.append(node)
+        self.current.parts.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.current = node
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.texts.append(data)
+        self.current.parts.append(data)
+
+
+def parse_html(html):
+    builder = TreeBuilder()
+    builder.feed(html)
+    return builder.root
+
+
+def select(path, context, root):
+    """Nodes a location path selects; supports the child steps and predicates locators.yaml uses."""
+    nodes = [root] if path[0][0] in ('/', '//') else [context]
+    for separator, (axis, node_test, predicates) in path:
+        assert axis == 'child', f"unsupported axis {axis}"
+        candidates = []
+        for node in nodes:
+            candidates.extend(node.descendants() if separator == '//' else node.children)
+        nodes = []
+        for node in candidates:
+            if (node_test in ('*', node.tag) and node not in nodes
+                    and all(matches(predicate, node, root) for predicate in predicates)):
+                nodes.append(node)
+    return nodes
+
+
+def strings(expression, node, root):
+    kind = expression[0]
+    if kind == 'literal':
+        return [expression[1]]
+    assert kind == 'location', f"unsupported expression {expression}"
+    if len(expression[1]) == 1:
+        separator, (axis, node_test, predicates) = expression[1][0]
+        if axis == 'attribute':
+            return [node.attrs[node_test]] if node_test in node.attrs else []
+        if axis == 'child' and node_test == 'text()':
+            return list(node.texts)
+        if axis == 'self':
+            return [node.text_content()]
+    return [found.text_content() for found in select(expression[1], node, root)]
+
+
+def matches(predicate, node, root):
+    kind = predicate[0]
+    if kind == 'and':
+        return matches(predicate[1], node, root) and matches(predicate[2], node, root)
+    if kind == 'or':
+        return matches(predicate[1], node, root) or matches(predicate[2], node, root)
+    if kind == '=':
+        right = strings(predicate[2], node, root)
+        return any(value in right for value in strings(predicate[1], node, root))
+    if kind == 'call' and predicate[1] in ('contains', 'starts-with'):
+        haystack = (strings(predicate[2][0], node, root) or [""])[0]
+        needle = strings(predicate[2][1], node, root)[0]
+        return needle in haystack if predicate[1] == 'contains' else haystack.startswith(needle)
+    if kind == 'location':
+        return bool(strings(predicate, node, root))
+    raise AssertionError(f"unsupported predicate {predicate}")
+
+
+@pytest.fixture(scope="module")
+def pages():
+    """Every page the suite drives, as served to a logged-in user with a product in the basket."""
+    server = LocalShopServer(seed_users=seed_users_from_data()).start()
+    try:
+        with open("utils/data.yaml", 'r') as file:
+            login = yaml.safe_load(file)['login']
+        logged_out = requests.Session()
+        account = AccountSession(server.base_url).login(login['username'], login['password']).session
+        account.get(f"{server.base_url}?add-to-cart={PRODUCTS[0]['id']}", timeout=10)
+        urls = [(logged_out, "my-account/"), (logged_out, "shop/")]
+        urls += [(account, path) for path in ("", "shop/", "product-category/android/", "basket/", "my-account/",
+                                              "my-account/edit-address/", "my-account/edit-address/billing/",
+                                              "my-account/edit-address/shipping/")]
+        return {f"{path} ({'logged in' if session is account else 'logged out'})":
+                parse_html(session.get(server.base_url + path, timeout=10).text) for session, path in urls}
+    finally:
+        server.stop()
+
+
+def locator_cases():
+    with open("utils/locators.yaml", 'r') as file:
+        raw_locators = yaml.safe_load(file)
+    return [(name, expression) for name, expression in _iter_expressions(raw_locators) if '{' not in expression]
+
+
+@pytest.mark.parametrize("name, expression", locator_cases())
+def test_locator_resolves_on_a_local_shop_page(pages, name, expression):
+    if name in NOT_IN_SERVED_HTML:
+        pytest.skip(NOT_IN_SERVED_HTML[name])
+    path = parse_xpath(expression)
+    assert path[0] == 'location'
+    found_on = [page for page, root in pages.items() if select(path[1], root, root)]
+    assert found_on, f"{name} ({expression}) matches nothing on {sorted(pages)}"
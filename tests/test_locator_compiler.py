@@ -0,0 +1,77 @@
+import pytest
+
+from utils.locator_compiler import LocatorError, compile_locators, parse_xpath, tokenize, xpath_to_css
+
+
+# XPath -> expected CSS, or None when CSS cannot express it exactly
+TRANSLATIONS = [
+    # Shapes used in locators.yaml
+    ("//nav[@id='main-nav-wrap']//ul[@id='main-nav']//li[a[text()='My Account']]", None),
+    ("//div[@id='customer_login']//input[@type='text' and @name='username']",
+     'div#customer_login input[type="text"][name="username"]'),
+    ("//input[@type='submit' and @value='Login' and @class='woocommerce-Button button']",
+     'input[type="submit"][value="Login"][class="woocommerce-Button button"]'),
+    ("//div[@class='u-column2 col-2']//div[contains(@class, 'woocommerce-password-strength')]",
+     'div[class="u-column2 col-2"] div[class*="woocommerce-password-strength"]'),
+    ("//li[contains(@class, 'edit-address')]//a[text()='Addresses']", None),
+    ("//div[@class='u-column1 col-1 woocommerce-Address']//a[contains(@href, 'edit-address/billing') and @class='edit']",
+     'div[class="u-column1 col-1 woocommerce-Address"] a[href*="edit-address/billing"][class="edit"]'),
+    ("//p[@id='billing_first_name_field']//input[@id='billing_first_name']", "p#billing_first_name_field input#billing_first_name"),
+    ("//div[@id='s2id_shipping_country']//span[text()='India']", None),
+    ("//p[contains(@class, 'form-row')]//input[@name='shipping_state']", 'p[class*="form-row"] input[name="shipping_state"]'),
+    ("//*[@id='billing_state']", "#billing_state"),
+    ("//ul[@id='main-nav']/li[@id='menu-item-40']/a", "ul#main-nav > li#menu-item-40 > a"),
+    ("//ul[@class='product-categories']/li/a[contains(@href, 'product-category/android') and text()='Android']", None),
+    ("//a[@class='wpmenucart-contents' and @title='View your shopping cart']",
+     'a[class="wpmenucart-contents"][title="View your shopping cart"]'),
+    ("//select[@id='billing_country']", "select#billing_country"),
+    # Positional predicates
+    ("//li[1]", "li:nth-of-type(1)"),
+    ("//ul/li[2]/a", "ul > li:nth-of-type(2) > a"),
+    ("//li[1][@class='x']", 'li:nth-of-type(1)[class="x"]'),
+    ("//li[@class='x'][1]", None),
+    ("//li[@class='x' and 2]", None),
+    ("//*[1]", None),
+    ("//li[0]", None),
+    ("//li[1.5]", None),
+    # Other shapes CSS cannot express
+    ("//a[contains(@href, '')]", None),
+    ("//a[@href or @name]", None),
+    ("//a/..", None),
+    ("//a[starts-with(@href, 'http')]", 'a[href^="http"]'),
+    ("//input[@disabled]", "input[disabled]"),
+    ("/html/body", None),
+    ("//div[@id='a b']", 'div[id="a b"]'),
+]
+
+
+@pytest.mark.parametrize("xpath, css", TRANSLATIONS)
+def test_xpath_to_css(xpath, css):
+    assert xpath_to_css(xpath) == css
+
+
+@pytest.mark.parametrize("xpath", ["//a[", "//a[]", "//a[@id='x]", "//a]", "//foo::a", "//a[@id=='x']", ""])
+def test_invalid_xpath_is_rejected(xpath):
+    with pytest.raises(LocatorError):
+        parse_xpath(xpath)
+
+
+def test_tokenize_tells_operators_from_names():
+    assert tokenize("//a[@x and div]") == [
+        ('symbol', '//'), ('name', 'a'), ('symbol', '['), ('symbol', '@'), ('name', 'x'),
+        ('operator', 'and'), ('name', 'div'), ('symbol', ']')]
+    assert tokenize("//*[2 * 3]")[1] == ('symbol', '*')
+    assert tokenize("//*[2 * 3]")[4] == ('operator', '*')
+
+
+def test_compile_locators_keeps_templates_and_reports_every_error():
+    compiled = compile_locators({
+        'page': {'button': "//button[@id='go']", 'row': "//tr[contains(., '{product_name}')]"},
+        'form': {'name': {'locator': "//input[@id='name']", 'kind': "text"}},
+    })
+    assert compiled['page']['button'] == ("css selector", "button#go")
+    assert compiled['page']['row'] == "//tr[contains(., '{product_name}')]"
+    assert compiled['form']['name'] == {'locator': ("css selector", "input#name"), 'kind': "text"}
+    with pytest.raises(LocatorError) as error:
+        compile_locators({'a': "//a[", 'b': {'c': "//b]"}})
+    assert "a:" in str(error.value) and "b.c:" in str(error.value)
@@ -1,13 +1,11 @@
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
-from selenium.webdriver import Keys
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.wait import WebDriverWait
 import pytest
 import uuid
 from pages.home_page import HomePage
 from pages.login_page import LoginPage
 from pages.registration_page import RegistrationPage
+from utils.structured_log import logger
 
 
 @pytest.mark.usefixtures("setup", "config", "locators", "data")
@@ -19,11 +17,10 @@ class TestRegistrationLogin:
         self.locators = locators
         self.data = data
 
-    def capture_screenshot_on_failure(self, test_name):
-        """Capture a screenshot in case of failure."""
-        screenshot_name = f"screenshots/{test_name}.png"
-        self.driver.save_screenshot(screenshot_name)
-        print(f"Screenshot captured: {screenshot_name}")
+    def capture_screenshot_on_failure(self):
+        """Capture a screenshot, DOM and console log in case of failure; the report hook reuses this capture."""
+        artifacts = self.artifacts.capture_failure(self.driver, self.nodeid)
+        logger.info(f"Failure artifacts captured: {artifacts}", extra={'event': "artifact"})
 
     def go_to_my_account(self):
         """Helper method to navigate to My Account page."""
@@ -64,7 +61,7 @@ class TestRegistrationLogin:
             assert "my account" in self.driver.page_source.lower(), "Login failed or 'My Account' not found in page source."
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_1_login")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 1: {e}")
 
     def test_case_2_registration(self):
@@ -84,7 +81,7 @@ class TestRegistrationLogin:
                                              "Registration failed or confirmation message not found.")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_2_registration")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 2: {e}")
 
     def test_case_3_existing_user_registration(self):
@@ -99,7 +96,7 @@ class TestRegistrationLogin:
             self.verify_keywords_in_text(error_message, ["already registered"], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_3_existing_user_registration")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 3: {e}")
 
     def test_case_4_login_without_username_and_password(self):
@@ -114,7 +111,7 @@ class TestRegistrationLogin:
             self.verify_keywords_in_text(error_message, ["username is required"], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_4_login_without_username_and_password")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 4: {e}")
 
     def test_case_5_login_without_password(self):
@@ -129,7 +126,7 @@ class TestRegistrationLogin:
             self.verify_keywords_in_text(error_message, ["password is required"], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_5_login_without_password")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 5: {e}")
 
     def test_case_6_login_without_username(self):
@@ -144,7 +141,7 @@ class TestRegistrationLogin:
             self.verify_keywords_in_text(error_message, ["username is required"], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_6_login_without_username")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 6: {e}")
 
     def test_case_7_login_with_wrong_password(self):
@@ -159,7 +156,7 @@ class TestRegistrationLogin:
             self.verify_keywords_in_text(error_message, ["the password you entered for the username"], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_7_login_with_wrong_password")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 7: {e}")
 
     def test_case_8_register_without_email_and_password(self):
@@ -174,7 +171,7 @@ class TestRegistrationLogin:
             self.verify_keywords_in_text(error_message, ["please provide a valid"], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_8_register_without_email_and_password")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 8: {e}")
 
     def test_case_9_register_without_password(self):
@@ -190,7 +187,7 @@ class TestRegistrationLogin:
             self.verify_keywords_in_text(error_message, ["please enter an account password"], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_9_register_without_password")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 9: {e}")
 
     def test_case_10_register_without_email(self):
@@ -202,10 +199,10 @@ class TestRegistrationLogin:
 
             # Verify error message
             error_message = self.get_error_message()
-            self.verify_keywords_in_text(error_message, ["error: please provide a valid  email address."], f"Unexpected error message: {error_message}")
+            self.verify_keywords_in_text(error_message, ["error: please provide a valid email address.", "error: please provide a valid  email address."], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_10_register_without_email")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 10: {e}")
 
     def test_case_11_register_with_short_password(self):
@@ -217,21 +214,17 @@ class TestRegistrationLogin:
             registration_page.enter_text(registration_page.email_address, self.data['registration']['email'])
             registration_page.enter_text(registration_page.password, "12")  # Very short password
 
-            # Click back on the email field to trigger validation
-            registration_page.click_element(registration_page.email_address)
-            self.driver.find_element(*registration_page.password).send_keys(Keys.ENTER)
-
-            # Verify error message
-            wait = WebDriverWait(self.driver, 10)
-            error_message = wait.until(EC.visibility_of_element_located((
-                By.XPATH, "//div[contains(@class, 'woocommerce-password-strength') and contains(text(), 'stronger password')]"
-            ))).text.lower().strip()
+            # Verify the strength meter result and that registration stays blocked
+            strength = registration_page.wait_for_password_strength()
+            error_message = strength.message.lower()
+            assert strength.level in ("short", "bad"), f"Unexpected password strength: {strength.level}"
+            assert not registration_page.is_register_enabled(), "Register button is enabled for a very weak password."
 
             self.verify_keywords_in_text(error_message, ["please enter a stronger password", "very weak"],
                                          f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_11_register_with_short_password")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 11: {e}")
 
     def test_case_12_register_with_existing_email_and_password(self):
@@ -246,5 +239,5 @@ class TestRegistrationLogin:
             self.verify_keywords_in_text(error_message, ["account is already registered"], f"Unexpected error message: {error_message}")
 
         except (NoSuchElementException, TimeoutException, WebDriverException) as e:
-            self.capture_screenshot_on_failure("test_case_12_register_with_existing_email_and_password")
+            self.capture_screenshot_on_failure()
             pytest.fail(f"Error during Test Case 12: {e}")
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from utils.sharding import junit_key, load_durations, plan_shards, select_shard
+
+
+class FakeFixtureManager:
+    """Maps fixture names to their scope, like the definitions pytest's fixture manager returns."""
+
+    def __init__(self, scopes):
+        self.scopes = scopes
+
+    def getfixturedefs(self, name, node):
+        return [SimpleNamespace(scope=self.scopes[name])] if name in self.scopes else None
+
+
+def make_items(nodeids, fixtures=(), scopes=None):
+    session = SimpleNamespace(_fixturemanager=FakeFixtureManager(scopes or {}))
+    return [SimpleNamespace(nodeid=nodeid, fixturenames=list(fixtures), session=session) for nodeid in nodeids]
+
+
+def durations_for(seconds):
+    return {junit_key(nodeid): value for nodeid, value in seconds.items()}
+
+
+def test_plan_balances_estimated_time():
+    seconds = {"tests/a.py::test_1": 8, "tests/a.py::test_2": 6, "tests/a.py::test_3": 4, "tests/a.py::test_4": 2}
+    plan = plan_shards(make_items(seconds), durations_for(seconds), 2)
+    assert sorted(estimate for estimate, members in plan) == [10, 10]
+    assert sorted(item.nodeid for estimate, members in plan for item in members) == sorted(seconds)
+
+
+def test_tests_sharing_a_class_fixture_stay_on_one_shard():
+    nodeids = [f"tests/a.py::TestA::test_{n}" for n in range(4)] + ["tests/b.py::test_x", "tests/b.py::test_y"]
+    items = make_items(nodeids, fixtures=["shared"], scopes={'shared': "class"})
+    plan = plan_shards(items, {}, 3)
+    class_shards = [shard for shard, (estimate, members) in enumerate(plan)
+                    if any("TestA" in item.nodeid for item in members)]
+    assert len(class_shards) == 1
+    assert len(plan[class_shards[0]][1]) == 4
+
+
+def test_unknown_durations_use_the_median_of_known_ones():
+    known = {"tests/a.py::test_1": 2, "tests/a.py::test_2": 6, "tests/a.py::test_3": 10}
+    plan = plan_shards(make_items(list(known) + ["tests/a.py::test_new"]), durations_for(known), 1)
+    assert plan[0][0] == 2 + 6 + 10 + 6
+
+
+def test_without_any_history_every_test_counts_one_second():
+    plan = plan_shards(make_items(["tests/a.py::test_1", "tests/a.py::test_2", "tests/a.py::test_3"]), {}, 2)
+    assert sorted(estimate for estimate, members in plan) == [1.0, 2.0]
+
+
+def test_load_durations_averages_reports_and_skips_missing_files(tmp_path):
+    for name, seconds in (("one.xml", 1.0), ("two.xml", 3.0)):
+        (tmp_path / name).write_text(f'<testsuites><testsuite><testcase classname="tests.a" name="test_1" '
+                                     f'time="{seconds}"/></testsuite></testsuites>')
+    durations = load_durations([str(tmp_path / "one.xml"), str(tmp_path / "two.xml"), str(tmp_path / "missing.xml")])
+    assert durations == {("tests.a", "test_1"): 2.0}
+
+
+def test_select_shard_splits_every_item_exactly_once():
+    items = make_items([f"tests/a.py::test_{n}" for n in range(5)])
+    first, first_rest, summary = select_shard(items, 1, 2, [])
+    second, second_rest, _ = select_shard(items, 2, 2, [])
+    assert sorted(item.nodeid for item in first + second) == sorted(item.nodeid for item in items)
+    assert first_rest == second
+    assert summary['tests'] == len(first) and summary['known_durations'] == 0
@@ -0,0 +1,150 @@
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from utils.structured_log import logger
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+# Keys used to hand the session's service to the report hook and the test's browser to the report hook
+artifact_service_key = pytest.StashKey()
+artifact_stats_key = pytest.StashKey()
+item_driver_key = pytest.StashKey()
+
+
+class ArtifactService:
+    """Captures failure artifacts once per test and writes them from a background thread.
+
+    Only the browser calls (screenshot, DOM, console log) run on the test thread. Encoding,
+    compression and disk writes happen on a worker thread, identical screenshots are stored
+    once by content hash, and writes stop once the per-run size cap is reached.
+    """
+
+    def __init__(self, directory, max_total_bytes=200 * 1024 * 1024, image_format="webp", max_width=1280):
+        self.directory = directory
+        self.max_total_bytes = max_total_bytes
+        # Without Pillow screenshots are stored as the PNG the browser returned
+        self.image_format = image_format if Image is not None else "png"
+        self.max_width = max_width
+        self.captured = {}
+        self.written = {}
+        self.total_bytes = 0
+        self.dropped = 0
+        self.deduplicated = 0
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self.thread.start()
+
+    def capture_failure(self, driver, nodeid):
+        """Capture screenshot, DOM and console log of a failed test; repeated calls return the first capture."""
+        # Keyed by node id: parametrized tests and tests in different modules can share a name
+        if nodeid in self.captured:
+            return self.captured[nodeid]
+
+        try:
+            screenshot = driver.get_screenshot_as_png()
+        except WebDriverException:
+            screenshot = None
+        try:
+            dom = driver.page_source
+            url = driver.current_url
+        except WebDriverException:
+            dom, url = None, None
+        try:
+            console = driver.get_log('browser')
+        except (WebDriverException, ValueError):
+            console = []
+
+        artifacts = {'url': url}
+        # Files that do not fit under the size cap are left out here, so the report never links them
+        if screenshot is not None:
+            artifacts['screenshot'] = self._submit(screenshot, self.image_format, self._encode_image)
+        if dom is not None:
+            artifacts['dom'] = self._submit(dom.encode('utf-8'), "html")
+        if console:
+            artifacts['console'] = self._submit(json.dumps(console, indent=2).encode('utf-8'), "json")
+        artifacts = {kind: path for kind, path in artifacts.items() if kind == 'url' or path is not None}
+        self.captured[nodeid] = artifacts
+        return artifacts
+
+    def close(self):
+        """Wait for pending writes and store a manifest of what was captured."""
+        self.queue.put(None)
+        self.thread.join()
+        os.makedirs(self.directory, exist_ok=True)
+        # Leave out files whose write failed
+        tests = {name: {kind: path for kind, path in artifacts.items() if kind == 'url' or path in self.written}
+                 for name, artifacts in self.captured.items()}
+        with open(os.path.join(self.directory, "manifest.json"), 'w') as file:
+            json.dump({'tests': tests, 'total_bytes': self.total_bytes,
+                       'deduplicated': self.deduplicated, 'dropped': self.dropped}, file, indent=2)
+
+    def stats(self):
+        return {'tests': len(self.captured), 'files': len(self.written), 'bytes': self.total_bytes,
+                'deduplicated': self.deduplicated, 'dropped': self.dropped}
+
+    def _submit(self, content, extension, encoder=None):
+        # The content hash names the file, so the path is known before anything is written
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        path = os.path.join(self.directory, f"{digest}.{extension}")
+        with self.lock:
+            if path in self.written:
+                self.deduplicated += 1
+                return path
+            # Reserve the unencoded size now; the writer settles it to the encoded size
+            if self.total_bytes + len(content) > self.max_total_bytes:
+                self.dropped += 1
+                return None
+            self.total_bytes += len(content)
+            self.written[path] = len(content)
+        self.queue.put((path, content, encoder))
+        return path
+
+    def _encode_image(self, png_bytes):
+        if Image is None:
+            return png_bytes
+        image = Image.open(io.BytesIO(png_bytes))
+        if image.width > self.max_width:
+            image = image.resize((self.max_width, int(image.height * self.max_width / image.width)))
+        output = io.BytesIO()
+        if self.image_format == "webp":
+            image.save(output, format="WEBP", quality=80)
+        else:
+            image.save(output, format="PNG", optimize=True)
+        return output.getvalue()
+
+    def _run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            path, content, encoder = job
+            try:
+                data = encoder(content) if encoder else content
+                with open(path, 'wb') as file:
+                    file.write(data)
+                with self.lock:
+                    self.total_bytes += len(data) - self.written[path]
+                    self.written[path] = len(data)
+            except Exception as e:
+                with self.lock:
+                    self.total_bytes -= self.written.pop(path, 0)
+                logger.warning(f"Failed to write artifact {path}: {e}", extra={'event': "artifact", 'path': path})
+
+
+def format_artifact_stats(stats):
+    """Return a one-line description of the failure artifacts written."""
+    return (f"Failure artifacts: {stats['tests']} tests, {stats['files']} files, {stats['bytes'] / 1024:.0f} KiB, "
+            f"{stats['deduplicated']} deduplicated, {stats['dropped']} dropped by size cap")
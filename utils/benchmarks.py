@@ -0,0 +1,246 @@
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+import yaml
+from selenium.webdriver.common.by import By
+
+from pages.base_page import BasePage
+from pages.billing_address_page import BillingAddressPage
+from pages.cart_page import CartPage
+from pages.registration_page import RegistrationPage
+from pages.shop_page import ShopPage
+from utils.command_metrics import percentile
+from utils.locator_compiler import compile_locators
+from utils.local_shop import LocalShopServer, seed_users_from_data
+from utils.preconditions import AccountSession, seed_cart
+
+
+# Micro-benchmarks of the page-object primitives and flows against the local stand-in shop, so the
+# numbers only move when BasePage, a page object or a locator changes. prepare runs before every round
+# and is not timed; run is the timed part.
+Benchmark = namedtuple("Benchmark", ["name", "prepare", "run"])
+
+SORT_DROPDOWN = (By.XPATH, "//form[@class='woocommerce-ordering']//select[@name='orderby']")
+PRODUCT_TILES = (By.XPATH, "//ul[contains(@class, 'products')]/li")
+CART_ROWS = (By.CSS_SELECTOR, "tr.cart_item")
+
+
+class BenchmarkContext:
+    """Browser, locators and test data shared by the benchmarks of one run."""
+
+    def __init__(self, driver, base_url, locators, data):
+        self.driver = driver
+        self.base_url = base_url
+        self.locators = locators
+        self.data = data
+        self.page = BasePage(driver)
+        self._emails = itertools.count(1)
+        self._run_id = int(time.time())
+
+    def open(self, path):
+        self.driver.get(self.base_url + path)
+
+    def open_logged_in(self, path):
+        """Log in over HTTP (registration benchmarks log the browser out) and open path."""
+        self.driver.delete_all_cookies()
+        AccountSession(self.base_url).login(self.data['login']['username'], self.data['login']['password']) \
+            .apply_to(self.driver, self.base_url + path)
+
+    def new_email(self):
+        return f"benchmark_{self._run_id}_{next(self._emails)}@example.com"
+
+    def open_cart(self):
+        """Open the basket, filling it first when an earlier benchmark started a new session."""
+        self.open("basket/")
+        if not self.driver.find_elements(*CART_ROWS):
+            seed_cart(self.driver, {'base_url': self.base_url}, self.data['shop']['product_names'])
+            self.open("basket/")
+
+
+def read_cart(ctx):
+    cart_page = CartPage(ctx.driver, ctx.locators)
+    for product_name in ctx.data['shop']['product_names']:
+        cart_page.is_product_in_cart(product_name)
+        cart_page.get_product_quantity(product_name)
+    cart_page.get_cart_total_amount()
+
+
+BENCHMARKS = [
+    # Primitives
+    Benchmark("enter_text",
+              lambda ctx: ctx.open("my-account/"),
+              lambda ctx: ctx.page.enter_text(ctx.locators['registration_page']['email_address'], "benchmark@example.com")),
+    Benchmark("click_element",
+              lambda ctx: ctx.open("my-account/"),
+              lambda ctx: ctx.page.click_element(ctx.locators['registration_page']['password'])),
+    Benchmark("scroll_to_element",
+              lambda ctx: ctx.open("shop/"),
+              lambda ctx: ctx.page.scroll_to_element(ctx.locators['shop_page']['selenium_category'])),
+    Benchmark("find_elements",
+              lambda ctx: ctx.open("product-category/javascript/"),
+              lambda ctx: ctx.page.find_elements(PRODUCT_TILES)),
+    Benchmark("select_dropdown_option",
+              lambda ctx: ctx.open("shop/"),
+              lambda ctx: ctx.page.select_dropdown_option(SORT_DROPDOWN, "Sort by price: low to high")),
+    # Flows
+    Benchmark("RegistrationPage.register",
+              lambda ctx: (ctx.driver.delete_all_cookies(), ctx.open("my-account/")),
+              lambda ctx: RegistrationPage(ctx.driver, ctx.locators).register(ctx.new_email(), ctx.data['registration']['password'])),
+    Benchmark("BillingAddressPage.enter_billing_address",
+              lambda ctx: ctx.open_logged_in("my-account/edit-address/billing/"),
+              lambda ctx: BillingAddressPage(ctx.driver, ctx.locators).enter_billing_address(ctx.data['billing_address'])),
+    Benchmark("BillingAddressPage.enter_billing_address[keystrokes]",
+              lambda ctx: ctx.open_logged_in("my-account/edit-address/billing/"),
+              lambda ctx: BillingAddressPage(ctx.driver, ctx.locators).enter_billing_address(ctx.data['billing_address'], real_keystrokes=True)),
+    Benchmark("ShopPage.add_product_to_cart",
+              lambda ctx: ctx.open(f"product-category/{ctx.data['shop']['category']}/"),
+              lambda ctx: ShopPage(ctx.driver, ctx.locators).add_product_to_cart(ctx.data['shop']['product_name'])),
+    Benchmark("CartPage.get_cart_snapshot",
+              lambda ctx: ctx.open_cart(),
+              lambda ctx: CartPage(ctx.driver, ctx.locators).get_cart_snapshot()),
+    Benchmark("CartPage.reads", lambda ctx: ctx.open_cart(), read_cart),
+]
+
+
+def run_benchmark(ctx, benchmark, rounds, warmup):
+    """Time benchmark.run for warmup + rounds rounds and summarise the measured ones in milliseconds."""
+    samples = []
+    for round_number in range(warmup + rounds):
+        benchmark.prepare(ctx)
+        start = time.perf_counter()
+        benchmark.run(ctx)
+        elapsed = (time.perf_counter() - start) * 1000
+        if round_number >= warmup:
+            samples.append(elapsed)
+    samples.sort()
+    return {
+        'rounds': rounds,
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(percentile(samples, 0.95), 3),
+        'min_ms': round(samples[0], 3),
+        'max_ms': round(samples[-1], 3),
+        'stdev_ms': round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    }
+
+
+def compare(results, baseline, regression_pct, min_delta_ms):
+    """Compare medians with the baseline; a regression must exceed both the percentage and the absolute floor."""
+    rows = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            rows.append((name, result['median_ms'], None, None, "new"))
+            continue
+        delta = result['median_ms'] - reference['median_ms']
+        change = delta / reference['median_ms'] * 100 if reference['median_ms'] else 0.0
+        if change > regression_pct and delta > min_delta_ms:
+            status = "REGRESSED"
+        elif change < -regression_pct and -delta > min_delta_ms:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, result['median_ms'], reference['median_ms'], change, status))
+    return rows
+
+
+def format_comparison(rows, results):
+    lines = [f"{'benchmark':<55} {'median ms':>10} {'p95 ms':>10} {'baseline':>10} {'change':>8}  status"]
+    for name, median, reference, change, status in rows:
+        reference_text = f"{reference:>10.2f}" if reference is not None else f"{'-':>10}"
+        change_text = f"{change:>+7.1f}%" if change is not None else f"{'-':>8}"
+        lines.append(f"{name:<55} {median:>10.2f} {results[name]['p95_ms']:>10.2f} {reference_text} {change_text}  {status}")
+    return "\n".join(lines)
+
+
+def load_baseline(path):
+    if not os.path.isfile(path):
+        return {}
+    with open(path, 'r') as file:
+        return json.load(file).get('results', {})
+
+
+def launch_browser(config, profile_name):
+    from utils.browser_profiles import BrowserProfile
+    from utils.driver_pool import create_driver
+    from utils.driver_resolver import DriverResolver
+
+    driver_path = DriverResolver.from_config(config).resolve()['path']
+    profile = BrowserProfile.from_config(dict(config, browser_profile=profile_name))
+    profile.headless = True
+    return create_driver(driver_path, profile)
+
+
+def main():
+    with open("utils/config.yaml", 'r') as file:
+        config = yaml.safe_load(file)
+    settings = config.get('benchmarks') or {}
+
+    parser = argparse.ArgumentParser(description="Time page-object primitives and flows against the local shop and compare with a baseline.")
+    parser.add_argument("--rounds", type=int, default=settings.get('rounds', 15))
+    parser.add_argument("--warmup", type=int, default=settings.get('warmup', 3))
+    parser.add_argument("--regression-pct", type=float, default=settings.get('regression_pct', 20))
+    parser.add_argument("--min-delta-ms", type=float, default=settings.get('min_delta_ms', 2))
+    parser.add_argument("--baseline", default=settings.get('baseline_file', "reports/benchmarks/baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline instead of comparing")
+    parser.add_argument("-k", dest="selection", default="", help="only run benchmarks whose name contains this text")
+    args = parser.parse_args()
+
+    with open("utils/locators.yaml", 'r') as file:
+        locators = compile_locators(yaml.safe_load(file))
+    with open("utils/data.yaml", 'r') as file:
+        data = yaml.safe_load(file)
+    BasePage.wait_engine = os.environ.get("WAIT_ENGINE", config.get('wait_engine', "polling"))
+    benchmarks = [benchmark for benchmark in BENCHMARKS if args.selection in benchmark.name]
+
+    server = LocalShopServer(seed_users=seed_users_from_data()).start()
+    driver = launch_browser(config, settings.get('browser_profile', "fast"))
+    results = {}
+    try:
+        ctx = BenchmarkContext(driver, server.base_url, locators, data)
+        for benchmark in benchmarks:
+            results[benchmark.name] = run_benchmark(ctx, benchmark, args.rounds, args.warmup)
+            print(f"{benchmark.name}: median {results[benchmark.name]['median_ms']:.2f} ms")
+    finally:
+        driver.quit()
+        server.stop()
+
+    run = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'rounds': args.rounds, 'warmup': args.warmup,
+           'wait_engine': BasePage.wait_engine, 'results': results}
+    os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+    with open(os.path.join(os.path.dirname(args.baseline) or ".", "latest.json"), 'w') as file:
+        json.dump(run, file, indent=2)
+
+    if args.save_baseline:
+        # Keep the other benchmarks' baselines when only a selection was run
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        with open(args.baseline, 'w') as file:
+            json.dump(dict(run, results=baseline), file, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        # Nothing to compare with would otherwise pass the gate silently
+        print(f"\nNo baseline in {args.baseline}; nothing was compared. Run with --save-baseline to create one.",
+              file=sys.stderr)
+        sys.exit(1)
+    rows = compare(results, baseline, args.regression_pct, args.min_delta_ms)
+    print("\n" + format_comparison(rows, results))
+    new = [row[0] for row in rows if row[4] == "new"]
+    if new:
+        print(f"\n{len(new)} benchmark(s) have no baseline and were not checked: {', '.join(new)}", file=sys.stderr)
+    regressed = [row[0] for row in rows if row[4] == "REGRESSED"]
+    if regressed:
+        print(f"\n{len(regressed)} benchmark(s) regressed by more than {args.regression_pct:.0f}%: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import glob
+import json
+import os
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from utils.workers import worker_path
+
+
+# Key used to expose blocked-request totals to the summary hooks
+resource_stats_key = pytest.StashKey()
+
+# Network.setBlockedURLs only matches URLs, so resource types are blocked by file extension
+RESOURCE_TYPE_PATTERNS = {
+    'Image': ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"],
+    'Font': ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    'Media': ["*.mp4*", "*.webm*", "*.mp3*", "*.ogg*"],
+    'Stylesheet': ["*.css*"],
+}
+
+FIDELITY = {'headless': False, 'page_load_strategy': "normal", 'window_size': "maximized",
+            'block': {'url_patterns': [], 'resource_types': []}}
+
+
+class BrowserProfile:
+    """Named set of Chrome launch options and DevTools request blocking rules."""
+
+    def __init__(self, name, headless=False, page_load_strategy="normal", window_size="maximized",
+                 url_patterns=(), resource_types=(), performance_log=False):
+        self.name = name
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.window_size = window_size
+        self.resource_types = list(resource_types)
+        self.blocked_patterns = list(url_patterns)
+        for resource_type in self.resource_types:
+            if resource_type not in RESOURCE_TYPE_PATTERNS:
+                raise ValueError(f"Unknown resource type '{resource_type}' in browser profile '{name}'. "
+                                 f"Known types: {sorted(RESOURCE_TYPE_PATTERNS)}")
+            self.blocked_patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        # The performance log costs DevTools events on every request, so only profiles that block
+        # requests or runs that ask for resource_stats turn it on
+        self.performance_log = performance_log or bool(self.blocked_patterns)
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the profile named by browser_profile (or BROWSER_PROFILE) from config.yaml.
+
+        resource_stats (or RESOURCE_STATS=1) records requests and sizes for profiles that block nothing too.
+        """
+        name = os.environ.get("BROWSER_PROFILE", config.get('browser_profile', "fidelity"))
+        profiles = config.get('browser_profiles') or {'fidelity': FIDELITY}
+        if name not in profiles:
+            raise ValueError(f"Browser profile '{name}' not found. Available profiles: {sorted(profiles)}")
+        settings = profiles[name]
+        block = settings.get('block') or {}
+        return cls(
+            name,
+            headless=settings.get('headless', False),
+            page_load_strategy=settings.get('page_load_strategy', "normal"),
+            window_size=settings.get('window_size', "maximized"),
+            url_patterns=block.get('url_patterns') or [],
+            resource_types=block.get('resource_types') or [],
+            performance_log=os.environ.get("RESOURCE_STATS", str(config.get('resource_stats', False))).lower()
+            in ("1", "true", "yes"),
+        )
+
+    def chrome_options(self):
+        """Return ChromeOptions implementing the profile."""
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.window_size != "maximized":
+            options.add_argument(f"--window-size={self.window_size}")
+        # Images are blocked through Network.setBlockedURLs only, like every other type: the content-settings
+        # pref would stop them before a request exists, so they would be missing from the blocked counts
+        if self.performance_log:
+            # The performance log is where blocked and finished requests are counted
+            options.set_capability("goog:loggingPrefs", {'performance': "ALL"})
+        return options
+
+    def apply(self, driver):
+        """Finish setting up a freshly launched driver."""
+        if self.window_size == "maximized" and not self.headless:
+            driver.maximize_window()
+        if self.blocked_patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {'urls': self.blocked_patterns})
+
+
+class ResourceMonitor:
+    """Counts requests, blocked requests and bytes from the Chrome performance log."""
+
+    def __init__(self, profile_name, directory=os.path.join("reports", "metrics")):
+        self.profile_name = profile_name
+        self.directory = directory
+        # Each worker writes its own file; sizes learned by any worker of earlier runs are reused
+        self.sizes_file = worker_path(directory, "resource_sizes.json")
+        self.sizes = self._load_sizes()
+        self.stats = {'profile': profile_name, 'requests': 0, 'blocked': 0, 'bytes_downloaded': 0,
+                      'bytes_saved': 0, 'blocked_unknown_size': 0}
+
+    def collect(self, driver):
+        """Drain the driver's performance log into the running totals."""
+        try:
+            entries = driver.get_log('performance')
+        except WebDriverException:
+            return
+        urls = {}
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            method, params = message.get('method'), message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                urls[params['requestId']] = params['request']['url']
+                self.stats['requests'] += 1
+            elif method == 'Network.loadingFinished':
+                size = int(params.get('encodedDataLength', 0))
+                self.stats['bytes_downloaded'] += size
+                url = urls.get(params['requestId'])
+                if url:
+                    # Remember sizes so blocked requests in faster profiles can be priced
+                    self.sizes[url] = size
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                self.stats['blocked'] += 1
+                url = urls.get(params['requestId'])
+                if url in self.sizes:
+                    self.stats['bytes_saved'] += self.sizes[url]
+                else:
+                    self.stats['blocked_unknown_size'] += 1
+
+    def save_sizes(self):
+        os.makedirs(os.path.dirname(self.sizes_file), exist_ok=True)
+        temp_file = f"{self.sizes_file}.{os.getpid()}.tmp"
+        with open(temp_file, 'w') as file:
+            json.dump(self.sizes, file)
+        os.replace(temp_file, self.sizes_file)
+
+    def _load_sizes(self):
+        sizes = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, "*", "resource_sizes.json"))):
+            try:
+                with open(path, 'r') as file:
+                    sizes.update(json.load(file))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        return sizes
+
+
+def merge_resource_stats(total, stats):
+    """Add one worker's resource stats to a running total."""
+    if total is None:
+        return dict(stats)
+    return {key: (value + stats[key] if isinstance(value, int) else value) for key, value in total.items()}
+
+
+def format_resource_stats(stats):
+    """Return a one-line description of requests blocked by the browser profile."""
+    unknown = f" (+{stats['blocked_unknown_size']} of unknown size)" if stats['blocked_unknown_size'] else ""
+    return (f"Browser profile '{stats['profile']}': {stats['requests']} requests, {stats['blocked']} blocked, "
+            f"{stats['bytes_downloaded'] / 1024:.0f} KiB downloaded, ~{stats['bytes_saved'] / 1024:.0f} KiB saved{unknown}")
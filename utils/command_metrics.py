@@ -0,0 +1,176 @@
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from html import escape
+
+import pytest
+
+
+# Key used to expose the session's recorder to the report hooks
+command_recorder_key = pytest.StashKey()
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages")
+
+# Commands after which the browser may be showing another document
+NAVIGATION_COMMANDS = ("get", "goBack", "goForward", "refresh", "clickElement", "submitElement", "sendKeysToElement")
+SCRIPT_COMMANDS = ("executeScript", "w3cExecuteScript", "executeAsyncScript", "w3cExecuteScriptAsync")
+
+
+def add_command_listener(driver, listener):
+    """Call listener(command, params, seconds, result, error, callers) after every WebDriver command of driver.
+
+    callers is page_object_callers() of the command, worked out once and shared by all listeners; it is
+    None when every listener sets wants_callers = False.
+    """
+    listeners = getattr(driver, '_command_listeners', None)
+    if listeners is None:
+        listeners = driver._command_listeners = []
+        execute = driver.execute
+
+        # Everything (driver and element calls) goes through driver.execute, so one wrapper sees it all
+        def instrumented_execute(driver_command, params=None):
+            wants_callers = any(getattr(callback, 'wants_callers', True) for callback in listeners)
+            start = time.perf_counter()
+            try:
+                result = execute(driver_command, params)
+            except Exception as e:
+                seconds = time.perf_counter() - start
+                callers = page_object_callers() if wants_callers else None
+                for callback in listeners:
+                    callback(driver_command, params, seconds, None, e, callers)
+                raise
+            seconds = time.perf_counter() - start
+            callers = page_object_callers() if wants_callers else None
+            for callback in listeners:
+                callback(driver_command, params, seconds, result, None, callers)
+            return result
+
+        driver.execute = instrumented_execute
+    if listener not in listeners:
+        listeners.append(listener)
+
+
+def may_navigate(command, params):
+    """Whether a command can load another document: navigation, clicks, key presses and scripted clicks."""
+    if command in NAVIGATION_COMMANDS:
+        return True
+    return command in SCRIPT_COMMANDS and bool(params) and ".click()" in str(params.get('script', ''))
+
+
+class NavigationCounter:
+    """Counts the commands of a driver that may have loaded another document.
+
+    Page objects compare the count with the one they saw when they cached something from the page,
+    which tells them the cache may be stale without asking the browser.
+    """
+    wants_callers = False
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, command, params, seconds, result, error, callers):
+        if may_navigate(command, params):
+            self.count += 1
+
+
+def navigation_counter(driver):
+    """Return the NavigationCounter of driver, installing it on first use."""
+    counter = getattr(driver, '_navigation_counter', None)
+    if counter is None:
+        counter = driver._navigation_counter = NavigationCounter()
+        add_command_listener(driver, counter)
+    return counter
+
+
+def page_object_callers():
+    """Return (outermost, innermost) page-object methods on the stack, e.g. ('ShopPage.go_to_shop', 'ShopPage.click_element').
+
+    Walks the whole stack from the caller's caller, which costs a few microseconds at typical depths and
+    grows with the depth (about 4 µs at 5 frames, 18 µs at 80).
+    """
+    frame = sys._getframe(2)
+    outer = inner = None
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(PAGES_DIR):
+            owner = frame.f_locals.get('self')
+            name = f"{type(owner).__name__}.{frame.f_code.co_name}" if owner is not None else frame.f_code.co_name
+            inner = inner or name
+            outer = name
+        frame = frame.f_back
+    return outer or "<test>", inner or "<test>"
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def aggregate(records, key):
+    """Group records by key and return rows with count, p50, p95, max and total in milliseconds."""
+    groups = {}
+    for record in records:
+        groups.setdefault(record[key], []).append(record['seconds'] * 1000)
+    rows = []
+    for name, durations in groups.items():
+        durations.sort()
+        rows.append({
+            key: name,
+            'count': len(durations),
+            'p50_ms': round(statistics.median(durations), 2),
+            'p95_ms': round(percentile(durations, 0.95), 2),
+            'max_ms': round(durations[-1], 2),
+            'total_ms': round(sum(durations), 2),
+        })
+    return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+
+class CommandRecorder:
+    """Records every WebDriver command of the current test and keeps per-test aggregates."""
+
+    def __init__(self):
+        self.current = None
+        self.tests = {}
+
+    def __call__(self, command, params, seconds, result, error, callers):
+        if self.current is not None:
+            method, primitive = callers
+            self.current.append({'command': command, 'seconds': seconds, 'method': method, 'primitive': primitive})
+
+    def start_test(self, nodeid):
+        self.current = []
+
+    def finish_test(self, nodeid):
+        """Stop recording and return the aggregated breakdown of the test, or None if nothing was recorded."""
+        records, self.current = self.current, None
+        if records is None:
+            return None
+        summary = {
+            'commands': len(records),
+            'total_ms': round(sum(record['seconds'] for record in records) * 1000, 2),
+            'by_method': aggregate(records, 'method'),
+            'by_primitive': aggregate(records, 'primitive'),
+            'by_command': aggregate(records, 'command'),
+        }
+        self.tests[nodeid] = summary
+        return summary
+
+    def export(self, path):
+        """Write all per-test aggregates as JSON for trend tracking."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump({'generated_at': time.strftime("%Y-%m-%dT%H:%M:%S"), 'tests': self.tests}, file, indent=2)
+
+
+def breakdown_html(summary):
+    """Render a test's per-method breakdown as an HTML table for the pytest-html report."""
+    header = "".join(f"<th>{title}</th>" for title in ("Page-object method", "Commands", "p50 ms", "p95 ms", "max ms", "total ms"))
+    rows = "".join(
+        f"<tr><td>{escape(row['method'])}</td><td>{row['count']}</td><td>{row['p50_ms']}</td>"
+        f"<td>{row['p95_ms']}</td><td>{row['max_ms']}</td><td>{row['total_ms']}</td></tr>"
+        for row in summary['by_method']
+    )
+    return (f"<p>WebDriver commands: {summary['commands']} in {summary['total_ms']} ms</p>"
+            f"<table class=\"command-metrics\"><tr>{header}</tr>{rows}</table>")
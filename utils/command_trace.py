@@ -0,0 +1,160 @@
+import json
+import os
+import re
+import time
+from collections import deque
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.command_metrics import may_navigate
+
+
+# Key used to hand the session's trace recorder to the report hook
+command_trace_key = pytest.StashKey()
+
+# Longest string kept per argument or result when a trace is written
+VALUE_LIMIT = 500
+
+# Steps through TRACE({...}) files; open as viewer.html?trace=<file>.trace.js
+VIEWER_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>WebDriver command trace</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 0; display: flex; height: 100vh; }
+#list { width: 55%; overflow-y: auto; border-right: 1px solid #ddd; } #detail { flex: 1; padding: 10px; overflow-y: auto; }
+table { border-collapse: collapse; width: 100%; } td { border-bottom: 1px solid #eee; padding: 3px 6px; white-space: nowrap; }
+tr { cursor: pointer; } tr.current { background: #e3f2fd; } tr.error td { color: #c62828; }
+pre { white-space: pre-wrap; word-break: break-all; background: #f7f7f7; padding: 6px; } h2 { margin: 0 0 6px; font-size: 15px; }
+</style></head><body>
+<div id="list"><table id="rows"></table></div>
+<div id="detail"><h2 id="title"></h2><p id="hint">Use the arrow keys or click a row to step through the commands.</p>
+<button id="prev">&lt; previous</button> <button id="next">next &gt;</button><div id="step"></div></div>
+<script>
+let trace = null;
+function TRACE(data) { trace = data; }
+const script = document.createElement('script');
+script.src = new URLSearchParams(location.search).get('trace');
+script.onload = start;
+document.head.appendChild(script);
+const esc = (text) => String(text == null ? '' : text).replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+let current = 0;
+function start() {
+    document.getElementById('title').textContent = `${trace.test} (last ${trace.commands.length} of ${trace.total} commands)`;
+    document.getElementById('rows').innerHTML = trace.commands.map(([at, command, ms, params, result, error, url, method], i) =>
+        `<tr id="row${i}" class="${error ? 'error' : ''}" onclick="show(${i})"><td>+${at.toFixed(3)}s</td><td>${esc(method)}</td>` +
+        `<td>${esc(command)}</td><td>${ms.toFixed(1)} ms</td></tr>`).join('');
+    show(trace.commands.length - 1);
+}
+function show(i) {
+    if (i < 0 || i >= trace.commands.length) { return; }
+    document.getElementById(`row${current}`).classList.remove('current');
+    current = i;
+    const row = document.getElementById(`row${i}`);
+    row.classList.add('current');
+    row.scrollIntoView({block: 'nearest'});
+    const [at, command, ms, params, result, error, url, method] = trace.commands[i];
+    document.getElementById('step').innerHTML = `<h2>${i + 1}. ${esc(command)}</h2>` +
+        `<p>${esc(method)} at +${at.toFixed(3)}s, ${ms.toFixed(1)} ms</p><p>Last known URL: ${esc(url)}</p>` +
+        `<p>Arguments</p><pre>${esc(JSON.stringify(params, null, 2))}</pre>` +
+        (error ? `<p>Error</p><pre>${esc(error)}</pre>` : `<p>Result</p><pre>${esc(JSON.stringify(result, null, 2))}</pre>`) +
+        (i === trace.commands.length - 1 ? `<p>Final URL: ${esc(trace.final_url)}</p>` : '');
+}
+document.getElementById('prev').onclick = () => show(current - 1);
+document.getElementById('next').onclick = () => show(current + 1);
+document.onkeydown = (event) => {
+    if (event.key === 'ArrowUp' || event.key === 'ArrowLeft') { show(current - 1); event.preventDefault(); }
+    if (event.key === 'ArrowDown' || event.key === 'ArrowRight') { show(current + 1); event.preventDefault(); }
+};
+</script></body></html>
+"""
+
+
+def compact(value):
+    """Make a command argument or result JSON-safe and short: elements become their id, long strings are cut."""
+    if isinstance(value, WebElement):
+        return {'element': value.id}
+    if isinstance(value, str):
+        return value if len(value) <= VALUE_LIMIT else f"{value[:VALUE_LIMIT]}... ({len(value)} chars)"
+    if isinstance(value, dict):
+        return {key: compact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [compact(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return compact(repr(value))
+
+
+class CommandTrace:
+    """Keeps the last N WebDriver commands of the running test in memory and writes them only when asked.
+
+    Recording stores a tuple per command in a fixed-size deque and never serializes anything, so
+    passing tests pay only for the append (the page-object caller comes from the stack walk the
+    listener hook already does); arguments and results are compacted when a trace is written.
+    """
+
+    def __init__(self, directory, size=200):
+        self.directory = directory
+        self.buffer = deque(maxlen=size)
+        self.started = time.perf_counter()
+        self.total = 0
+        self.url = None
+        # First command since the URL was last known that may have loaded another document
+        self.navigated_by = None
+        self.flushed = {}
+
+    def __call__(self, command, params, seconds, result, error, callers):
+        if command == "get" and params:
+            self.url, self.navigated_by = params.get('url', self.url), None
+        elif command == "getCurrentUrl" and isinstance(result, dict):
+            self.url, self.navigated_by = result.get('value', self.url), None
+        self.total += 1
+        self.buffer.append((time.perf_counter() - self.started - seconds, command, seconds, params, result, error,
+                            self.url, self.navigated_by, callers[0]))
+        # Clicks and the like are recorded with the URL they ran on; later commands may be on another page
+        if self.navigated_by is None and command != "get" and may_navigate(command, params):
+            self.navigated_by = command
+
+    def start_test(self, nodeid):
+        self.buffer.clear()
+        self.navigated_by = None
+        self.started = time.perf_counter()
+        self.total = 0
+
+    def flush(self, nodeid, driver=None):
+        """Write the buffered commands to <nodeid>.trace.js and return its path; repeated calls return the first file."""
+        # Keyed by node id: parametrized tests and tests in different modules can share a name
+        if nodeid in self.flushed:
+            return self.flushed[nodeid]
+        if not self.buffer:
+            return None
+        commands = [
+            [round(at, 4), command, round(seconds * 1000, 2), compact(params),
+             compact(result.get('value') if isinstance(result, dict) else result),
+             f"{type(error).__name__}: {error}" if error else None,
+             f"{url} (may have changed after {navigated_by})" if navigated_by else url, method]
+            for at, command, seconds, params, result, error, url, navigated_by, method in self.buffer
+        ]
+        # Asked after the buffer is copied so the question does not show up in the trace
+        final_url = self.url
+        if driver is not None:
+            try:
+                final_url = driver.current_url
+            except WebDriverException as e:
+                final_url = f"unavailable: {str(e).splitlines()[0]}"
+        if not self.flushed:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, "viewer.html"), 'w', encoding="utf-8") as file:
+                file.write(VIEWER_HTML)
+        path = os.path.join(self.directory, f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', nodeid)}.trace.js")
+        with open(path, 'w', encoding="utf-8") as file:
+            trace = {'test': nodeid, 'total': self.total, 'final_url': final_url, 'commands': commands}
+            file.write(f"TRACE({json.dumps(trace, separators=(',', ':'), default=str)});\n")
+        self.flushed[nodeid] = path
+        return path
+
+
+def viewer_link(trace_path, start):
+    """Return the URL opening a trace file in its viewer, relative to the directory start."""
+    viewer = os.path.relpath(os.path.join(os.path.dirname(trace_path), "viewer.html"), start)
+    return f"{viewer}?trace={os.path.basename(trace_path)}"
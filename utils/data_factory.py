@@ -0,0 +1,94 @@
+import os
+import random
+import secrets
+from types import MappingProxyType
+
+import pytest
+
+from utils.workers import worker_id
+
+
+# Keys used to share the session's data seed and run token with the report hooks
+data_seed_key = pytest.StashKey()
+data_run_key = pytest.StashKey()
+
+FIRST_NAMES = ("Aarav", "Ananya", "Arjun", "Diya", "Ishaan", "Kavya", "Meera", "Nikhil", "Priya", "Rahul",
+               "Riya", "Rohan", "Sanjana", "Siddharth", "Sneha", "Vikram")
+LAST_NAMES = ("Agarwal", "Bose", "Chopra", "Desai", "Gupta", "Iyer", "Joshi", "Kapoor", "Menon", "Nair",
+              "Patel", "Rao", "Reddy", "Shah", "Singh", "Verma")
+STREETS = ("MG Road", "Park Street", "Brigade Road", "Linking Road", "Anna Salai", "Banjara Hills Road",
+           "FC Road", "Residency Road")
+
+# Values regenerated for every test; country, state and postcode stay as in data.yaml because they are validated together
+ADDRESS_SECTIONS = ("billing_address", "shipping_address")
+
+
+def freeze(value):
+    """Return a read-only copy of parsed YAML: dicts become mapping proxies and lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def with_values(view, section, values):
+    """Return a new view with some keys of one section replaced; everything else is shared, not copied."""
+    updated = dict(view)
+    updated[section] = MappingProxyType({**view.get(section, {}), **values})
+    return MappingProxyType(updated)
+
+
+def choose_seed():
+    """Seed for this run: DATA_SEED if set (to reproduce a run), otherwise a random one."""
+    return int(os.environ.get("DATA_SEED") or secrets.randbits(32))
+
+
+def choose_run_token():
+    """Token making this run's emails unique: DATA_RUN if set, otherwise a random one.
+
+    It is not derived from the seed, so a run reproduced with DATA_SEED does not try to register the
+    accounts the original run already created on the live shop.
+    """
+    return os.environ.get("DATA_RUN") or secrets.token_hex(3)
+
+
+class DataFactory:
+    """Hands every test a read-only view of data.yaml with freshly generated, reproducible values."""
+
+    def __init__(self, base_data, seed, namespace=None, run_token=None):
+        self.base = freeze(base_data)
+        self.seed = seed
+        self.namespace = namespace or worker_id()
+        self.run_token = run_token or choose_run_token()
+
+    def for_test(self, nodeid):
+        """Return the data view of one test; the same seed and test id always give the same values."""
+        # Not namespaced, so a test gets the same values whichever worker runs it; test ids are unique anyway
+        rng = random.Random(f"{self.seed}:{nodeid}")
+        view = with_values(self.base, 'registration', {'email': self.email(rng)})
+        for section in ADDRESS_SECTIONS:
+            if section in view:
+                view = with_values(view, section, self.address(rng))
+        return view
+
+    def random(self, key):
+        """Generator for values that are not tied to one test (e.g. storage-state accounts), namespaced by worker."""
+        # String seeds are hashed deterministically, unlike hash() which is salted per process
+        return random.Random(f"{self.seed}:{self.namespace}:{key}")
+
+    def email(self, rng, namespace=None):
+        # The run token keeps reproduced runs from re-registering existing accounts; keys that repeat on
+        # every worker pass the namespace so parallel workers never register the same account
+        prefix = f"saiteja_nannaka_{self.run_token}_{namespace}" if namespace else f"saiteja_nannaka_{self.run_token}"
+        return f"{prefix}_{rng.getrandbits(40):010x}@example.com"
+
+    def address(self, rng):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        return {
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': f"{first_name}.{last_name}.{rng.getrandbits(24):06x}@example.com".lower(),
+            'phone': f"9{rng.randrange(10 ** 9):09d}",
+            'address_1': f"{rng.randint(1, 999)} {rng.choice(STREETS)}",
+        }
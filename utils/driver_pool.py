@@ -0,0 +1,92 @@
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+
+
+# Key used to expose launch/reuse counters to hooks such as the terminal summary
+driver_stats_key = pytest.StashKey()
+
+
+def create_driver(driver_path, profile):
+    """Launch a new Chrome instance configured by a BrowserProfile, using an already resolved chromedriver."""
+    driver = webdriver.Chrome(service=Service(driver_path), options=profile.chrome_options())
+    profile.apply(driver)
+    return driver
+
+
+class DriverPool:
+    """Keeps one browser per worker and resets it between tests."""
+
+    def __init__(self, factory, reuse=True):
+        self.factory = factory
+        self.reuse = reuse
+        self.driver = None
+        self.launches = 0
+        self.reuses = 0
+        self.resets_failed = 0
+
+    def acquire(self, fresh=False):
+        """Return a clean driver, launching a new one only when needed."""
+        if self.driver is not None and self.reuse and not fresh:
+            if self.reset(self.driver):
+                self.reuses += 1
+                return self.driver
+            self.resets_failed += 1
+
+        self.discard()
+        self.driver = self.factory()
+        self.launches += 1
+        return self.driver
+
+    def release(self, fresh=False):
+        """Hand the driver back; pristine or non-reusable drivers are closed."""
+        if fresh or not self.reuse:
+            self.discard()
+
+    def discard(self):
+        """Quit the current driver, if any."""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+    def reset(self, driver):
+        """Bring a used browser back to an empty state. Return False if it is unusable."""
+        try:
+            # Step 1: Close every window except the first one
+            handles = driver.window_handles
+            primary = handles[0]
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(primary)
+
+            # Step 2: Clear storage of the origin we are still on
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except WebDriverException:
+                # about:blank and data: URLs have no storage
+                pass
+
+            # Step 3: Clear cookies for every domain, not only the current one
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except (AttributeError, WebDriverException):
+                driver.delete_all_cookies()
+
+            driver.get("about:blank")
+            return True
+        except (IndexError, WebDriverException):
+            return False
+
+    def stats(self):
+        """Return launch and reuse counters as a plain dict."""
+        return {'launches': self.launches, 'reuses': self.reuses, 'resets_failed': self.resets_failed}
+
+
+def format_stats(stats):
+    """Return a one-line description of launches and reuses."""
+    return f"Browser launches: {stats['launches']}, reuses: {stats['reuses']}, failed resets: {stats['resets_failed']}"
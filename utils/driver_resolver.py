@@ -0,0 +1,164 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from utils.structured_log import logger
+
+
+# Key used to expose the resolution result to the report hooks
+driver_resolution_key = pytest.StashKey()
+
+CHROME_CANDIDATES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+
+# Cache key of a driver downloaded while the Chrome version could not be determined
+UNKNOWN_VERSION = "unknown"
+
+
+class DriverResolutionError(Exception):
+    """Raised when no chromedriver can be provided for the installed Chrome."""
+
+
+@contextmanager
+def file_lock(lock_path):
+    """Hold an exclusive lock on lock_path; shared by every process on the machine."""
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a+") as lock_file:
+        if os.name == "nt":
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def chrome_major_version(chrome_binary=None):
+    """Return the major version of the installed Chrome, or None if it cannot be found."""
+    candidates = [chrome_binary] if chrome_binary else CHROME_CANDIDATES
+    for candidate in candidates:
+        executable = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if not executable:
+            continue
+        try:
+            output = subprocess.run([executable, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"(\d+)\.\d+\.\d+", output)
+        if match:
+            return match.group(1)
+    return None
+
+
+class DriverResolver:
+    """Resolves the chromedriver binary once, backed by a cache keyed by Chrome major version."""
+
+    def __init__(self, cache_dir=".drivers", offline=False, driver_path=None, chrome_binary=None):
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.driver_path = driver_path
+        self.chrome_binary = chrome_binary
+        self.cache_file = os.path.join(cache_dir, "cache.json")
+        self.lock_path = os.path.join(cache_dir, "cache.lock")
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a resolver from the 'chromedriver' section of config.yaml."""
+        settings = config.get('chromedriver') or {}
+        return cls(
+            cache_dir=settings.get('cache_dir', ".drivers"),
+            offline=os.environ.get("CHROMEDRIVER_OFFLINE", str(settings.get('offline', False))).lower() in ("1", "true", "yes"),
+            driver_path=os.environ.get("CHROMEDRIVER_PATH") or settings.get('path') or None,
+            chrome_binary=settings.get('chrome_binary') or None,
+        )
+
+    def resolve(self):
+        """Return a dict with the driver path, how it was found and how long it took."""
+        start = time.perf_counter()
+
+        # A pre-provisioned binary always wins and never touches the network
+        if self.driver_path:
+            if not os.path.isfile(self.driver_path):
+                raise DriverResolutionError(f"Configured chromedriver not found: {self.driver_path}")
+            return self._result(self.driver_path, "provisioned", None, start)
+
+        major = chrome_major_version(self.chrome_binary)
+        with file_lock(self.lock_path):
+            cache = self._read_cache()
+            cached_path = cache.get(major) if major else None
+            if cached_path and os.path.isfile(cached_path):
+                return self._result(cached_path, "cache", major, start)
+
+            if self.offline and major is None:
+                # Chrome could not be asked for its version; the newest cached driver is the best guess
+                usable = [(version, path) for version, path in cache.items() if os.path.isfile(path)]
+                if usable:
+                    version, path = max(usable, key=lambda entry: int(entry[0]) if entry[0].isdigit() else -1)
+                    logger.warning(f"Chrome version unknown; offline mode falls back to the cached chromedriver "
+                                   f"for Chrome {version} ({path})", extra={'event': "driver_resolution"})
+                    return self._result(path, "cache (version unknown)", version, start)
+
+            if self.offline:
+                raise DriverResolutionError(
+                    f"Offline mode: no cached chromedriver for Chrome {major or 'unknown'} in {self.cache_dir}; "
+                    f"set chromedriver.path or CHROMEDRIVER_PATH to a pre-provisioned binary.")
+
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            # Keep a private copy so later runs do not depend on the webdriver_manager cache; without a
+            # version it is kept under UNKNOWN_VERSION so an offline run still finds a driver
+            key = major or UNKNOWN_VERSION
+            cached_dir = os.path.join(self.cache_dir, key)
+            os.makedirs(cached_dir, exist_ok=True)
+            path = shutil.copy2(path, os.path.join(cached_dir, os.path.basename(path)))
+            cache[key] = path
+            self._write_cache(cache)
+            return self._result(path, "download", major, start)
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_file, 'r') as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_cache(self, cache):
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, 'w') as file:
+            json.dump(cache, file, indent=2)
+        os.replace(temp_file, self.cache_file)
+
+    @staticmethod
+    def _result(path, source, major, start):
+        return {
+            'path': path,
+            'source': source,
+            'chrome_major': major,
+            'seconds': round(time.perf_counter() - start, 3),
+        }
+
+
+def format_resolution(resolution):
+    """Return a one-line description of how the driver was resolved."""
+    chrome = f"Chrome {resolution['chrome_major']}" if resolution.get('chrome_major') else "Chrome version unknown"
+    return f"Chromedriver resolved from {resolution['source']} in {resolution['seconds']}s ({chrome})"
@@ -0,0 +1,417 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+import yaml
+
+from pages.cart_page import CartPage, CartSnapshot
+from pages.home_page import HomePage
+from pages.registration_page import RegistrationPage
+from pages.shop_page import ShopPage
+from utils.command_metrics import percentile
+from utils.data_factory import DataFactory
+from utils.local_shop import LocalShopServer, seed_users_from_data
+from utils.preconditions import AccountSession
+
+
+class _ListingParser(HTMLParser):
+    """Collects name, product id and stock state of every product tile of a listing page."""
+
+    def __init__(self):
+        super().__init__()
+        self.products = {}
+        self._item = None
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or "").split()
+        if tag == 'li' and 'product' in classes:
+            self._item = {'name': "", 'product_id': None, 'in_stock': 'outofstock' not in classes}
+        elif self._item is not None and tag in ('h3', 'h2'):
+            self._in_title = True
+        elif self._item is not None and tag == 'a' and 'add_to_cart_button' in classes:
+            self._item['product_id'] = attrs.get('data-product_id')
+
+    def handle_endtag(self, tag):
+        if tag in ('h3', 'h2'):
+            self._in_title = False
+        elif tag == 'li' and self._item is not None:
+            self.products[self._item['name'].strip()] = self._item
+            self._item = None
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._item['name'] += data
+
+
+class _CartParser(HTMLParser):
+    """Reads the basket page into the same shape CART_SNAPSHOT_SCRIPT returns in the browser."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self.totals = {}
+        self._row = None
+        self._cell = None
+        self._totals_row = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or "").split()
+        if tag == 'tr' and 'cart_item' in classes:
+            self._row = {'name': "", 'product_id': None, 'price': "", 'quantity': "", 'subtotal': ""}
+        elif tag == 'tr' and classes and self._row is None:
+            self._totals_row = classes[0]
+            self.totals[self._totals_row] = ""
+        elif tag == 'td' and self._row is not None:
+            self._cell = next((name for name in ('product-name', 'product-price', 'product-subtotal') if name in classes), None)
+        elif tag == 'td' and self._totals_row is not None:
+            self._cell = 'total'
+        elif tag == 'input' and self._row is not None and 'qty' in classes:
+            self._row['quantity'] = attrs.get('value', "")
+        elif tag == 'a' and self._row is not None and 'remove' in classes:
+            self._row['product_id'] = attrs.get('data-product_id')
+
+    def handle_endtag(self, tag):
+        if tag == 'td':
+            self._cell = None
+        elif tag == 'tr':
+            if self._row is not None:
+                self.rows.append({key: value.strip() for key, value in self._row.items()})
+            self._row = self._totals_row = None
+
+    def handle_data(self, data):
+        if self._cell == 'product-name':
+            self._row['name'] += data
+        elif self._cell == 'product-price':
+            self._row['price'] += data
+        elif self._cell == 'product-subtotal':
+            self._row['subtotal'] += data
+        elif self._cell == 'total':
+            self.totals[self._totals_row] += data
+
+
+class HttpUser:
+    """Virtual user walking the shop journeys with plain HTTP requests, one session per user."""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.account = AccountSession(base_url, timeout=timeout)
+        self.session = self.account.session
+        self.products = {}
+
+    def register(self, email, password):
+        # Every registration is a new customer, so drop the cookies of the previous one
+        self.session.cookies.clear()
+        self.account.register(email, password)
+
+    def go_to_shop(self):
+        self._load_listing(urljoin(self.base_url, "shop/"))
+
+    def select_category(self, category_name):
+        self._load_listing(urljoin(self.base_url, f"product-category/{category_name.lower()}/"))
+
+    def add_product_to_cart(self, product_name):
+        product = self.products.get(product_name)
+        if product is None or not product['in_stock'] or not product['product_id']:
+            raise Exception(f"Failed to add product '{product_name}' to the cart: not available in this listing")
+        response = self.session.post(urljoin(self.base_url, "?wc-ajax=add_to_cart"), timeout=self.timeout,
+                                     data={'product_id': product['product_id'], 'quantity': 1})
+        response.raise_for_status()
+        if response.json().get('error'):
+            raise Exception(f"Failed to add product '{product_name}' to the cart: rejected by the store")
+
+    def get_cart_snapshot(self):
+        response = self.session.get(urljoin(self.base_url, "basket/"), timeout=self.timeout)
+        response.raise_for_status()
+        parser = _CartParser()
+        parser.feed(response.text)
+        return CartSnapshot.from_script_result({'rows': parser.rows, 'totals': parser.totals})
+
+    def close(self):
+        self.session.close()
+
+    def _load_listing(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        parser = _ListingParser()
+        parser.feed(response.text)
+        self.products = parser.products
+
+
+class BrowserUser:
+    """Virtual user walking the same journeys through the page objects in a headless browser."""
+
+    def __init__(self, driver, base_url, locators):
+        self.driver = driver
+        self.base_url = base_url
+        self.locators = locators
+        self.shop_page = ShopPage(driver, locators)
+
+    def register(self, email, password):
+        self.driver.delete_all_cookies()
+        self.driver.get(self.base_url)
+        HomePage(self.driver, self.locators).go_to_my_account()
+        RegistrationPage(self.driver, self.locators).register(email, password)
+
+    def go_to_shop(self):
+        if not self.driver.current_url.startswith(self.base_url):
+            self.driver.get(self.base_url)
+        self.shop_page.go_to_shop()
+
+    def select_category(self, category_name):
+        self.shop_page.select_category(category_name)
+
+    def add_product_to_cart(self, product_name):
+        self.shop_page.add_product_to_cart(product_name)
+
+    def get_cart_snapshot(self):
+        cart_page = CartPage(self.driver, self.locators)
+        cart_page.go_to_cart()
+        return cart_page.get_cart_snapshot()
+
+    def close(self):
+        self.driver.quit()
+
+
+# Scenarios: the suite's journeys written once against the user interface shared by HttpUser and BrowserUser
+
+def browse(user, data, rng):
+    user.go_to_shop()
+    user.select_category(rng.choice(("android", "html", "javascript", "selenium")))
+
+
+def add_to_cart(user, data, rng):
+    user.go_to_shop()
+    user.select_category(data['shop']['category'])
+    for product_name in data['shop']['product_names']:
+        user.add_product_to_cart(product_name)
+    cart = user.get_cart_snapshot()
+    missing = [name for name in data['shop']['product_names'] if name not in cart]
+    if missing:
+        raise Exception(f"Products missing from the cart: {missing}")
+    line_totals = sum(row.subtotal for row in cart.rows)
+    if abs(cart.total - line_totals) > 0.01:
+        raise Exception(f"Cart total {cart.total} does not match the sum of its lines {line_totals}")
+
+
+def checkout(user, data, rng):
+    user.register(data['registration']['email'], data['registration']['password'])
+    add_to_cart(user, data, rng)
+
+
+SCENARIOS = {'browse': browse, 'add_to_cart': add_to_cart, 'checkout': checkout}
+
+
+class StepTimer:
+    """Proxy timing every method call of a virtual user as a step."""
+
+    def __init__(self, user, stats):
+        self._user = user
+        self._stats = stats
+
+    def __getattr__(self, name):
+        method = getattr(self._user, name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                self._stats.record(name, time.perf_counter() - start, failed=True)
+                raise
+            self._stats.record(name, time.perf_counter() - start, failed=False)
+            return result
+        return timed
+
+
+class LoadStats:
+    """Thread-safe latency and error samples per step and per scenario, plus a per-second timeline."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.samples = {}
+        self.timeline = {}
+        self.active_users = 0
+
+    def record(self, name, seconds, failed):
+        with self.lock:
+            self.samples.setdefault(name, []).append((seconds, failed))
+            second = int(time.monotonic() - self.started)
+            bucket = self.timeline.setdefault(second, {'requests': 0, 'errors': 0, 'users': self.active_users})
+            bucket['requests'] += 1
+            bucket['errors'] += int(failed)
+            bucket['users'] = max(bucket['users'], self.active_users)
+
+    def user_started(self):
+        with self.lock:
+            self.active_users += 1
+
+    def user_stopped(self):
+        with self.lock:
+            self.active_users -= 1
+
+    def summary(self, elapsed):
+        rows = []
+        for name, samples in sorted(self.samples.items()):
+            durations = sorted(seconds * 1000 for seconds, failed in samples)
+            errors = sum(1 for seconds, failed in samples if failed)
+            rows.append({
+                'step': name,
+                'count': len(samples),
+                'errors': errors,
+                'error_rate': round(errors / len(samples), 4),
+                'throughput_per_s': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                'p50_ms': round(statistics.median(durations), 1),
+                'p95_ms': round(percentile(durations, 0.95), 1),
+                'p99_ms': round(percentile(durations, 0.99), 1),
+                'max_ms': round(durations[-1], 1),
+            })
+        return rows
+
+
+def run_load(user_factory, scenarios, data_factory, users, duration, ramp_up, think_time=0.0, seed=0):
+    """Run weighted scenarios on `users` virtual users, started evenly over ramp_up seconds, for duration seconds."""
+    stats = LoadStats()
+    deadline = time.monotonic() + duration
+    names = list(scenarios)
+    weights = [scenarios[name] for name in names]
+
+    def virtual_user(number):
+        rng = random.Random(f"{seed}:{number}")
+        time.sleep(ramp_up * number / users)
+        if time.monotonic() >= deadline:
+            return
+        try:
+            start = time.perf_counter()
+            user = user_factory()
+            stats.record("start_user", time.perf_counter() - start, failed=False)
+        except Exception:
+            stats.record("start_user", time.perf_counter() - start, failed=True)
+            return
+        stats.user_started()
+        iteration = 0
+        try:
+            while time.monotonic() < deadline:
+                name = rng.choices(names, weights)[0]
+                data = data_factory.for_test(f"vu{number}:{iteration}")
+                start = time.perf_counter()
+                try:
+                    SCENARIOS[name](StepTimer(user, stats), data, rng)
+                    stats.record(f"scenario:{name}", time.perf_counter() - start, failed=False)
+                except Exception:
+                    stats.record(f"scenario:{name}", time.perf_counter() - start, failed=True)
+                iteration += 1
+                if think_time:
+                    time.sleep(rng.uniform(0, 2 * think_time))
+        finally:
+            stats.user_stopped()
+            user.close()
+
+    threads = [threading.Thread(target=virtual_user, args=(number,), daemon=True) for number in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - stats.started
+    return {
+        'users': users, 'duration_s': duration, 'ramp_up_s': ramp_up, 'elapsed_s': round(elapsed, 1),
+        'scenarios': scenarios, 'seed': seed,
+        'steps': stats.summary(elapsed),
+        'timeline': [dict(second=second, **bucket) for second, bucket in sorted(stats.timeline.items())],
+    }
+
+
+def browser_user_factory(config, base_url, locators):
+    """Return a factory launching one headless browser per virtual user."""
+    from utils.browser_profiles import BrowserProfile
+    from utils.driver_pool import create_driver
+    from utils.driver_resolver import DriverResolver
+
+    driver_path = DriverResolver.from_config(config).resolve()['path']
+    profile = BrowserProfile.from_config(config)
+    profile.headless = True
+    return lambda: BrowserUser(create_driver(driver_path, profile), base_url, locators)
+
+
+def format_table(result):
+    """Return the per-step results as a fixed-width text table."""
+    columns = ("step", "count", "errors", "error_rate", "throughput_per_s", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    lines = ["".join(f"{column:>18}" if index else f"{column:<24}" for index, column in enumerate(columns))]
+    for row in result['steps']:
+        lines.append("".join(f"{row[column]!s:>18}" if index else f"{row[column]:<24}" for index, column in enumerate(columns)))
+    return "\n".join(lines)
+
+
+def parse_weights(values):
+    weights = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}'. Available: {sorted(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the shop journeys as weighted scenarios on concurrent virtual users.")
+    parser.add_argument("--users", type=int, default=10, help="number of concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to generate load (ramp-up included)")
+    parser.add_argument("--ramp-up", type=float, default=10, help="seconds over which users are started evenly")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between scenarios per user")
+    parser.add_argument("--driver", choices=("http", "browser"), default="http")
+    parser.add_argument("--scenario", action="append", default=[], metavar="NAME=WEIGHT",
+                        help=f"scenario and weight, repeatable; available: {', '.join(SCENARIOS)} (default browse=3, checkout=1)")
+    parser.add_argument("--base-url", default="local", help="shop to load; 'local' starts the stand-in shop")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join("reports", "load"), help="directory for the JSON results")
+    args = parser.parse_args()
+
+    with open("utils/config.yaml", 'r') as file:
+        config = yaml.safe_load(file)
+    with open("utils/data.yaml", 'r') as file:
+        base_data = yaml.safe_load(file)
+    scenarios = parse_weights(args.scenario) if args.scenario else {'browse': 3, 'checkout': 1}
+
+    server = None
+    base_url = args.base_url
+    if base_url == "local":
+        server = LocalShopServer(seed_users=seed_users_from_data()).start()
+        base_url = server.base_url
+    try:
+        if args.driver == "browser":
+            from utils.locator_compiler import compile_locators
+            with open("utils/locators.yaml", 'r') as file:
+                locators = compile_locators(yaml.safe_load(file))
+            user_factory = browser_user_factory(config, base_url, locators)
+        else:
+            user_factory = lambda: HttpUser(base_url)
+        print(f"Load: {args.users} {args.driver} users on {base_url} for {args.duration:.0f}s "
+              f"(ramp-up {args.ramp_up:.0f}s), scenarios {scenarios}")
+        result = run_load(user_factory, scenarios, DataFactory(base_data, args.seed, namespace="load"), args.users,
+                          args.duration, args.ramp_up, args.think_time, args.seed)
+    finally:
+        if server is not None:
+            server.stop()
+
+    result.update({'driver': args.driver, 'base_url': args.base_url})
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"load_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w') as file:
+        json.dump(result, file, indent=2)
+    print(format_table(result))
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
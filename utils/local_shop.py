@@ -0,0 +1,599 @@
+import argparse
+import json
+import re
+import secrets
+import threading
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import yaml
+
+
+# Local stand-in for practice.automationtesting.in. It reproduces only the DOM contracts that
+# utils/locators.yaml and the page objects rely on, keeps all state in memory, and can be
+# reset with GET/POST /__reset__. Start it with `python -m utils.local_shop --port 8080`, or set
+# base_url: "local" in config.yaml to get one server per test worker.
+
+SESSION_COOKIE = "wp_woocommerce_session_local"
+AUTH_COOKIE = "wordpress_logged_in_local"
+
+CATEGORIES = [
+    ("android", "Android"),
+    ("html", "HTML"),
+    ("javascript", "JavaScript"),
+    ("selenium", "selenium"),
+]
+
+PRODUCTS = [
+    {'id': 169, 'name': "Android Quick Start Guide", 'category': "android", 'price': 600.00, 'in_stock': True},
+    {'id': 181, 'name': "HTML5 Forms", 'category': "html", 'price': 280.00, 'in_stock': True},
+    {'id': 182, 'name': "HTML5 WebApp Develpment", 'category': "html", 'price': 180.00, 'in_stock': True},
+    {'id': 163, 'name': "Thinking in HTML", 'category': "html", 'price': 400.00, 'in_stock': True},
+    {'id': 165, 'name': "Functional Programming in JS", 'category': "javascript", 'price': 250.00, 'in_stock': True},
+    {'id': 180, 'name': "JS Data Structures and Algorithm", 'category': "javascript", 'price': 150.00, 'in_stock': True},
+    {'id': 166, 'name': "Mastering JavaScripts", 'category': "javascript", 'price': 350.00, 'in_stock': True},
+    {'id': 160, 'name': "Selenium Ruby", 'category': "selenium", 'price': 500.00, 'in_stock': False},
+]
+
+# Sort options of the catalogue pages; the listing itself is not reordered
+ORDERING = [("menu_order", "Default sorting"), ("popularity", "Sort by popularity"), ("rating", "Sort by average rating"),
+            ("date", "Sort by newness"), ("price", "Sort by price: low to high"), ("price-desc", "Sort by price: high to low")]
+
+COUNTRIES = [("IN", "India"), ("OM", "Oman"), ("US", "United States (US)"), ("GB", "United Kingdom (UK)"),
+             ("HT", "Haiti"), ("DE", "Germany")]
+
+ADDRESS_FIELDS = {
+    'billing': [
+        ('first_name', "First Name", True), ('last_name', "Last Name", True), ('company', "Company Name", False),
+        ('email', "Email Address", True), ('phone', "Phone", True), ('country', "Country", True),
+        ('address_1', "Address", True), ('address_2', "Address 2", False), ('city', "Town / City", True),
+        ('state', "State / County", False), ('postcode', "Postcode / ZIP", True),
+    ],
+    'shipping': [
+        ('first_name', "First Name", True), ('last_name', "Last Name", True), ('company', "Company Name", False),
+        ('country', "Country", True), ('address_1', "Address", True), ('address_2', "Address 2", False),
+        ('city', "Town / City", True), ('state', "State / County", False), ('postcode', "Postcode / ZIP", True),
+    ],
+}
+
+
+def format_price(amount):
+    return (f'<span class="woocommerce-Price-amount amount"><span class="woocommerce-Price-currencySymbol">'
+            f'&#8377;</span>{amount:,.2f}</span>')
+
+
+class ShopState:
+    """All server-side data: accounts, sessions, carts and addresses."""
+
+    def __init__(self, seed_users=None):
+        self.lock = threading.Lock()
+        self.seed_users = dict(seed_users or {})
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.users = {email: {'password': password, 'billing': {}, 'shipping': {}}
+                          for email, password in self.seed_users.items()}
+            self.logins = {}
+            self.carts = {}
+            self.nonces = set()
+
+    def new_nonce(self):
+        nonce = secrets.token_hex(5)
+        with self.lock:
+            self.nonces.add(nonce)
+        return nonce
+
+    def check_nonce(self, nonce):
+        with self.lock:
+            return nonce in self.nonces
+
+    def cart_key(self, session_id, user):
+        return f"user:{user}" if user else f"session:{session_id}"
+
+
+LAYOUT_SCRIPT = """
+document.addEventListener('DOMContentLoaded', function () {
+    // Password strength meter (wc-password-strength-meter)
+    var password = document.getElementById('reg_password');
+    if (password) {
+        var form = password.form;
+        var submit = form.querySelector('input[name=register]');
+        var update = function () {
+            var meter = form.querySelector('.woocommerce-password-strength');
+            if (!password.value) {
+                if (meter) { meter.remove(); }
+                submit.disabled = false;
+                return;
+            }
+            var value = password.value, classes = 0;
+            [/[a-z]/, /[A-Z]/, /\\d/, /[^\\w]/].forEach(function (p) { if (p.test(value)) { classes++; } });
+            var strength = value.length < 6 ? 0 : (value.length >= 8 && classes >= 3 ? 4 : (value.length >= 8 && classes >= 2 ? 3 : 2));
+            var levels = [['short', 'Very weak - Please enter a stronger password.'], ['short', 'Very weak - Please enter a stronger password.'],
+                          ['bad', 'Weak - Please enter a stronger password.'], ['good', 'Medium'], ['strong', 'Strong']];
+            if (!meter) {
+                meter = document.createElement('div');
+                password.parentNode.insertBefore(meter, password.nextSibling);
+            }
+            meter.className = 'woocommerce-password-strength ' + levels[strength][0];
+            meter.textContent = levels[strength][1];
+            submit.disabled = strength < 3;
+        };
+        password.addEventListener('keyup', update);
+        password.addEventListener('change', update);
+    }
+
+    // select2 v3 country dropdowns
+    document.querySelectorAll('.select2-container').forEach(function (container) {
+        var select = document.getElementById(container.id.replace('s2id_', ''));
+        var label = container.querySelector('.select2-chosen');
+        var drop = document.getElementById('select2-drop');
+        var search = document.getElementById('s2id_autogen1_search');
+        select.addEventListener('change', function () {
+            label.textContent = select.options[select.selectedIndex].text;
+        });
+        container.addEventListener('click', function () {
+            drop.dataset.target = select.id;
+            drop.style.display = 'block';
+            search.value = '';
+            search.focus();
+        });
+    });
+    var search = document.getElementById('s2id_autogen1_search');
+    if (search) {
+        search.addEventListener('keydown', function (event) {
+            if (event.key !== 'Enter') { return; }
+            event.preventDefault();
+            var drop = document.getElementById('select2-drop');
+            var select = document.getElementById(drop.dataset.target);
+            var wanted = search.value.trim().toLowerCase();
+            var option = Array.prototype.find.call(select.options, function (o) { return o.text.toLowerCase().indexOf(wanted) === 0; });
+            if (option) {
+                select.value = option.value;
+                select.dispatchEvent(new Event('change', {bubbles: true}));
+            }
+            drop.style.display = 'none';
+        });
+    }
+
+    // AJAX add to cart
+    document.querySelectorAll('.ajax_add_to_cart').forEach(function (button) {
+        button.addEventListener('click', function (event) {
+            event.preventDefault();
+            button.classList.add('loading');
+            var body = new URLSearchParams({product_id: button.dataset.product_id, quantity: '1'});
+            fetch('/?wc-ajax=add_to_cart', {method: 'POST', body: body, credentials: 'same-origin'})
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    button.classList.remove('loading');
+                    if (data.error) { return; }
+                    button.classList.add('added');
+                    document.querySelector('.wpmenucart-contents').innerHTML = data.fragments.cart;
+                    if (!button.parentNode.querySelector('.added_to_cart')) {
+                        var view = document.createElement('a');
+                        view.href = '/basket/';
+                        view.className = 'added_to_cart wc-forward';
+                        view.title = 'View Basket';
+                        view.textContent = 'View Basket';
+                        button.parentNode.appendChild(view);
+                    }
+                });
+        });
+    });
+});
+"""
+
+
+class ShopHandler(BaseHTTPRequestHandler):
+    """Serves the shop pages; state lives on self.server.state."""
+
+    server_version = "LocalShop/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # Request plumbing
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        self.query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.form = {}
+        if method == "POST":
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length).decode('utf-8')
+            self.form = {key: values[0] for key, values in parse_qs(body, keep_blank_values=True).items()}
+        cookies = SimpleCookie(self.headers.get('Cookie') or "")
+        self.new_cookies = {}
+        self.session_id = cookies[SESSION_COOKIE].value if SESSION_COOKIE in cookies else None
+        if not self.session_id:
+            self.session_id = secrets.token_hex(8)
+            self.new_cookies[SESSION_COOKIE] = self.session_id
+        token = cookies[AUTH_COOKIE].value if AUTH_COOKIE in cookies else None
+        self.user = self.state.logins.get(token)
+
+        path = url.path if url.path.endswith('/') else url.path + '/'
+        if path == '/__reset__/':
+            self.state.reset()
+            return self._send_json({'reset': True})
+        if self.query.get('wc-ajax') == 'add_to_cart':
+            return self._ajax_add_to_cart()
+        if 'add-to-cart' in self.query:
+            self._add_to_cart(self.query['add-to-cart'])
+            return self._redirect(url.path)
+
+        routes = [
+            (r"^/$", self._home),
+            (r"^/shop/$", self._shop),
+            (r"^/product-category/([\w-]+)/$", self._shop),
+            (r"^/product/([\w-]+)/$", self._product),
+            (r"^/basket/$", self._basket),
+            (r"^/my-account/$", self._my_account),
+            (r"^/my-account/customer-logout/$", self._logout),
+            (r"^/my-account/edit-address/$", self._addresses),
+            (r"^/my-account/edit-address/(billing|shipping)/$", self._edit_address),
+        ]
+        for pattern, handler in routes:
+            match = re.match(pattern, path)
+            if match:
+                return handler(method, *match.groups())
+        self._send_page("Page not found", "<h1>Oops! That page can&rsquo;t be found.</h1>", status=404)
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _send(self, status, content_type, body, headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in self.new_cookies.items():
+            expiry = "; Max-Age=0" if value == "" else ""
+            self.send_header('Set-Cookie', f"{name}={value}; Path=/; HttpOnly{expiry}")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, payload):
+        self._send(200, 'application/json', json.dumps(payload))
+
+    def _redirect(self, location):
+        self._send(302, 'text/html; charset=utf-8', "", {'Location': location})
+
+    def _send_page(self, title, content, status=200, sidebar=""):
+        cart = self._cart()
+        layout = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{escape(title)} &#8211; Automation Practice Site</title>
+<script>{LAYOUT_SCRIPT}</script>
+<style>.select2-drop {{ display: none; }} .outofstock .add_to_cart_button {{ display: none; }}</style></head>
+<body>
+<header id="header">
+  <nav id="main-nav-wrap"><ul id="main-nav" class="main-nav">
+    <li id="menu-item-40" class="menu-item"><a href="/shop/">Shop</a></li>
+    <li id="menu-item-50" class="menu-item"><a href="/my-account/">My Account</a></li>
+    <li id="menu-item-60" class="wpmenucartli menu-item"><a class="wpmenucart-contents" href="/basket/" title="View your shopping cart">{self._cart_fragment(cart)}</a></li>
+  </ul></nav>
+</header>
+<div id="content"><div class="page-content entry-content">{content}</div>{sidebar}</div>
+<div id="select2-drop" class="select2-drop"><div class="select2-search"><input type="text" autocomplete="off" class="select2-input" id="s2id_autogen1_search"></div></div>
+</body></html>"""
+        self._send(status, 'text/html; charset=utf-8', layout)
+
+    # Cart
+
+    def _cart(self):
+        return self.state.carts.setdefault(self.state.cart_key(self.session_id, self.user), {})
+
+    @staticmethod
+    def _cart_fragment(cart):
+        count = sum(cart.values())
+        total = sum(product['price'] * cart.get(product['id'], 0) for product in PRODUCTS)
+        return f'<span class="cartcontents">{count} Item{"" if count == 1 else "s"}</span><span class="amount">&#8377;{total:,.2f}</span>'
+
+    def _add_to_cart(self, product_id, quantity=1):
+        product = next((product for product in PRODUCTS if str(product['id']) == str(product_id)), None)
+        if product is None or not product['in_stock']:
+            return False
+        with self.state.lock:
+            cart = self._cart()
+            cart[product['id']] = cart.get(product['id'], 0) + int(quantity)
+        return True
+
+    def _ajax_add_to_cart(self):
+        if not self._add_to_cart(self.form.get('product_id') or self.query.get('product_id'), self.form.get('quantity', 1)):
+            return self._send_json({'error': True})
+        self._send_json({'fragments': {'cart': self._cart_fragment(self._cart())}, 'cart_hash': secrets.token_hex(8)})
+
+    def _basket(self, method):
+        cart = self._cart()
+        if 'remove_item' in self.query:
+            with self.state.lock:
+                cart.pop(int(self.query['remove_item']), None)
+            return self._redirect('/basket/')
+        if not cart:
+            return self._send_page("Basket", '<p class="cart-empty">Your basket is currently empty.</p>')
+        rows = ""
+        subtotal = 0.0
+        for product in PRODUCTS:
+            quantity = cart.get(product['id'])
+            if not quantity:
+                continue
+            line_total = product['price'] * quantity
+            subtotal += line_total
+            rows += f"""<tr class="cart_item">
+<td class="product-remove"><a href="/basket/?remove_item={product['id']}" class="remove" title="Remove this item" data-product_id="{product['id']}">&times;</a></td>
+<td class="product-name"><a href="/product/{product['id']}/">{escape(product['name'])}</a></td>
+<td class="product-price">{format_price(product['price'])}</td>
+<td class="product-quantity"><div class="quantity"><input type="number" step="1" min="0" name="cart[{product['id']}][qty]" value="{quantity}" title="Qty" class="input-text qty text" size="4"></div></td>
+<td class="product-subtotal">{format_price(line_total)}</td></tr>"""
+        content = f"""<form class="woocommerce-cart-form" action="/basket/" method="post">
+<table class="shop_table shop_table_responsive cart" cellspacing="0">
+<thead><tr><th class="product-remove">&nbsp;</th><th class="product-name">Product</th><th class="product-price">Price</th><th class="product-quantity">Quantity</th><th class="product-subtotal">Total</th></tr></thead>
+<tbody>{rows}</tbody></table></form>
+<div class="cart-collaterals"><div class="cart_totals"><h2>Basket Totals</h2><table cellspacing="0" class="shop_table">
+<tr class="cart-subtotal"><th>Subtotal</th><td>{format_price(subtotal)}</td></tr>
+<tr class="order-total"><th>Total</th><td><strong>{format_price(subtotal)}</strong></td></tr>
+</table></div></div>"""
+        self._send_page("Basket", content)
+
+    # Catalogue
+
+    def _home(self, method):
+        self._send_page("Home", "<h1>Automation Practice Site</h1>")
+
+    def _shop(self, method, category=None):
+        products = [product for product in PRODUCTS if category is None or product['category'] == category]
+        items = ""
+        for product in products:
+            stock = "instock" if product['in_stock'] else "outofstock"
+            items += f"""<li class="post-{product['id']} product type-product status-publish product_cat-{product['category']} {stock}">
+<a href="/product/{product['id']}/" class="woocommerce-LoopProduct-link"><h3>{escape(product['name'])}</h3>
+<span class="price">{format_price(product['price'])}</span></a>
+<a rel="nofollow" href="/shop/?add-to-cart={product['id']}" data-quantity="1" data-product_id="{product['id']}" class="button product_type_simple add_to_cart_button ajax_add_to_cart">{"Add to basket" if product['in_stock'] else "Read more"}</a></li>"""
+        categories = "".join(
+            f'<li class="cat-item cat-item-{slug}"><a href="/product-category/{slug}/">{name}</a></li>'
+            for slug, name in CATEGORIES)
+        sidebar = f'<aside id="sidebar"><div class="widget woocommerce widget_product_categories"><ul class="product-categories">{categories}</ul></div></aside>'
+        title = next((name for slug, name in CATEGORIES if slug == category), "Shop")
+        ordering = '<form class="woocommerce-ordering" method="get"><select name="orderby" class="orderby">' + "".join(
+            f'<option value="{value}"{" selected" if value == "menu_order" else ""}>{label}</option>'
+            for value, label in ORDERING) + '</select></form>'
+        self._send_page(title, f'<h1 class="page-title">{title}</h1>{ordering}<ul class="products masonry-done">{items}</ul>', sidebar=sidebar)
+
+    def _product(self, method, product_id):
+        product = next((product for product in PRODUCTS if str(product['id']) == product_id), None)
+        if product is None:
+            return self._send_page("Page not found", "<h1>Oops! That page can&rsquo;t be found.</h1>", status=404)
+        self._send_page(product['name'], f'<div class="product"><h1 class="product_title entry-title">{escape(product["name"])}</h1>'
+                                         f'<p class="price">{format_price(product["price"])}</p></div>')
+
+    # Account
+
+    def _login_forms(self, errors=(), email="", username=""):
+        error_html = ""
+        if errors:
+            error_html = '<ul class="woocommerce-error">' + "".join(f"<li>{error}</li>" for error in errors) + "</ul>"
+        return f"""{error_html}
+<div class="u-columns col2-set" id="customer_login">
+<div class="u-column1 col-1"><h2>Login</h2>
+<form method="post" class="login">
+<p class="form-row form-row-wide"><label for="username">Username or email address <span class="required">*</span></label>
+<input type="text" class="input-text" name="username" id="username" value="{escape(username)}"></p>
+<p class="form-row form-row-wide"><label for="password">Password <span class="required">*</span></label>
+<input class="input-text" type="password" name="password" id="password"></p>
+<p class="form-row"><input type="hidden" id="woocommerce-login-nonce" name="woocommerce-login-nonce" value="{self.state.new_nonce()}">
+<input type="hidden" name="_wp_http_referer" value="/my-account/">
+<input type="submit" class="woocommerce-Button button" name="login" value="Login"></p>
+</form></div>
+<div class="u-column2 col-2"><h2>Register</h2>
+<form method="post" class="register">
+<p class="woocommerce-FormRow woocommerce-FormRow--wide form-row form-row-wide"><label for="reg_email">Email address <span class="required">*</span></label>
+<input type="email" class="woocommerce-Input woocommerce-Input--text input-text" name="email" id="reg_email" value="{escape(email)}"></p>
+<p class="woocommerce-FormRow woocommerce-FormRow--wide form-row form-row-wide"><label for="reg_password">Password <span class="required">*</span></label>
+<input type="password" class="woocommerce-Input woocommerce-Input--text input-text" name="password" id="reg_password"></p>
+<p class="woocomerce-FormRow form-row"><input type="hidden" id="woocommerce-register-nonce" name="woocommerce-register-nonce" value="{self.state.new_nonce()}">
+<input type="hidden" name="_wp_http_referer" value="/my-account/">
+<input type="submit" class="woocommerce-Button button" name="register" value="Register"></p>
+</form></div></div>"""
+
+    def _account_navigation(self):
+        links = [("dashboard", "/my-account/", "Dashboard"), ("orders", "/my-account/orders/", "Orders"),
+                 ("edit-address", "/my-account/edit-address/", "Addresses"),
+                 ("edit-account", "/my-account/edit-account/", "Account Details"),
+                 ("customer-logout", "/my-account/customer-logout/", "Logout")]
+        items = "".join(
+            f'<li class="woocommerce-MyAccount-navigation-link woocommerce-MyAccount-navigation-link--{slug}"><a href="{href}">{label}</a></li>'
+            for slug, href, label in links)
+        return f'<nav class="woocommerce-MyAccount-navigation"><ul>{items}</ul></nav>'
+
+    def _account_page(self, content):
+        self._send_page("My Account", f'<h1>My Account</h1><div class="woocommerce">{self._account_navigation()}'
+                                      f'<div class="woocommerce-MyAccount-content">{content}</div></div>')
+
+    def _log_in(self, email):
+        token = secrets.token_hex(16)
+        with self.state.lock:
+            self.state.logins[token] = email
+            # The guest cart follows the user after logging in, as in WooCommerce
+            guest_cart = self.state.carts.pop(self.state.cart_key(self.session_id, None), {})
+            user_cart = self.state.carts.setdefault(self.state.cart_key(self.session_id, email), {})
+            for product_id, quantity in guest_cart.items():
+                user_cart[product_id] = user_cart.get(product_id, 0) + quantity
+        self.new_cookies[AUTH_COOKIE] = token
+        self.user = email
+
+    def _my_account(self, method):
+        if method == "POST" and 'login' in self.form:
+            if not self.state.check_nonce(self.form.get('woocommerce-login-nonce')):
+                return self._send_page("My Account", "<h1>My Account</h1>" + self._login_forms(["Nonce verification failed."]))
+            return self._handle_login()
+        if method == "POST" and 'register' in self.form:
+            if not self.state.check_nonce(self.form.get('woocommerce-register-nonce')):
+                return self._send_page("My Account", "<h1>My Account</h1>" + self._login_forms(["Nonce verification failed."]))
+            return self._handle_register()
+        if not self.user:
+            return self._send_page("My Account", f"<h1>My Account</h1>{self._login_forms()}")
+        name = escape(self.user.split('@')[0])
+        self._account_page(f'<p>Hello <strong>{name}</strong> (not {name}? <a href="/my-account/customer-logout/">Sign out</a>)</p>'
+                           '<p>From your account dashboard you can view your recent orders, manage your shipping and billing addresses and edit your password and account details.</p>')
+
+    def _handle_login(self):
+        username = self.form.get('username', "").strip()
+        password = self.form.get('password', "")
+        user = self.state.users.get(username)
+        if not username:
+            errors = ["<strong>Error:</strong> Username is required."]
+        elif not password:
+            errors = ["<strong>Error:</strong> Password is required."]
+        elif user is None:
+            errors = ['<strong>ERROR</strong>: Invalid username. <a href="/my-account/lost-password/">Lost your password?</a>']
+        elif user['password'] != password:
+            errors = [f'<strong>ERROR</strong>: The password you entered for the username <strong>{escape(username)}</strong> is incorrect. '
+                      '<a href="/my-account/lost-password/">Lost your password?</a>']
+        else:
+            self._log_in(username)
+            return self._redirect('/my-account/')
+        self._send_page("My Account", f"<h1>My Account</h1>{self._login_forms(errors, username=username)}")
+
+    def _handle_register(self):
+        email = self.form.get('email', "").strip()
+        password = self.form.get('password', "")
+        if not re.match(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", email):
+            errors = ["<strong>Error:</strong> Please provide a valid email address."]
+        elif email in self.state.users:
+            errors = ["<strong>Error:</strong> An account is already registered with your email address. Please login."]
+        elif not password:
+            errors = ["<strong>Error:</strong> Please enter an account password."]
+        else:
+            with self.state.lock:
+                self.state.users[email] = {'password': password, 'billing': {'email': email}, 'shipping': {}}
+            self._log_in(email)
+            return self._redirect('/my-account/')
+        self._send_page("My Account", f"<h1>My Account</h1>{self._login_forms(errors, email=email)}")
+
+    def _logout(self, method):
+        self.new_cookies[AUTH_COOKIE] = ""
+        self.user = None
+        self._redirect('/my-account/')
+
+    def _addresses(self, method, message=""):
+        if not self.user:
+            return self._redirect('/my-account/')
+        account = self.state.users[self.user]
+        columns = ""
+        for column, kind in (("u-column1 col-1", "billing"), ("u-column2 col-2", "shipping")):
+            address = account[kind]
+            summary = "<br>".join(escape(address[key]) for key in ('first_name', 'last_name', 'address_1', 'city', 'postcode') if address.get(key)) \
+                or "You have not set up this type of address yet."
+            columns += (f'<div class="{column} woocommerce-Address"><header class="woocommerce-Address-title title">'
+                        f'<h3>{kind.title()} Address</h3><a href="/my-account/edit-address/{kind}" class="edit">Edit</a></header>'
+                        f'<address>{summary}</address></div>')
+        self._account_page(f'{message}<p>The following addresses will be used on the checkout page by default.</p>'
+                           f'<div class="u-columns woocommerce-Addresses col2-set addresses">{columns}</div>')
+
+    def _edit_address(self, method, kind):
+        if not self.user:
+            return self._redirect('/my-account/')
+        account = self.state.users[self.user]
+        errors = []
+        values = dict(account[kind])
+        values.setdefault('country', "IN")
+        if method == "POST":
+            values = {key: self.form.get(f"{kind}_{key}", "").strip() for key, _, _ in ADDRESS_FIELDS[kind]}
+            errors = [f"<strong>{label}</strong> is a required field."
+                      for key, label, required in ADDRESS_FIELDS[kind] if required and not values[key]]
+            if not errors:
+                with self.state.lock:
+                    account[kind] = values
+                return self._addresses(method, '<div class="woocommerce-message">Address changed successfully.</div>')
+
+        fields = ""
+        for key, label, required in ADDRESS_FIELDS[kind]:
+            field_id = f"{kind}_{key}"
+            value = escape(values.get(key, ""))
+            required_mark = ' <abbr class="required" title="required">*</abbr>' if required else ""
+            if key == 'country':
+                options = "".join(f'<option value="{code}"{" selected" if code == values.get("country") else ""}>{name}</option>'
+                                  for code, name in COUNTRIES)
+                chosen = dict(COUNTRIES).get(values.get('country'), "Select a country")
+                control = (f'<div class="select2-container country_to_state country_select" id="s2id_{field_id}">'
+                           f'<a href="javascript:void(0)" class="select2-choice"><span class="select2-chosen">{chosen}</span></a></div>'
+                           f'<select name="{field_id}" id="{field_id}" class="country_to_state country_select" style="display: none;">{options}</select>')
+            else:
+                input_type = {'email': "email", 'phone': "tel"}.get(key, "text")
+                control = f'<input type="{input_type}" class="input-text" name="{field_id}" id="{field_id}" value="{value}">'
+            fields += f'<p class="form-row form-row-wide" id="{field_id}_field"><label for="{field_id}">{label}{required_mark}</label>{control}</p>'
+
+        error_html = ('<ul class="woocommerce-error">' + "".join(f"<li>{error}</li>" for error in errors) + "</ul>") if errors else ""
+        self._account_page(f'{error_html}<form method="post"><h3>{kind.title()} Address</h3>'
+                           f'<div class="woocommerce-address-fields"><div class="woocommerce-address-fields__field-wrapper">{fields}</div>'
+                           f'<p><input type="submit" class="button" name="save_address" value="Save Address">'
+                           f'<input type="hidden" name="action" value="edit_address"></p></div></form>')
+
+
+class LocalShopServer(ThreadingHTTPServer):
+    """HTTP server holding one ShopState; runs in a background thread when started with start()."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, seed_users=None, verbose=False):
+        super().__init__((host, port), ShopHandler)
+        self.state = ShopState(seed_users)
+        self.verbose = verbose
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, name="local-shop", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def seed_users_from_data(data_file="utils/data.yaml"):
+    """Accounts the suite expects to exist: the login user and the 'existing' user."""
+    with open(data_file, 'r') as file:
+        data = yaml.safe_load(file)
+    users = {}
+    for section, user_key in (('login', 'username'), ('existing_user', 'email')):
+        if section in data:
+            users[data[section][user_key]] = data[section]['password']
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local stand-in shop.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data", default="utils/data.yaml", help="data file providing the seeded accounts")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    server = LocalShopServer(args.host, args.port, seed_users_from_data(args.data), verbose=args.verbose)
+    print(f"Local shop running at {server.base_url} (reset with {server.base_url}__reset__)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+# Compiles locators.yaml once per session: XPath syntax errors are reported up front and
+# expressions with an exact CSS equivalent are translated, since Chrome matches CSS faster.
+# Run `python -m utils.locator_compiler [--benchmark URL]` to see the table and timings.
+import argparse
+import re
+import statistics
+import time
+
+import yaml
+from selenium.webdriver.common.by import By
+
+
+class LocatorError(Exception):
+    """Raised when one or more locators in locators.yaml are not valid XPath."""
+
+
+AXES = {
+    'ancestor', 'ancestor-or-self', 'attribute', 'child', 'descendant', 'descendant-or-self',
+    'following', 'following-sibling', 'namespace', 'parent', 'preceding', 'preceding-sibling', 'self',
+}
+NODE_TYPES = {'comment', 'text', 'processing-instruction', 'node'}
+OPERATOR_NAMES = {'and', 'or', 'div', 'mod'}
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<literal>"[^"]*"|'[^']*')
+  | (?P<number>\d+(?:\.\d*)?|\.\d+)
+  | (?P<symbol>//|::|\.\.|!=|<=|>=|[/\[\]()@,|=<>+\-*.$])
+  | (?P<name>[A-Za-z_][\w.\-]*(?::[A-Za-z_][\w.\-]*)?)
+""", re.VERBOSE)
+
+CSS_IDENTIFIER = re.compile(r"^[A-Za-z_][\w-]*$")
+
+
+def tokenize(expression):
+    """Split an XPath expression into (kind, value) tokens."""
+    tokens = []
+    position = 0
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if not match:
+            remainder = expression[position:]
+            if remainder[0] in "'\"":
+                raise LocatorError(f"unterminated string starting at position {position}")
+            raise LocatorError(f"unexpected character {remainder[0]!r} at position {position}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        value = match.group(kind)
+        # '*' and the operator names are operators only after something that can end an operand
+        if kind in ('name', 'symbol') and value in OPERATOR_NAMES | {'*'} and tokens:
+            previous_kind, previous = tokens[-1]
+            if previous_kind != 'operator' and previous not in ('@', '::', '(', '[', ',', '/', '//', '|'):
+                kind = 'operator'
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for XPath 1.0 producing a small tuple-based AST."""
+
+    def __init__(self, expression):
+        self.tokens = tokenize(expression)
+        self.index = 0
+
+    def parse(self):
+        if not self.tokens:
+            raise LocatorError("empty expression")
+        node = self.parse_binary(0)
+        if self.index != len(self.tokens):
+            raise LocatorError(f"unexpected {self.peek()[1]!r} after a complete expression")
+        return node
+
+    def peek(self, offset=0):
+        index = self.index + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None:
+            raise LocatorError(f"expected {value!r} but the expression ended" if value else "unexpected end of expression")
+        if value is not None and token[1] != value:
+            raise LocatorError(f"expected {value!r} but found {token[1]!r}")
+        self.index += 1
+        return token
+
+    # Binary operators by precedence, lowest first
+    LEVELS = [('or',), ('and',), ('=', '!='), ('<', '>', '<=', '>='), ('+', '-'), ('*', 'div', 'mod')]
+
+    def parse_binary(self, level):
+        if level == len(self.LEVELS):
+            return self.parse_unary()
+        node = self.parse_binary(level + 1)
+        while self.peek()[1] in self.LEVELS[level] and (self.peek()[0] in ('operator', 'symbol')):
+            if self.peek()[0] == 'symbol' and self.peek()[1] == '*':
+                break
+            operator = self.take()[1]
+            node = (operator, node, self.parse_binary(level + 1))
+        return node
+
+    def parse_unary(self):
+        if self.peek()[1] == '-':
+            self.take()
+            return ('negate', self.parse_unary())
+        node = self.parse_path_expr()
+        while self.peek()[1] == '|':
+            self.take()
+            node = ('|', node, self.parse_path_expr())
+        return node
+
+    def parse_path_expr(self):
+        kind, value = self.peek()
+        next_value = self.peek(1)[1]
+        is_function = kind == 'name' and next_value == '(' and value not in NODE_TYPES
+        if kind in ('literal', 'number') or value in ('(', '$') or is_function:
+            node = self.parse_primary()
+            predicates = self.parse_predicates()
+            if predicates:
+                node = ('filter', node, predicates)
+            if self.peek()[1] in ('/', '//'):
+                node = ('path', node, self.parse_relative_path(self.take()[1]))
+            return node
+        return self.parse_location_path()
+
+    def parse_primary(self):
+        kind, value = self.take()
+        if kind == 'literal':
+            return ('literal', value[1:-1])
+        if kind == 'number':
+            return ('number', float(value))
+        if value == '$':
+            return ('variable', self.take()[1])
+        if value == '(':
+            node = self.parse_binary(0)
+            self.take(')')
+            return node
+        self.take('(')
+        arguments = []
+        if self.peek()[1] != ')':
+            arguments.append(self.parse_binary(0))
+            while self.peek()[1] == ',':
+                self.take()
+                arguments.append(self.parse_binary(0))
+        self.take(')')
+        return ('call', value, arguments)
+
+    def parse_location_path(self):
+        value = self.peek()[1]
+        if value == '/':
+            self.take()
+            # A lone '/' selects the document root
+            if self.peek()[0] is None or self.peek()[1] in (']', ')', ',', '|') or self.peek()[0] == 'operator':
+                return ('location', [])
+            return ('location', self.parse_relative_path('/'))
+        if value == '//':
+            self.take()
+            return ('location', self.parse_relative_path('//'))
+        return ('location', self.parse_relative_path(None))
+
+    def parse_relative_path(self, separator):
+        steps = [(separator, self.parse_step())]
+        while self.peek()[1] in ('/', '//'):
+            separator = self.take()[1]
+            steps.append((separator, self.parse_step()))
+        return steps
+
+    def parse_step(self):
+        kind, value = self.peek()
+        if value in ('.', '..'):
+            self.take()
+            return ('self' if value == '.' else 'parent', 'node()', [])
+        axis = 'child'
+        if value == '@':
+            self.take()
+            axis = 'attribute'
+        elif kind == 'name' and self.peek(1)[1] == '::':
+            if value not in AXES:
+                raise LocatorError(f"unknown axis {value!r}")
+            axis = value
+            self.take()
+            self.take('::')
+        kind, value = self.take()
+        if value == '*':
+            node_test = '*'
+        elif kind == 'name' and value in NODE_TYPES and self.peek()[1] == '(':
+            self.take('(')
+            if value == 'processing-instruction' and self.peek()[0] == 'literal':
+                self.take()
+            self.take(')')
+            node_test = f"{value}()"
+        elif kind == 'name':
+            node_test = value
+        else:
+            raise LocatorError(f"expected a node test but found {value!r}")
+        return (axis, node_test, self.parse_predicates())
+
+    def parse_predicates(self):
+        predicates = []
+        while self.peek()[1] == '[':
+            self.take()
+            if self.peek()[1] == ']':
+                raise LocatorError("empty predicate '[]'")
+            predicates.append(self.parse_binary(0))
+            self.take(']')
+        return predicates
+
+
+def parse_xpath(expression):
+    """Parse an XPath 1.0 expression, raising LocatorError on a syntax error."""
+    return _Parser(expression).parse()
+
+
+def _css_string(value):
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _attribute_name(node):
+    """Return the name if node is a bare '@name' path, else None."""
+    if node[0] == 'location' and len(node[1]) == 1:
+        separator, (axis, name, predicates) = node[1][0]
+        if separator is None and axis == 'attribute' and name != '*' and not predicates and CSS_IDENTIFIER.match(name):
+            return name
+    return None
+
+
+def _predicate_to_css(predicate, node_test):
+    """Translate one predicate into CSS, or return None if CSS cannot express it exactly."""
+    operator = predicate[0]
+    if operator == 'and':
+        left = _predicate_to_css(predicate[1], node_test)
+        right = _predicate_to_css(predicate[2], node_test)
+        return left + right if left is not None and right is not None else None
+    if operator == '=' and predicate[2][0] == 'literal':
+        name = _attribute_name(predicate[1])
+        if name == 'id' and CSS_IDENTIFIER.match(predicate[2][1]):
+            return f"#{predicate[2][1]}"
+        return f"[{name}={_css_string(predicate[2][1])}]" if name else None
+    if operator == 'call' and predicate[1] in ('contains', 'starts-with') and len(predicate[2]) == 2:
+        name = _attribute_name(predicate[2][0])
+        value = predicate[2][1]
+        # An empty needle always matches in XPath but never in CSS
+        if name and value[0] == 'literal' and value[1]:
+            symbol = '*=' if predicate[1] == 'contains' else '^='
+            return f"[{name}{symbol}{_css_string(value[1])}]"
+        return None
+    if operator == 'location':
+        name = _attribute_name(predicate)
+        return f"[{name}]" if name else None
+    return None
+
+
+def xpath_to_css(expression):
+    """Return an equivalent CSS selector for expression, or None if there is none."""
+    node = parse_xpath(expression)
+    if node[0] != 'location' or not node[1] or node[1][0][0] != '//':
+        return None
+    selector = ""
+    for separator, (axis, node_test, predicates) in node[1]:
+        if axis != 'child' or not (node_test == '*' or CSS_IDENTIFIER.match(node_test)):
+            return None
+        step = node_test
+        for position, predicate in enumerate(predicates):
+            # A number is positional only as a predicate of its own, and only the first one counts
+            # siblings; after another predicate it counts matches, inside 'and' it is just true
+            if predicate[0] == 'number':
+                if position or node_test == '*' or predicate[1] < 1 or predicate[1] != int(predicate[1]):
+                    return None
+                step += f":nth-of-type({int(predicate[1])})"
+                continue
+            css = _predicate_to_css(predicate, node_test)
+            if css is None:
+                return None
+            step += css
+        # '*#id' reads better as '#id'
+        if step.startswith('*') and len(step) > 1:
+            step = step[1:]
+        if selector:
+            selector += " > " if separator == '/' else " "
+        selector += step
+    return selector
+
+
+def compile_locator(expression):
+    """Return a (By, value) tuple for an XPath expression, preferring CSS."""
+    css = xpath_to_css(expression)
+    return (By.CSS_SELECTOR, css) if css is not None else (By.XPATH, expression)
+
+
+def compile_locators(raw_locators):
+    """Validate and compile every locator of a parsed locators.yaml.
+
+    Plain strings become (By, value) tuples and form-schema entries get their
+    'locator' compiled. Templates containing '{...}' placeholders are validated
+    but stay strings, since they are formatted before use.
+    """
+    errors = []
+
+    def compile_entry(path, entry):
+        if isinstance(entry, dict) and 'locator' not in entry:
+            return {key: compile_entry(f"{path}.{key}", value) for key, value in entry.items()}
+        expression = entry['locator'] if isinstance(entry, dict) else entry
+        try:
+            if '{' in expression:
+                parse_xpath(re.sub(r"\{\w*\}", "placeholder", expression))
+                compiled = expression
+            else:
+                compiled = compile_locator(expression)
+        except LocatorError as e:
+            errors.append(f"{path}: {e} in {expression!r}")
+            compiled = None
+        return dict(entry, locator=compiled) if isinstance(entry, dict) else compiled
+
+    compiled = {key: compile_entry(key, value) for key, value in raw_locators.items()}
+    if errors:
+        raise LocatorError("Invalid locators in locators.yaml:\n  " + "\n  ".join(errors))
+    return compiled
+
+
+def _iter_expressions(raw_locators, path=""):
+    for key, entry in raw_locators.items():
+        name = f"{path}.{key}" if path else key
+        if isinstance(entry, dict) and 'locator' not in entry:
+            yield from _iter_expressions(entry, name)
+        else:
+            yield name, entry['locator'] if isinstance(entry, dict) else entry
+
+
+def benchmark_lookups(driver, raw_locators, rounds=50):
+    """Time find_elements for every translatable locator as XPath and as CSS on the current page."""
+    results = []
+    for name, expression in _iter_expressions(raw_locators):
+        if '{' in expression:
+            continue
+        css = xpath_to_css(expression)
+        if css is None:
+            continue
+        timings = {}
+        for by, value in ((By.XPATH, expression), (By.CSS_SELECTOR, css)):
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                driver.find_elements(by, value)
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[by] = statistics.median(samples)
+        results.append((name, timings[By.XPATH], timings[By.CSS_SELECTOR]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate locators.yaml and show the XPath to CSS translation.")
+    parser.add_argument("--locators", default="utils/locators.yaml")
+    parser.add_argument("--benchmark", metavar="URL", help="time XPath vs CSS lookups on this page")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    with open(args.locators, 'r') as file:
+        raw_locators = yaml.safe_load(file)
+    compiled = compile_locators(raw_locators)
+
+    for name, expression in _iter_expressions(raw_locators):
+        css = None if '{' in expression else xpath_to_css(expression)
+        print(f"{name}: {'CSS  ' + css if css else 'XPATH ' + expression}")
+    translated = sum(1 for _, expression in _iter_expressions(raw_locators)
+                     if '{' not in expression and xpath_to_css(expression))
+    print(f"\n{translated} of {sum(1 for _ in _iter_expressions(raw_locators))} locators compiled to CSS")
+
+    if args.benchmark:
+        from selenium import webdriver
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        driver = webdriver.Chrome(options=options)
+        try:
+            driver.get(args.benchmark)
+            print(f"\n{'locator':<45} {'xpath ms':>9} {'css ms':>9}")
+            for name, xpath_ms, css_ms in benchmark_lookups(driver, raw_locators, args.rounds):
+                print(f"{name:<45} {xpath_ms:>9.3f} {css_ms:>9.3f}")
+        finally:
+            driver.quit()
+    return compiled
+
+
+if __name__ == "__main__":
+    main()
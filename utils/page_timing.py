@@ -0,0 +1,201 @@
+import functools
+import logging
+import os
+import statistics
+import time
+from html import escape
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from utils.command_metrics import percentile
+from utils.structured_log import logger
+
+
+# Key used to expose the session's page timing samples to the report hooks
+page_timing_key = pytest.StashKey()
+
+# Reads the timing of the current document in one call. Returns {same_document: true} when the browser
+# is still on the document the call started from (same timeOrigin), i.e. nothing navigated, and null
+# while a new document has not been parsed yet.
+# Metrics that are not known yet (e.g. load under the eager page load strategy) are null.
+PAGE_TIMING_SCRIPT = """
+const previousOrigin = arguments[0];
+if (performance.timeOrigin === previousOrigin) { return {same_document: true}; }
+if (document.readyState === 'loading') { return null; }
+const navigation = performance.getEntriesByType('navigation')[0];
+const at = (value) => (value ? Math.round(value) : null);
+const paints = {};
+performance.getEntriesByType('paint').forEach(entry => { paints[entry.name] = entry.startTime; });
+let lcp = null;
+try {
+    // Buffered entries are handed over synchronously by takeRecords()
+    const observer = new PerformanceObserver(() => {});
+    observer.observe({type: 'largest-contentful-paint', buffered: true});
+    const entries = observer.takeRecords();
+    observer.disconnect();
+    if (entries.length) { lcp = entries[entries.length - 1].startTime; }
+} catch (e) {}
+const resources = performance.getEntriesByType('resource');
+let bytes = navigation ? navigation.transferSize || 0 : 0;
+let slowest = null;
+resources.forEach(entry => {
+    bytes += entry.transferSize || 0;
+    if (!slowest || entry.duration > slowest.duration) { slowest = entry; }
+});
+return {
+    url: location.href,
+    ttfb_ms: navigation ? at(navigation.responseStart) : null,
+    dom_content_loaded_ms: navigation ? at(navigation.domContentLoadedEventEnd) : null,
+    load_ms: navigation ? at(navigation.loadEventEnd) : null,
+    first_contentful_paint_ms: at(paints['first-contentful-paint']),
+    lcp_ms: at(lcp),
+    resources: resources.length,
+    transfer_kb: Math.round(bytes / 1024),
+    slowest_resource: slowest ? {name: slowest.name, ms: Math.round(slowest.duration)} : null,
+};
+"""
+
+# Metrics that get percentiles in the summary and can have a budget
+TIMED_METRICS = ("ttfb_ms", "dom_content_loaded_ms", "load_ms", "first_contentful_paint_ms", "lcp_ms", "transfer_kb")
+
+
+class PageTimingMonitor:
+    """Collects browser-side timing after page-object navigations and checks it against per-page budgets."""
+
+    def __init__(self, budgets=None, navigation_timeout=5):
+        self.budgets = budgets or {}
+        self.navigation_timeout = navigation_timeout
+        self.current = None
+        self.samples = {}
+        self.violations = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the monitor from the page_timing section of config.yaml (PAGE_TIMING=1 turns it on), or return None."""
+        settings = config.get('page_timing') or {}
+        enabled = os.environ.get("PAGE_TIMING", str(settings.get('enabled', False))).lower() in ("1", "true", "yes")
+        if not enabled:
+            return None
+        return cls(settings.get('budgets'), settings.get('navigation_timeout', 5))
+
+    def budget_for(self, page):
+        return dict(self.budgets.get('default') or {}, **(self.budgets.get(page) or {}))
+
+    def time_origin(self, driver):
+        try:
+            return driver.execute_script("return performance.timeOrigin;")
+        except WebDriverException:
+            return None
+
+    def collect(self, driver, page, previous_origin):
+        """Record the timing of the document a navigation away from previous_origin loaded.
+
+        Returns at once when the call did not navigate (AJAX update, validation error, same-document
+        change); only a document that is still being parsed is waited for.
+        """
+        deadline = time.monotonic() + self.navigation_timeout
+        while True:
+            try:
+                metrics = driver.execute_script(PAGE_TIMING_SCRIPT, previous_origin)
+            except WebDriverException:
+                # The old document was unloaded under the script
+                metrics = None
+            if metrics and metrics.get('same_document'):
+                return None
+            if metrics:
+                return self.record(page, metrics)
+            if time.monotonic() >= deadline:
+                logger.warning(f"No navigation to {page} within {self.navigation_timeout}s; page timing skipped",
+                               extra={'event': "page_timing", 'page': page})
+                return None
+            time.sleep(0.05)
+
+    def record(self, page, metrics):
+        over_budget = {metric: {'value': metrics[metric], 'budget': limit}
+                       for metric, limit in self.budget_for(page).items()
+                       if metrics.get(metric) is not None and metrics[metric] > limit}
+        entry = dict(metrics, page=page, over_budget=over_budget)
+        for metric in TIMED_METRICS:
+            if metrics.get(metric) is not None:
+                self.samples.setdefault(page, {}).setdefault(metric, []).append(metrics[metric])
+        if over_budget:
+            self.violations += 1
+        if self.current is not None:
+            self.current.append(entry)
+        logger.log(logging.WARNING if over_budget else logging.INFO, f"{page} page timing", extra={'event': "page_timing", **entry})
+        return entry
+
+    def start_test(self):
+        self.current = []
+
+    def finish_test(self):
+        """Stop collecting and return the navigations of the test."""
+        navigations, self.current = self.current, None
+        return navigations or []
+
+    def export(self):
+        return {'samples': self.samples, 'violations': self.violations}
+
+
+def navigation(page):
+    """Decorate a page-object method that navigates so the landing page's timing is recorded as page."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            monitor = self.page_timing
+            if monitor is None:
+                return method(self, *args, **kwargs)
+            origin = monitor.time_origin(self.driver)
+            result = method(self, *args, **kwargs)
+            monitor.collect(self.driver, page, origin)
+            return result
+        return wrapper
+    return decorate
+
+
+def merge_page_timing(total, stats):
+    """Add one worker's samples and violation count to a running total."""
+    if total is None:
+        total = {'samples': {}, 'violations': 0}
+    for page, metrics in stats['samples'].items():
+        for metric, values in metrics.items():
+            total['samples'].setdefault(page, {}).setdefault(metric, []).extend(values)
+    total['violations'] += stats['violations']
+    return total
+
+
+def summarize(stats):
+    """Return per-page rows with the navigation count and p50/p95 of every metric."""
+    rows = []
+    for page, metrics in sorted(stats['samples'].items()):
+        row = {'page': page, 'navigations': max(len(values) for values in metrics.values())}
+        for metric in TIMED_METRICS:
+            values = sorted(metrics.get(metric) or [])
+            row[metric] = (statistics.median(values), percentile(values, 0.95)) if values else None
+        rows.append(row)
+    return rows
+
+
+def format_page_timing(stats):
+    """Return one line per page with the median and p95 of TTFB, DOMContentLoaded and LCP."""
+    def cell(value):
+        return f"{value[0]:.0f}/{value[1]:.0f}ms" if value else "-"
+    lines = [f"Page timing (p50/p95): {stats['violations']} navigations over budget"]
+    for row in summarize(stats):
+        lines.append(f"  {row['page']}: {row['navigations']} navigations, TTFB {cell(row['ttfb_ms'])}, "
+                     f"DOMContentLoaded {cell(row['dom_content_loaded_ms'])}, LCP {cell(row['lcp_ms'])}")
+    return lines
+
+
+def navigations_html(navigations):
+    """Render a test's navigations as an HTML table for the pytest-html report; budget overruns are marked."""
+    titles = ("Page", "TTFB ms", "DCL ms", "Load ms", "FCP ms", "LCP ms", "Resources", "KB", "Over budget")
+    header = "".join(f"<th>{title}</th>" for title in titles)
+    rows = ""
+    for entry in navigations:
+        cells = [entry['page']] + [entry.get(metric) for metric in TIMED_METRICS[:5]] + [entry['resources'], entry['transfer_kb']]
+        over = ", ".join(f"{metric} {value['value']} &gt; {value['budget']}" for metric, value in entry['over_budget'].items())
+        rows += ("<tr>" + "".join(f"<td>{escape(str(value)) if value is not None else '-'}</td>" for value in cells)
+                 + f"<td>{over}</td></tr>")
+    return f"<p>Page timing:</p><table class=\"page-timing\"><tr>{header}</tr>{rows}</table>"
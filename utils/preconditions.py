@@ -0,0 +1,199 @@
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from selenium.common.exceptions import WebDriverException
+
+from pages.home_page import HomePage
+from pages.registration_page import RegistrationPage
+
+
+# Adds products to the browser's cart through WooCommerce's AJAX endpoint in one async script call.
+# Names are resolved to product ids from the shop listing, following its pages until all are found. Requests run one after
+# another because WooCommerce saves the whole cart per request and parallel adds would overwrite each other.
+SEED_CART_SCRIPT = """
+const [baseUrl, wanted, done] = arguments;
+(async () => {
+    const ids = {};
+    const names = wanted.filter(item => !/^\\d+$/.test(String(item)));
+    wanted.filter(item => /^\\d+$/.test(String(item))).forEach(item => { ids[item] = String(item); });
+    // Follow the listing's next-page links until every name is resolved or the pages run out
+    let url = names.length ? baseUrl + 'shop/' : null;
+    for (let pages = 0; url && pages < 20 && names.some(name => !ids[name]); pages++) {
+        const response = await fetch(url, {credentials: 'same-origin'});
+        const page = new DOMParser().parseFromString(await response.text(), 'text/html');
+        const catalog = Array.from(page.querySelectorAll('li.product')).map(item => {
+            const title = item.querySelector('h3, h2.woocommerce-loop-product__title');
+            const button = item.querySelector('a.add_to_cart_button');
+            return [title ? title.textContent.trim() : '', button ? button.getAttribute('data-product_id') : null];
+        }).filter(([name, id]) => id);
+        names.filter(name => !ids[name]).forEach(name => {
+            const match = catalog.find(([title]) => title === name) || catalog.find(([title]) => title.includes(name));
+            if (match) { ids[name] = match[1]; }
+        });
+        const next = page.querySelector('a.next.page-numbers');
+        url = next ? new URL(next.getAttribute('href'), url).href : null;
+    }
+    const added = [], failed = [];
+    for (const item of wanted) {
+        if (!ids[item]) { continue; }
+        const body = new URLSearchParams({product_id: ids[item], quantity: '1'});
+        const response = await fetch(baseUrl + '?wc-ajax=add_to_cart', {method: 'POST', body: body, credentials: 'same-origin'});
+        const data = await response.json().catch(() => ({error: true}));
+        (data && !data.error ? added : failed).push(item);
+    }
+    done({added: added, failed: failed, missing: wanted.filter(item => !ids[item])});
+})().catch(error => done({error: String(error)}));
+"""
+
+
+class PreconditionError(Exception):
+    """Raised when an HTTP precondition (register/login/cart) does not succeed."""
+
+
+class _FormParser(HTMLParser):
+    """Collects input values per form and the WooCommerce error messages of a page."""
+
+    def __init__(self):
+        super().__init__()
+        self.inputs = {}
+        self.errors = []
+        self._in_error_list = False
+        self._in_error_item = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'input' and attrs.get('name'):
+            self.inputs.setdefault(attrs['name'], attrs.get('value') or "")
+        elif tag == 'ul' and 'woocommerce-error' in (attrs.get('class') or ""):
+            self._in_error_list = True
+        elif tag == 'li' and self._in_error_list:
+            self._in_error_item = True
+            self.errors.append("")
+
+    def handle_endtag(self, tag):
+        if tag == 'ul':
+            self._in_error_list = False
+        elif tag == 'li':
+            self._in_error_item = False
+
+    def handle_data(self, data):
+        if self._in_error_item:
+            self.errors[-1] += data
+
+
+def parse_form(html):
+    """Return (inputs, errors) scraped from a WooCommerce page."""
+    parser = _FormParser()
+    parser.feed(html)
+    return parser.inputs, [error.strip() for error in parser.errors if error.strip()]
+
+
+class AccountSession:
+    """Registers or logs in over plain HTTP and hands the auth cookies to a WebDriver."""
+
+    def __init__(self, base_url, timeout=15):
+        self.base_url = base_url
+        self.my_account_url = urljoin(base_url, "my-account/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def register(self, email, password):
+        """Create a new account and keep the logged-in session."""
+        self._submit_account_form('woocommerce-register-nonce', {
+            'email': email,
+            'password': password,
+            'register': "Register",
+        })
+        return self
+
+    def login(self, username, password):
+        """Log in with an existing account and keep the session."""
+        self._submit_account_form('woocommerce-login-nonce', {
+            'username': username,
+            'password': password,
+            'login': "Login",
+        })
+        return self
+
+    def is_logged_in(self):
+        """Check whether the session holds a WordPress auth cookie."""
+        return any(cookie.name.startswith('wordpress_logged_in') for cookie in self.session.cookies)
+
+    def apply_to(self, driver, landing_url=None):
+        """Copy the session cookies into the browser and open the landing page (My Account by default)."""
+        try:
+            for cookie in self.session.cookies:
+                driver.execute_cdp_cmd("Network.setCookie", {
+                    'name': cookie.name,
+                    'value': cookie.value,
+                    'domain': cookie.domain,
+                    'path': cookie.path,
+                    'secure': cookie.secure,
+                    'httpOnly': cookie.has_nonstandard_attr('HttpOnly'),
+                })
+        except (AttributeError, WebDriverException):
+            # Without DevTools the browser must be on the domain before cookies can be added
+            driver.get(self.base_url)
+            for cookie in self.session.cookies:
+                driver.add_cookie({'name': cookie.name, 'value': cookie.value, 'path': cookie.path,
+                                   'secure': cookie.secure})
+        driver.get(landing_url or self.my_account_url)
+
+    def _submit_account_form(self, nonce_field, fields):
+        # Step 1: Load My Account to get the form nonce and session cookies
+        page = self.session.get(self.my_account_url, timeout=self.timeout)
+        page.raise_for_status()
+        inputs, _ = parse_form(page.text)
+        if nonce_field not in inputs:
+            raise PreconditionError(f"Could not find '{nonce_field}' on {self.my_account_url}")
+
+        # Step 2: Post the form the same way the browser would
+        payload = dict(fields)
+        payload[nonce_field] = inputs[nonce_field]
+        payload['_wp_http_referer'] = inputs.get('_wp_http_referer', "/my-account/")
+        response = self.session.post(self.my_account_url, data=payload, timeout=self.timeout)
+        response.raise_for_status()
+
+        if not self.is_logged_in():
+            _, errors = parse_form(response.text)
+            raise PreconditionError(f"Account request was rejected: {'; '.join(errors) or 'no auth cookie returned'}")
+
+
+def register_user_via_ui(driver, config, locators, email, password):
+    """Register through the browser: open the site, go to My Account and submit the form."""
+    home_page = HomePage(driver, locators)
+    registration_page = RegistrationPage(driver, locators)
+    driver.get(config['base_url'])
+    home_page.go_to_my_account()
+    registration_page.register(email, password)
+
+
+def register_user(driver, config, locators, email, password, mode="http"):
+    """Leave the browser logged in as a newly registered user on the My Account page."""
+    if mode == "ui":
+        register_user_via_ui(driver, config, locators, email, password)
+    else:
+        AccountSession(config['base_url']).register(email, password).apply_to(driver)
+    return email, password
+
+
+def login_user(driver, config, username, password):
+    """Leave the browser logged in as an existing user on the My Account page."""
+    AccountSession(config['base_url']).login(username, password).apply_to(driver)
+    return username, password
+
+
+def seed_cart(driver, config, products):
+    """Add products (names or ids, repeat an entry for more than one) to the browser's cart without using the shop UI."""
+    base_url = config['base_url'].rstrip('/') + '/'
+    # fetch() only carries the session cookies on the shop's own origin
+    if not driver.current_url.startswith(base_url):
+        driver.get(base_url)
+    result = driver.execute_async_script(SEED_CART_SCRIPT, base_url, [str(product) for product in products])
+    if result.get('error'):
+        raise PreconditionError(f"Cart seeding failed: {result['error']}")
+    if result['missing'] or result['failed']:
+        raise PreconditionError(f"Cart seeding failed: not found in the shop {result['missing']}, "
+                                f"rejected by the store {result['failed']}")
+    return result['added']
@@ -0,0 +1,140 @@
+import argparse
+import filecmp
+import html
+import json
+import os
+import re
+import shutil
+import xml.etree.ElementTree as ET
+
+# Outcome names pytest-html uses for its filter checkboxes, keyed by the lower-cased result column
+OUTCOME_LABELS = {
+    'failed': "Failed", 'passed': "Passed", 'skipped': "Skipped", 'xfailed': "Expected failures",
+    'xpassed': "Unexpected passes", 'error': "Errors", 'rerun': "Reruns", 'retried': "Retried",
+}
+
+JSONBLOB_PATTERN = re.compile(r'data-jsonblob="([^"]*)"')
+HREF_PATTERN = re.compile(r'href="([^"]*)"')
+
+
+def merge_junit(paths, output):
+    """Combine JUnit XML reports into one testsuite with summed counts and time."""
+    merged = ET.Element('testsuite', name="pytest")
+    totals = {'tests': 0, 'errors': 0, 'failures': 0, 'skipped': 0}
+    seconds = 0.0
+    timestamps = []
+    for path in paths:
+        for suite in ET.parse(path).getroot().iter('testsuite'):
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            seconds += float(suite.get('time', 0))
+            if suite.get('timestamp'):
+                timestamps.append(suite.get('timestamp'))
+            if suite.get('hostname') and merged.get('hostname') is None:
+                merged.set('hostname', suite.get('hostname'))
+            merged.extend(suite.findall('testcase'))
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    merged.set('time', f"{seconds:.3f}")
+    if timestamps:
+        merged.set('timestamp', min(timestamps))
+    root = ET.Element('testsuites')
+    root.append(merged)
+    ET.ElementTree(root).write(output, encoding="utf-8", xml_declaration=True)
+    return totals, seconds
+
+
+def read_html_report(path):
+    """Return (page text, JSON data) of a pytest-html 4 report."""
+    with open(path, 'r', encoding="utf-8") as file:
+        page = file.read()
+    match = JSONBLOB_PATTERN.search(page)
+    if match is None:
+        raise ValueError(f"{path} is not a pytest-html 4 report (no data-jsonblob)")
+    return page, json.loads(html.unescape(match.group(1)))
+
+
+def copy_artifact(relative_path, source_dir, output_dir, shard_name):
+    """Copy a file a report links to next to the merged report; returns the path to link to."""
+    source = os.path.join(source_dir, relative_path)
+    if os.path.isabs(relative_path) or "://" in relative_path or not os.path.isfile(source):
+        return relative_path
+    target_path = relative_path
+    target = os.path.join(output_dir, target_path)
+    # Content-hashed artifacts from different shards share a name only when they are identical
+    if os.path.exists(target) and not filecmp.cmp(source, target, shallow=False):
+        target_path = os.path.join(shard_name, relative_path)
+        target = os.path.join(output_dir, target_path)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        shutil.copy2(source, target)
+    return target_path
+
+
+def merge_html(paths, output):
+    """Combine pytest-html reports: union of test results, recounted outcomes, artifacts copied alongside."""
+    output_dir = os.path.dirname(os.path.abspath(output))
+    template, merged = None, None
+    for number, path in enumerate(paths, start=1):
+        page, data = read_html_report(path)
+        source_dir = os.path.dirname(os.path.abspath(path))
+        shard_name = f"shard-{number}"
+        for results in data['tests'].values():
+            for result in results:
+                for extra in result.get('extras', []):
+                    if extra.get('format_type') in ("image", "video", "json", "text", "url") \
+                            and isinstance(extra.get('content'), str) and not extra['content'].startswith("<"):
+                        extra['content'] = copy_artifact(extra['content'], source_dir, output_dir, shard_name)
+                result['resultsTableRow'] = [
+                    HREF_PATTERN.sub(lambda m: f'href="{copy_artifact(html.unescape(m.group(1)), source_dir, output_dir, shard_name)}"', cell)
+                    for cell in result.get('resultsTableRow', [])
+                ]
+        if merged is None:
+            template, merged = page, data
+        else:
+            for nodeid, results in data['tests'].items():
+                merged['tests'].setdefault(nodeid, []).extend(results)
+
+    counts = dict.fromkeys(OUTCOME_LABELS, 0)
+    for results in merged['tests'].values():
+        for result in results:
+            outcome = re.sub(r"<[^>]+>", "", str(result.get('result', ""))).strip().lower()
+            if outcome in counts:
+                counts[outcome] += 1
+
+    page = JSONBLOB_PATTERN.sub(lambda m: f'data-jsonblob="{html.escape(json.dumps(merged))}"', template, count=1)
+    for outcome, count in counts.items():
+        page = re.sub(
+            rf'(<input[^>]*data-test-result="{outcome}")( disabled)?(\s*/?>\s*<span class="{outcome}">)\d+',
+            lambda m: f"{m.group(1)}{' disabled' if count == 0 else ''}{m.group(3)}{count}", page)
+    return page, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge report.html/report.xml of several shards into one report.")
+    parser.add_argument("shards", nargs="+", help="shard report directories (each with report.html and/or report.xml)")
+    parser.add_argument("-o", "--output", default="reports/merged", help="directory for the merged report")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    xml_files = [os.path.join(shard, "report.xml") for shard in args.shards if os.path.isfile(os.path.join(shard, "report.xml"))]
+    html_files = [os.path.join(shard, "report.html") for shard in args.shards if os.path.isfile(os.path.join(shard, "report.html"))]
+
+    seconds = None
+    if xml_files:
+        totals, seconds = merge_junit(xml_files, os.path.join(args.output, "report.xml"))
+        print(f"Merged {len(xml_files)} JUnit reports: {totals['tests']} tests, {totals['failures']} failures, "
+              f"{totals['errors']} errors, {totals['skipped']} skipped")
+    if html_files:
+        output = os.path.join(args.output, "report.html")
+        page, counts = merge_html(html_files, output)
+        run = sum(counts[outcome] for outcome in ("passed", "failed", "xpassed", "xfailed"))
+        took = f" took {seconds:.0f}s of machine time" if seconds is not None else ""
+        page = re.sub(r'<p class="run-count">.*?</p>', f'<p class="run-count">{run} tests{took} across {len(html_files)} shards.</p>', page, count=1)
+        with open(output, 'w', encoding="utf-8") as file:
+            file.write(page)
+        print(f"Merged {len(html_files)} HTML reports: " + ", ".join(f"{count} {outcome}" for outcome, count in counts.items() if count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import pytest
+
+
+# Key used to expose the session's retry counters to the report hooks
+retry_stats_key = pytest.StashKey()
+
+
+class RetryStats:
+    """Counts BasePage action retries and the time spent on them, per test and for the session."""
+
+    def __init__(self):
+        self.current = None
+        self.totals = {'retries': 0, 'retry_seconds': 0.0, 'actions_failed': 0}
+
+    def record(self, description, retries, seconds, failed):
+        self.totals['retries'] += retries
+        self.totals['retry_seconds'] += seconds
+        self.totals['actions_failed'] += int(failed)
+        if self.current is not None:
+            self.current.append({'action': description, 'retries': retries, 'seconds': round(seconds, 3),
+                                 'failed': failed})
+
+    def start_test(self):
+        self.current = []
+
+    def finish_test(self):
+        """Stop collecting and return the retried actions of the test."""
+        actions, self.current = self.current, None
+        return actions or []
+
+
+def merge_retry_stats(total, stats):
+    """Add one worker's retry counters to a running total."""
+    if total is None:
+        return dict(stats)
+    return {key: total[key] + stats[key] for key in total}
+
+
+def format_retry_stats(stats):
+    """Return a one-line description of the session's action retries."""
+    return (f"Action retries: {stats['retries']} retries, {stats['retry_seconds']:.1f}s spent retrying, "
+            f"{stats['actions_failed']} actions failed after retrying")
@@ -0,0 +1,107 @@
+import heapq
+import os
+import statistics
+import xml.etree.ElementTree as ET
+
+import pytest
+
+
+# Key used to expose this node's shard plan to the summary hooks
+shard_plan_key = pytest.StashKey()
+
+# Fixture scopes whose setup is shared by several tests; tests sharing one must land on the same shard
+SHARED_SCOPES = ("package", "module", "class")
+
+
+def junit_key(nodeid):
+    """Return the (classname, name) pair pytest's junitxml writes for a node id."""
+    parts = nodeid.split("::")
+    path = parts[0][:-3] if parts[0].endswith(".py") else parts[0]
+    return ".".join([path.replace("/", ".")] + parts[1:-1]), parts[-1]
+
+
+def load_durations(paths):
+    """Average per-test durations (setup + call + teardown) from one or more JUnit XML reports."""
+    samples = {}
+    for path in paths:
+        try:
+            root = ET.parse(path).getroot()
+        except (FileNotFoundError, ET.ParseError):
+            continue
+        for case in root.iter('testcase'):
+            if case.get('classname') and case.get('name'):
+                samples.setdefault((case.get('classname'), case.get('name')), []).append(float(case.get('time', 0)))
+    return {key: sum(times) / len(times) for key, times in samples.items()}
+
+
+def group_key(item):
+    """Node id of the widest shared fixture scope the test uses, or the test itself."""
+    parts = item.nodeid.split("::")
+    manager = item.session._fixturemanager
+    # The definition that applies to this test is the last one (the closest override)
+    scopes = set()
+    for name in item.fixturenames:
+        definitions = manager.getfixturedefs(name, item)
+        if definitions:
+            scopes.add(definitions[-1].scope)
+    for scope in SHARED_SCOPES:
+        if scope in scopes:
+            if scope == "package":
+                return os.path.dirname(parts[0])
+            if scope == "module":
+                return parts[0]
+            return "::".join(parts[:-1])
+    return item.nodeid
+
+
+def plan_shards(items, durations, shard_count):
+    """Bin-pack tests into shard_count lists of similar estimated time, longest groups first.
+
+    Tests without history are estimated at the median known duration. Returns a list of
+    (estimated_seconds, [items]) per shard, in collection order within each shard.
+    """
+    estimate = statistics.median(durations.values()) if durations else 1.0
+    groups = {}
+    for index, item in enumerate(items):
+        group = groups.setdefault(group_key(item), {'seconds': 0.0, 'items': []})
+        group['seconds'] += durations.get(junit_key(item.nodeid), estimate)
+        group['items'].append((index, item))
+
+    shards = [(0.0, shard, []) for shard in range(shard_count)]
+    heapq.heapify(shards)
+    # Ties are broken by group name so every node computes the same plan
+    for name, group in sorted(groups.items(), key=lambda entry: (-entry[1]['seconds'], entry[0])):
+        seconds, shard, members = heapq.heappop(shards)
+        members.extend(group['items'])
+        heapq.heappush(shards, (seconds + group['seconds'], shard, members))
+
+    plan = [None] * shard_count
+    for seconds, shard, members in shards:
+        plan[shard] = (seconds, [item for index, item in sorted(members, key=lambda member: member[0])])
+    return plan
+
+
+def select_shard(items, shard_index, shard_count, duration_files):
+    """Return (selected, deselected, plan summary) for shard shard_index (1-based) of shard_count."""
+    if not 1 <= shard_index <= shard_count:
+        raise ValueError(f"SHARD_INDEX must be between 1 and {shard_count}, got {shard_index}")
+    durations = load_durations(duration_files)
+    plan = plan_shards(items, durations, shard_count)
+    selected = plan[shard_index - 1][1]
+    chosen = set(id(item) for item in selected)
+    summary = {
+        'shard': shard_index,
+        'shards': shard_count,
+        'tests': len(selected),
+        'estimated_seconds': round(plan[shard_index - 1][0], 1),
+        'estimates': [round(seconds, 1) for seconds, members in plan],
+        'known_durations': sum(1 for item in items if junit_key(item.nodeid) in durations),
+    }
+    return selected, [item for item in items if id(item) not in chosen], summary
+
+
+def format_shard_plan(summary):
+    """Return a one-line description of this node's shard."""
+    return (f"Shard {summary['shard']}/{summary['shards']}: {summary['tests']} tests, "
+            f"~{summary['estimated_seconds']}s estimated (all shards: {summary['estimates']}), "
+            f"{summary['known_durations']} tests with recorded durations")
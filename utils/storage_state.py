@@ -0,0 +1,150 @@
+import json
+import time
+from urllib.parse import urljoin, urlsplit
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+
+# Key used to expose snapshot hit/miss counters to the report hooks
+storage_state_stats_key = pytest.StashKey()
+
+
+# Fields accepted by the DevTools Network.setCookies command
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+READ_STORAGE_SCRIPT = """
+const dump = (storage) => {
+    const items = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+return {origin: location.origin, local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+LOGGED_IN_SCRIPT = "return document.querySelector(\"a[href*='customer-logout']\") !== null;"
+
+
+class StorageStateError(Exception):
+    """Raised when a restored storage state does not give a logged-in browser."""
+
+
+def capture_storage_state(driver, ttl_seconds):
+    """Capture cookies plus local and session storage of the page the driver is on."""
+    storage = driver.execute_script(READ_STORAGE_SCRIPT)
+    try:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})['cookies']
+    except (AttributeError, WebDriverException):
+        cookies = driver.get_cookies()
+        for cookie in cookies:
+            cookie['expires'] = cookie.pop('expiry', -1)
+
+    # The snapshot is only as good as its shortest-lived persistent cookie
+    captured_at = time.time()
+    expiries = [cookie['expires'] for cookie in cookies if cookie.get('expires', -1) > 0]
+    expires_at = min([captured_at + ttl_seconds] + expiries)
+
+    return {
+        'origin': storage['origin'],
+        'cookies': [{key: cookie[key] for key in COOKIE_FIELDS if key in cookie} for cookie in cookies],
+        'local_storage': storage['local'],
+        'session_storage': storage['session'],
+        'captured_at': captured_at,
+        'expires_at': expires_at,
+    }
+
+
+def _seed_storage_script(state):
+    return f"""
+if (location.origin === {json.dumps(state['origin'])}) {{
+    const local = {json.dumps(state['local_storage'])};
+    const session = {json.dumps(state['session_storage'])};
+    for (const key in local) {{ window.localStorage.setItem(key, local[key]); }}
+    for (const key in session) {{ window.sessionStorage.setItem(key, session[key]); }}
+}}
+"""
+
+
+def restore_storage_state(driver, state, landing_url):
+    """Load a captured state into the browser with a single navigation to landing_url."""
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {'cookies': state['cookies']})
+        # Seed storage before the page's own scripts run, then stop seeding later pages
+        script = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                        {'source': _seed_storage_script(state)})
+        driver.get(landing_url)
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {'identifier': script['identifier']})
+    except (AttributeError, WebDriverException):
+        # Without DevTools, cookies and storage can only be set while on the origin
+        driver.get(state['origin'])
+        for cookie in state['cookies']:
+            selenium_cookie = {key: cookie[key] for key in ('name', 'value', 'path', 'secure') if key in cookie}
+            driver.add_cookie(selenium_cookie)
+        driver.execute_script(_seed_storage_script(state))
+        driver.get(landing_url)
+
+
+def is_logged_in(driver):
+    """Check whether the current page shows a WooCommerce logout link."""
+    return bool(driver.execute_script(LOGGED_IN_SCRIPT))
+
+
+class StorageStateCache:
+    """Keeps one authenticated storage-state snapshot per role for the whole session."""
+
+    def __init__(self, base_url, ttl_seconds=1800):
+        self.base_url = base_url
+        self.landing_url = urljoin(base_url, "my-account/")
+        self.ttl_seconds = ttl_seconds
+        self.snapshots = {}
+        self.factories = {}
+        self.hits = 0
+        self.misses = 0
+
+    def register_role(self, role, factory):
+        """Register factory(driver), which must leave the driver logged in as role."""
+        self.factories[role] = factory
+
+    def invalidate(self, role):
+        """Forget the snapshot of a role so it is captured again on next use."""
+        self.snapshots.pop(role, None)
+
+    def restore(self, driver, role):
+        """Put the browser into the logged-in state of role, capturing it first if needed."""
+        if role not in self.factories:
+            raise StorageStateError(f"Unknown storage-state role '{role}'. Known roles: {sorted(self.factories)}")
+
+        state = self.snapshots.get(role)
+        if state is not None and state['expires_at'] <= time.time():
+            self.invalidate(role)
+            state = None
+
+        if state is not None:
+            restore_storage_state(driver, state, self.landing_url)
+            if is_logged_in(driver):
+                self.hits += 1
+                return state
+            # The server no longer accepts the snapshot; drop it and log in again
+            self.invalidate(role)
+
+        self.misses += 1
+        self.factories[role](driver)
+        if urlsplit(driver.current_url).path.rstrip('/') != urlsplit(self.landing_url).path.rstrip('/'):
+            driver.get(self.landing_url)
+        if not is_logged_in(driver):
+            raise StorageStateError(f"Could not log in as role '{role}'")
+        state = capture_storage_state(driver, self.ttl_seconds)
+        self.snapshots[role] = state
+        return state
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+def format_storage_state_stats(stats):
+    """Return a one-line description of how often logged-in snapshots were reused."""
+    return (f"Storage-state snapshots: {stats['hits']} restored, {stats['misses']} captured "
+            f"(login or registration performed)")
@@ -0,0 +1,191 @@
+import json
+import os
+import shutil
+import time
+from xml.sax.saxutils import escape, quoteattr
+
+from utils.sharding import junit_key
+
+
+# Static viewer; results.js calls R() once per result and DONE() when the session finishes.
+# Everything is computed in the browser on load and only one page of rows is rendered at a time.
+INDEX_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Centime Automation Live Report</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 20px; }
+table { border-collapse: collapse; width: 100%; } td, th { border: 1px solid #ddd; padding: 4px 6px; text-align: left; }
+.passed { color: #2e7d32; } .failed, .error { color: #c62828; } .skipped, .xfailed, .xpassed { color: #ef6c00; }
+#status { font-weight: bold; } .controls { margin: 10px 0; } .controls * { margin-right: 6px; }
+</style></head><body>
+<h1>Centime Automation Live Report</h1>
+<p id="status"></p><p id="summary"></p>
+<div class="controls">
+  <select id="outcome"><option value="">all outcomes</option></select>
+  <input id="search" placeholder="filter by test id" size="50">
+  <button id="prev">&lt;</button><span id="page"></span><button id="next">&gt;</button>
+</div>
+<table><thead><tr><th>Result</th><th>Test</th><th>Duration</th><th>Error</th><th>Links</th></tr></thead><tbody id="rows"></tbody></table>
+<script>
+const results = []; let finished = null;
+function R(result) { results.push(result); }
+function DONE(session) { finished = session; }
+</script>
+<script src="results.js"></script>
+<script>
+const PAGE_SIZE = 500; let page = 0; let shown = results;
+const esc = (text) => String(text == null ? '' : text).replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+const counts = {}; let seconds = 0;
+results.forEach(r => { counts[r.outcome] = (counts[r.outcome] || 0) + 1; seconds += r.duration; });
+document.getElementById('status').textContent = finished
+    ? `Finished (exit status ${finished.exitstatus}) after ${finished.seconds.toFixed(0)}s.`
+    : 'Session still running or ended without finishing; reload to see later results.';
+document.getElementById('summary').innerHTML = `${results.length} results, ${seconds.toFixed(1)}s of test time: ` +
+    Object.keys(counts).sort().map(o => `<span class="${o}">${counts[o]} ${o}</span>`).join(', ');
+Object.keys(counts).sort().forEach(o => { const option = document.createElement('option'); option.value = option.textContent = o; document.getElementById('outcome').appendChild(option); });
+function render() {
+    const start = page * PAGE_SIZE;
+    document.getElementById('rows').innerHTML = shown.slice(start, start + PAGE_SIZE).map(r =>
+        `<tr><td class="${r.outcome}">${esc(r.outcome)}</td><td>${esc(r.nodeid)}${r.when !== 'call' ? ' (' + esc(r.when) + ')' : ''}</td>` +
+        `<td>${r.duration.toFixed(2)}s</td><td>${esc(r.error)}</td>` +
+        `<td>${r.links.map(l => `<a href="${esc(l.href)}" target="_blank">${esc(l.name)}</a>`).join(' ')}</td></tr>`).join('');
+    document.getElementById('page').textContent = `${shown.length ? start + 1 : 0}-${Math.min(start + PAGE_SIZE, shown.length)} of ${shown.length}`;
+}
+function filter() {
+    const outcome = document.getElementById('outcome').value, text = document.getElementById('search').value;
+    shown = results.filter(r => (!outcome || r.outcome === outcome) && (!text || r.nodeid.includes(text)));
+    page = 0; render();
+}
+document.getElementById('outcome').onchange = filter;
+document.getElementById('search').oninput = filter;
+document.getElementById('prev').onclick = () => { if (page > 0) { page--; render(); } };
+document.getElementById('next').onclick = () => { if ((page + 1) * PAGE_SIZE < shown.length) { page++; render(); } };
+render();
+</script></body></html>
+"""
+
+# Counts and time are zero-padded to a fixed width so the header can be rewritten in place
+XML_HEADER = ('<?xml version="1.0" encoding="utf-8"?>\n<testsuites><testsuite name="pytest" tests="{tests:010d}" '
+              'failures="{failures:010d}" errors="{errors:010d}" skipped="{skipped:010d}" time="{time:014.3f}">\n')
+XML_FOOTER = '</testsuite></testsuites>\n'
+
+# Failure text kept inline in the XML; the full text is in the details file
+XML_TEXT_LIMIT = 4000
+
+
+def outcome_of(report):
+    if report.when != "call" and report.failed:
+        return "error"
+    if hasattr(report, 'wasxfail'):
+        return "xfailed" if report.skipped else "xpassed"
+    return report.outcome
+
+
+class StreamingReport:
+    """pytest plugin appending every result to an HTML viewer and a JUnit XML file as soon as it is known."""
+
+    def __init__(self, directory, artifact_base=None):
+        self.directory = directory
+        # Directory that artifact links in report extras are relative to
+        self.artifact_base = artifact_base or os.getcwd()
+        self.counts = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0, 'time': 0.0}
+        # Node ids already in counts['tests']; a test reported in several phases is still one test
+        self.counted = set()
+        self.started = None
+        self.sequence = 0
+        self.results = None
+        self.xml = None
+        self.xml_end = 0
+
+    def pytest_sessionstart(self, session):
+        self.started = time.time()
+        # Details of an earlier session would be linked from nowhere
+        shutil.rmtree(os.path.join(self.directory, "details"), ignore_errors=True)
+        os.makedirs(os.path.join(self.directory, "details"), exist_ok=True)
+        with open(os.path.join(self.directory, "index.html"), 'w', encoding="utf-8") as file:
+            file.write(INDEX_HTML)
+        self.results = open(os.path.join(self.directory, "results.js"), 'w', encoding="utf-8")
+        self.xml = open(os.path.join(self.directory, "report.xml"), 'w+b')
+        self.xml.write(XML_HEADER.format(**self.counts).encode("utf-8"))
+        self.xml_end = self.xml.tell()
+        self.xml.write(XML_FOOTER.encode("utf-8"))
+        self.xml.flush()
+
+    def pytest_runtest_logreport(self, report):
+        # Passed setup/teardown phases carry nothing worth showing
+        if report.when != "call" and not (report.failed or report.skipped):
+            return
+        outcome = outcome_of(report)
+        self.sequence += 1
+        if report.nodeid not in self.counted:
+            self.counted.add(report.nodeid)
+            self.counts['tests'] += 1
+        self.counts['time'] += report.duration
+        crash = getattr(report.longrepr, 'reprcrash', None)
+        error = crash.message.splitlines()[0] if crash and crash.message else ""
+        if report.skipped and isinstance(report.longrepr, tuple):
+            # Skips carry (path, line, reason)
+            error = report.longrepr[2]
+        links = self._artifact_links(report)
+
+        details = None
+        if report.failed and report.longreprtext:
+            details = os.path.join("details", f"{self.sequence:06d}.txt")
+            with open(os.path.join(self.directory, details), 'w', encoding="utf-8") as file:
+                file.write(report.longreprtext)
+            links.insert(0, {'name': "traceback", 'href': details})
+
+        self._append_result({'nodeid': report.nodeid, 'when': report.when, 'outcome': outcome,
+                             'duration': round(report.duration, 3), 'error': error, 'links': links})
+        self._append_testcase(report, outcome, error, details)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.results is None:
+            return
+        self.results.write(f"DONE({json.dumps({'exitstatus': int(exitstatus), 'seconds': time.time() - self.started})});\n")
+        self.results.close()
+        self.xml.close()
+        self.results = None
+
+    def _append_result(self, result):
+        # One complete statement per write, so a crash can at most lose the result being written
+        self.results.write(f"R({json.dumps(result)});\n")
+        self.results.flush()
+
+    def _append_testcase(self, report, outcome, error, details):
+        # Setup and teardown keep the bare test name, as junitxml does, so CI tools see one test;
+        # the phase goes in the failure message
+        classname, name = junit_key(report.nodeid)
+        body = ""
+        if outcome in ("failed", "error"):
+            if report.when != "call":
+                error = f'failed on {report.when} with "{error}"'
+            self.counts['failures' if outcome == "failed" else 'errors'] += 1
+            text = report.longreprtext[:XML_TEXT_LIMIT]
+            if details and len(report.longreprtext) > XML_TEXT_LIMIT:
+                text += f"\n... full text in {details}"
+            tag = "failure" if outcome == "failed" else "error"
+            body = f"<{tag} message={quoteattr(error)}>{escape(text)}</{tag}>"
+        elif outcome in ("skipped", "xfailed"):
+            self.counts['skipped'] += 1
+            body = f"<skipped message={quoteattr(error or str(getattr(report, 'wasxfail', '')))}/>"
+        case = (f'<testcase classname={quoteattr(classname)} name={quoteattr(name)} '
+                f'time="{report.duration:.3f}">{body}</testcase>\n')
+        # Overwrite the closing tags with the new case and put them back, so the file is always well-formed
+        self.xml.seek(self.xml_end)
+        self.xml.write(case.encode("utf-8"))
+        self.xml_end = self.xml.tell()
+        self.xml.write(XML_FOOTER.encode("utf-8"))
+        self.xml.truncate()
+        self.xml.seek(0)
+        self.xml.write(XML_HEADER.format(**self.counts).encode("utf-8"))
+        self.xml.flush()
+
+    def _artifact_links(self, report):
+        links = []
+        for extra in getattr(report, 'extras', None) or getattr(report, 'extra', None) or []:
+            content = extra.get('content')
+            if extra.get('format_type') in ("image", "url") and isinstance(content, str) and "://" not in content \
+                    and not content.startswith("data:") and len(content) < 1024:
+                path = os.path.relpath(os.path.join(self.artifact_base, content), self.directory)
+                links.append({'name': extra.get('name') or extra['format_type'], 'href': path})
+        return links
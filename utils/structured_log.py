@@ -0,0 +1,123 @@
+import functools
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+from utils.workers import worker_id
+
+
+logger = logging.getLogger("automation")
+
+# Per thread: test (node id of the running test, stamped on every record so tooling can group them per
+# test) and spans (open spans, innermost last). Threads such as load-test users keep their own.
+_context = threading.local()
+_span_ids = itertools.count(1)
+
+# Attributes every LogRecord has; anything else was passed through extra= and goes into the JSON line
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'worker': worker_id(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry['error'] = self.formatException(record.exc_info).splitlines()[-1]
+        return json.dumps(entry, default=str)
+
+
+class _TestContextQueueHandler(logging.handlers.QueueHandler):
+    """Stamps the current test on the record and hands it over unformatted; the listener thread formats it."""
+
+    def prepare(self, record):
+        record.test = getattr(_context, 'test', None)
+        return record
+
+
+def start_logging(path, max_bytes=10 * 1024 * 1024, backup_count=5, level=logging.INFO):
+    """Send the automation logger to a rotating JSON-lines file through a background thread; returns the listener."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                        encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    records = queue.SimpleQueue()
+    logger.addHandler(_TestContextQueueHandler(records))
+    logger.setLevel(level)
+    # Keep pytest's capture handlers from formatting every record on the test thread as well
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(records, file_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def stop_logging(listener):
+    """Flush queued records and detach the queue handler."""
+    for handler in list(logger.handlers):
+        if isinstance(handler, _TestContextQueueHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
+    listener.stop()
+
+
+def set_current_test(nodeid):
+    _context.test = nodeid
+    _context.spans = []
+
+
+def _span_stack():
+    if not hasattr(_context, 'spans'):
+        _context.spans = []
+    return _context.spans
+
+
+class span:
+    """Context manager logging one record per block with start, end, duration and nesting, e.g. span("ShopPage.go_to_shop")."""
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.id = next(_span_ids)
+        self.stack = _span_stack()
+        self.parent = self.stack[-1] if self.stack else None
+        self.start = time.time()
+        self.started = time.perf_counter()
+        self.stack.append(self.id)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.perf_counter() - self.started
+        if self.stack and self.stack[-1] == self.id:
+            self.stack.pop()
+        logger.info(self.name, extra={
+            'event': "span", 'span': self.name, 'span_id': self.id, 'parent_id': self.parent,
+            'start': round(self.start, 6), 'end': round(self.start + duration, 6),
+            'duration_ms': round(duration * 1000, 2),
+            'status': "error" if exc_type else "ok",
+            **({'error': f"{exc_type.__name__}: {exc}"} if exc_type else {}),
+            **self.fields,
+        })
+        return False
+
+
+def action(method):
+    """Decorate a page-object method so every call is recorded as a span named Class.method."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with span(f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+    return wrapper
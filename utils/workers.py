@@ -0,0 +1,19 @@
+import os
+
+
+def worker_id():
+    """Return the pytest-xdist worker id, or 'master' when running serially."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def worker_path(directory, filename):
+    """Return a path inside the current worker's subdirectory, creating it if needed."""
+    worker_directory = os.path.join(directory, worker_id())
+    os.makedirs(worker_directory, exist_ok=True)
+    return os.path.join(worker_directory, filename)
+
+
+def worker_log_file(log_file):
+    """Add the worker id to a log file name so workers never share a file."""
+    root, ext = os.path.splitext(log_file)
+    return f"{root}_{worker_id()}{ext}"